@@ -1,7 +1,12 @@
 #! /bin/sh
 
-python manage.py makemigrations
-python manage.py makemigrations api_portal_jota
 python manage.py migrate
+# Timelines por vertical no Redis; sem elas a listagem por vertical lê do Postgres
+python manage.py reconstruir_timelines
 
-gunicorn -w 2 -b '0.0.0.0:8000' 'portal_jota.wsgi:application'
\ No newline at end of file
+if [ "$WEB_SERVER" = "asgi" ]; then
+    # Leituras quentes assíncronas; clientes lentos esperam no event loop em vez de prender um worker
+    uvicorn --workers 2 --host 0.0.0.0 --port 8000 'portal_jota.asgi:application'
+else
+    gunicorn -w 2 -b '0.0.0.0:8000' 'portal_jota.wsgi:application'
+fi
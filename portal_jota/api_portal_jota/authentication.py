@@ -0,0 +1,86 @@
+"""
+Autenticação JWT sem consulta ao banco por requisição.
+
+O access token carrega role, plano e verticais do usuário e a versão do plano em que foram lidos. Enquanto a
+versão no cache for a mesma, o usuário da requisição é montado só com as claims; se o plano ou o cadastro mudaram
+depois da emissão, a requisição cai na busca do usuário no banco, como no JWTAuthentication.
+"""
+
+import uuid
+from typing import Any
+
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import Token
+
+from .entitlements import ReaderEntitlement, get_plan_version
+from .enums.user_role_enum import UserRoleEnum
+from .models import UserSchema
+
+PLAN_VERSION_CLAIM = "plan_version"
+
+
+def user_claims(user: UserSchema) -> dict[str, Any]:
+    # A versão é lida antes do plano: uma alteração entre as duas leituras incrementa a versão e invalida as claims
+    claims = {
+        PLAN_VERSION_CLAIM: get_plan_version(str(user.id)),
+        "username": user.username,
+        "role": user.role,
+    }
+
+    if user.role == UserRoleEnum.READER:
+        claims["plan"] = user.user_plan.plan
+        claims["verticais_mask"] = user.user_plan.verticais_mask
+
+    return claims
+
+
+def claims_are_current(validated_token: Token, plan_version: int) -> bool:
+    return validated_token.get(PLAN_VERSION_CLAIM) == plan_version
+
+
+class ClaimsUser(TokenUser):
+    """
+    Usuário da requisição montado a partir das claims do access token, sem acesso ao banco.
+    """
+
+    @cached_property
+    def id(self) -> uuid.UUID:
+        return uuid.UUID(str(self.token[jwt_settings.USER_ID_CLAIM]))
+
+    @cached_property
+    def role(self) -> UserRoleEnum:
+        return UserRoleEnum(self.token["role"])
+
+    @cached_property
+    def entitlement(self) -> ReaderEntitlement | None:
+        if self.role != UserRoleEnum.READER:
+            return None
+
+        return ReaderEntitlement(
+            plan=self.token["plan"],
+            verticais_mask=self.token["verticais_mask"],
+            version=self.token[PLAN_VERSION_CLAIM],
+        )
+
+    def __eq__(self, other: object) -> bool:
+        # Permissões comparam o usuário da requisição com instâncias de UserSchema (ex.: autor da notícia)
+        if isinstance(other, UserSchema):
+            return self.id == other.id
+
+        return super().__eq__(other)
+
+    __hash__ = TokenUser.__hash__
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token: Token) -> ClaimsUser | UserSchema:
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+
+        if user_id is not None and claims_are_current(validated_token, get_plan_version(str(user_id))):
+            return ClaimsUser(validated_token)
+
+        # Token emitido antes de uma alteração no plano ou no cadastro: as claims não valem mais
+        return super().get_user(validated_token)
@@ -0,0 +1,74 @@
+"""
+Contagens para as respostas paginadas sem COUNT(*) exato em tabelas grandes.
+
+Em ordem de preferência:
+- filtro por plano: soma dos contadores de ContadorSchema, exata, mantida por triggers no Postgres (migração
+  0003_contadores);
+- sem filtro: a estimativa de pg_class.reltuples, atualizada pelo autovacuum e pelo ANALYZE;
+- outros filtros: a estimativa de linhas do planejador (EXPLAIN).
+
+Estimativas abaixo de CONTAGEM_EXATA_LIMITE são trocadas pelo COUNT(*), que nesse tamanho é barato.
+"""
+
+import json
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import QuerySet, Sum
+
+from .enums.plan_enum import PlanEnum
+from .models import ContadorSchema
+
+
+class Contagem(NamedTuple):
+    total: int
+    exata: bool
+
+
+def chave_plano(plan: PlanEnum) -> str:
+    return f"plano:{plan}"
+
+
+def contar_chaves(chaves: list[str]) -> Contagem:
+    total = ContadorSchema.objects.filter(chave__in=chaves).aggregate(total=Sum("total"))["total"]
+    return Contagem(total or 0, True)
+
+
+async def acontar_chaves(chaves: list[str]) -> Contagem:
+    total = (await ContadorSchema.objects.filter(chave__in=chaves).aaggregate(total=Sum("total")))["total"]
+    return Contagem(total or 0, True)
+
+
+def estimar_tabela(queryset: QuerySet) -> Optional[int]:
+    tabela = queryset.model._meta.db_table
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [tabela])
+        linha = cursor.fetchone()
+
+    # -1: tabela ainda não analisada
+    if linha is None or linha[0] < 0:
+        return None
+
+    return linha[0]
+
+
+def estimar_consulta(queryset: QuerySet) -> int:
+    plano = json.loads(queryset.order_by().explain(format="json"))
+    return int(plano[0]["Plan"]["Plan Rows"])
+
+
+def contar(queryset: QuerySet, chaves: Optional[list[str]] = None) -> Contagem:
+    if chaves is not None:
+        return contar_chaves(chaves)
+
+    if queryset.query.where:
+        estimativa = estimar_consulta(queryset)
+    else:
+        estimativa = estimar_tabela(queryset)
+
+    if estimativa is None or estimativa < settings.CONTAGEM_EXATA_LIMITE:
+        return Contagem(queryset.count(), True)
+
+    return Contagem(estimativa, False)
@@ -0,0 +1,89 @@
+"""
+Métricas dos pools de conexão do psycopg 3 (POSTGRES_POOL=1).
+
+Cada processo tem os seus pools, um por alias de banco; os contadores deles (requisições, espera por uma conexão
+livre, conexões descartadas no health check) são somados no Redis de tempos em tempos, no fim de requisições e
+tarefas, para o comando pool_stats mostrar o total de todos os processos.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.postgresql.base import DatabaseWrapper
+
+POOL_STATS_INTERVALO = 60
+
+# Contadores acumulados que pop_stats() zera a cada leitura; os demais valores são instantâneos, do processo
+POOL_CONTADORES = (
+    "requests_num",
+    "requests_queued",
+    "requests_wait_ms",
+    "requests_errors",
+    "connections_num",
+    "connections_ms",
+    "connections_errors",
+    "connections_lost",
+    "usage_ms",
+)
+
+_ultimo_envio = 0.0
+
+
+def _stats_key(alias: str) -> str:
+    return cache.make_and_validate_key(f"db_pool:{alias}")
+
+
+def enviar_pool_stats(forcar: bool = False) -> None:
+    """
+    Soma no Redis o que os pools deste processo contaram desde o último envio, no máximo um envio por intervalo.
+    """
+    global _ultimo_envio
+
+    agora = time.monotonic()
+    if not forcar and agora - _ultimo_envio < POOL_STATS_INTERVALO:
+        return
+    _ultimo_envio = agora
+
+    pools = dict(DatabaseWrapper._connection_pools)
+    if not pools:
+        return
+
+    with cache._cache.get_client(write=True).pipeline(transaction=False) as pipe:
+        for alias, pool in pools.items():
+            stats = pool.pop_stats()
+            for contador in POOL_CONTADORES:
+                if stats.get(contador):
+                    pipe.hincrby(_stats_key(alias), contador, stats[contador])
+        pipe.execute()
+
+
+def get_pool_stats() -> dict[str, dict[str, int]]:
+    redis = cache._cache.get_client()
+    stats = {}
+    for alias in connections.settings:
+        valores = redis.hgetall(_stats_key(alias))
+        if valores:
+            contadores = {campo.decode(): int(valor) for campo, valor in valores.items()}
+            stats[alias] = {contador: contadores.get(contador, 0) for contador in POOL_CONTADORES}
+
+    return stats
+
+
+@contextmanager
+def alias_temporario(alias: str, **config: Any) -> Iterator[DatabaseWrapper]:
+    """
+    Conexão com a configuração do default alterada por `config`, para comparar modos de conexão no mesmo processo
+    (benchmark_conexoes). Cada thread que usar o alias fecha a sua conexão antes de sair.
+    """
+    connections.settings[alias] = {**connections.settings["default"], **config}
+    conexao = connections[alias]
+    try:
+        yield conexao
+    finally:
+        conexao.close()
+        conexao.close_pool()
+        del connections[alias]
+        del connections.settings[alias]
@@ -0,0 +1,90 @@
+"""
+Leituras na réplica do Postgres, quando configurada (REPLICA_DATABASE).
+
+Nada vai para a réplica por padrão: só as consultas feitas com a leitura na réplica ligada, que são os GET de
+NoticiaViewSet e UserPlanViewSet (também nas views assíncronas) e as partes só de leitura das tarefas do Celery.
+Escritas e qualquer consulta dentro de uma transação ficam no primário.
+
+Depois de uma escrita o usuário volta a ler do primário por REPLICA_STICKY_SECONDS, para ver o que acabou de
+gravar mesmo com a réplica atrasada.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model
+
+# ContextVar e não thread local: sync_to_async leva o valor para a thread do ORM nas views assíncronas
+_leitura_replica: ContextVar[bool] = ContextVar("leitura_replica", default=False)
+
+
+def usar_replica() -> Token:
+    return _leitura_replica.set(True)
+
+
+def usar_primario() -> Token:
+    return _leitura_replica.set(False)
+
+
+def restaurar_leitura(token: Token) -> None:
+    _leitura_replica.reset(token)
+
+
+@contextmanager
+def ler_da_replica() -> Iterator[None]:
+    token = usar_replica()
+    try:
+        yield
+    finally:
+        restaurar_leitura(token)
+
+
+def _escrita_key(user_id: Any) -> str:
+    return f"replica:escrita:{user_id}"
+
+
+def marcar_escrita(user: Any) -> None:
+    if settings.REPLICA_DATABASE is not None and user.is_authenticated:
+        cache.set(_escrita_key(user.id), 1, timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+def escreveu_recentemente(user: Any) -> bool:
+    if settings.REPLICA_DATABASE is None or not user.is_authenticated:
+        return False
+
+    return cache.get(_escrita_key(user.id)) is not None
+
+
+async def aescreveu_recentemente(user: Any) -> bool:
+    if settings.REPLICA_DATABASE is None or not user.is_authenticated:
+        return False
+
+    return await cache.aget(_escrita_key(user.id)) is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model: type[Model], **hints: Any) -> Optional[str]:
+        if settings.REPLICA_DATABASE is None or not _leitura_replica.get():
+            return None
+
+        # Dentro de uma transação a leitura fica no primário e vê o que a própria transação escreveu
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+
+        return settings.REPLICA_DATABASE
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        # Também para instâncias carregadas da réplica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool:
+        # Primário e réplica têm os mesmos dados
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints: Any) -> bool:
+        # A réplica recebe o schema pela replicação
+        return db == DEFAULT_DB_ALIAS
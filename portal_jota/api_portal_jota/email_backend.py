@@ -0,0 +1,110 @@
+"""
+Backend de email com um pool asyncio de conexões SMTP persistentes.
+
+Cada remetente do pool mantém uma conexão aberta e consome mensagens de uma fila comum, então o
+handshake (EHLO, STARTTLS, AUTH) é pago uma vez por conexão e não uma vez por mensagem. O envio em
+si usa o backend SMTP do Django (smtplib), executado em thread para não bloquear o loop.
+"""
+
+import asyncio
+import smtplib
+from typing import Optional, Sequence
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.smtp import EmailBackend as SMTPEmailBackend
+
+# Tudo que o envio de uma mensagem pode levantar; SMTPException herda de OSError
+ERROS_DE_ENVIO = (smtplib.SMTPException, OSError)
+
+
+def erro_transitorio(error: Exception) -> bool:
+    """
+    Conexão caída ou recusada e respostas 4xx valem uma nova tentativa; respostas 5xx (destinatário inexistente,
+    autenticação recusada, mensagem rejeitada) falham igual na próxima.
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+
+    # Demais SMTPException (extensão não suportada, resposta malformada) não mudam na próxima tentativa
+    return not isinstance(error, smtplib.SMTPException)
+
+
+class PooledSMTPEmailBackend(BaseEmailBackend):
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_delay: Optional[float] = None,
+        fail_silently: bool = False,
+        **kwargs: dict,
+    ) -> None:
+        super().__init__(fail_silently=fail_silently)
+        self.pool_size = pool_size or settings.EMAIL_POOL_SIZE
+        self.max_retries = settings.EMAIL_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_delay = settings.EMAIL_RETRY_DELAY if retry_delay is None else retry_delay
+        # host, port, username, use_tls... repassados a cada conexão do pool
+        self.connection_kwargs = kwargs
+
+    def send_messages(self, email_messages: Sequence[EmailMessage]) -> int:
+        if not email_messages:
+            return 0
+
+        enviados, erros = asyncio.run(self._send_all(list(email_messages)))
+
+        if erros and not self.fail_silently:
+            raise erros[0]
+
+        return enviados
+
+    async def _send_all(self, email_messages: list[EmailMessage]) -> tuple[int, list[Exception]]:
+        fila: asyncio.Queue[EmailMessage] = asyncio.Queue()
+        for message in email_messages:
+            fila.put_nowait(message)
+
+        erros: list[Exception] = []
+        remetentes = min(self.pool_size, len(email_messages))
+        enviados = await asyncio.gather(*(self._sender(fila, erros) for _ in range(remetentes)))
+
+        return sum(enviados), erros
+
+    async def _sender(self, fila: asyncio.Queue, erros: list[Exception]) -> int:
+        conexao = SMTPEmailBackend(fail_silently=False, **self.connection_kwargs)
+        enviados = 0
+
+        try:
+            while not fila.empty():
+                message = fila.get_nowait()
+                try:
+                    enviados += await self._send_with_retry(conexao, message)
+                except ERROS_DE_ENVIO as error:
+                    # Uma mensagem recusada ou que esgota as tentativas não derruba o resto do lote
+                    erros.append(error)
+        finally:
+            await asyncio.to_thread(conexao.close)
+
+        return enviados
+
+    async def _send_with_retry(self, conexao: SMTPEmailBackend, message: EmailMessage) -> int:
+        for tentativa in range(self.max_retries + 1):
+            try:
+                # open() antes do envio mantém a conexão aberta depois dele
+                await asyncio.to_thread(conexao.open)
+                return await asyncio.to_thread(conexao.send_messages, [message])
+            except ERROS_DE_ENVIO as error:
+                # Reabre do zero na próxima mensagem ou tentativa; o servidor pode ter derrubado a conexão
+                await asyncio.to_thread(conexao.close)
+
+                if tentativa == self.max_retries or not erro_transitorio(error):
+                    raise
+
+                await asyncio.sleep(self.retry_delay * 2**tentativa)
+
+        return 0
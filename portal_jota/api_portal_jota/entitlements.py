@@ -0,0 +1,113 @@
+"""
+Snapshot do direito de acesso de um leitor (plano + verticais), mantido no cache.
+
+A chave do snapshot inclui a versão do plano do usuário. Qualquer alteração no plano ou nas
+verticais incrementa a versão, tornando o snapshot anterior inalcançável. A mesma versão vai nas
+claims do access token (ver authentication.py), que deixam de valer quando ela muda.
+
+A versão começa no relógio em nanossegundos, não em 1: se a chave sumir do Redis, a nova versão é maior que
+qualquer uma já emitida, e snapshots e tokens antigos não voltam a valer.
+"""
+
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .enums.plan_enum import PlanEnum
+from .enums.vertical_enum import VerticalEnum
+from .types import UserId
+
+ENTITLEMENT_TIMEOUT = 60 * 60
+
+
+@dataclass(frozen=True)
+class ReaderEntitlement:
+    plan: str
+    verticais_mask: int
+    version: int
+
+    @property
+    def is_pro(self) -> bool:
+        return self.plan == PlanEnum.JOTA_PRO
+
+    @property
+    def verticais(self) -> list[str]:
+        return VerticalEnum.labels_from_mask(self.verticais_mask)
+
+    def can_read(self, verticais_mask_da_noticia: int) -> bool:
+        return bool(self.verticais_mask & verticais_mask_da_noticia)
+
+
+def _version_key(user_id: UserId) -> str:
+    return f"entitlement:version:{user_id}"
+
+
+def _snapshot_key(user_id: UserId, version: int) -> str:
+    return f"entitlement:{user_id}:v{version}"
+
+
+def _new_version() -> int:
+    return time.time_ns()
+
+
+def get_plan_version(user_id: UserId) -> int:
+    return cache.get_or_set(_version_key(user_id), _new_version, timeout=None)
+
+
+async def aget_plan_version(user_id: UserId) -> int:
+    return await cache.aget_or_set(_version_key(user_id), _new_version, timeout=None)
+
+
+def _build_entitlement(user_plan: dict, version: int) -> ReaderEntitlement:
+    return ReaderEntitlement(
+        plan=user_plan["plan"],
+        verticais_mask=user_plan["verticais_mask"],
+        version=version,
+    )
+
+
+def get_reader_entitlement(user_id: UserId) -> ReaderEntitlement:
+    from .models import UserPlanSchema
+
+    version = get_plan_version(user_id)
+    key = _snapshot_key(user_id, version)
+
+    entitlement = cache.get(key)
+    if entitlement is not None:
+        return entitlement
+
+    user_plan = UserPlanSchema.objects.values("plan", "verticais_mask").get(cd_user=user_id)
+    entitlement = _build_entitlement(user_plan, version)
+    cache.set(key, entitlement, timeout=ENTITLEMENT_TIMEOUT)
+    return entitlement
+
+
+async def aget_reader_entitlement(user_id: UserId) -> ReaderEntitlement:
+    from .models import UserPlanSchema
+
+    version = await aget_plan_version(user_id)
+    key = _snapshot_key(user_id, version)
+
+    entitlement = await cache.aget(key)
+    if entitlement is not None:
+        return entitlement
+
+    user_plan = await UserPlanSchema.objects.values("plan", "verticais_mask").aget(cd_user=user_id)
+    entitlement = _build_entitlement(user_plan, version)
+    await cache.aset(key, entitlement, timeout=ENTITLEMENT_TIMEOUT)
+    return entitlement
+
+
+def invalidate_reader_entitlement(user_id: UserId) -> None:
+    def bump() -> None:
+        key = _version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), timeout=None)
+
+    # Incrementa já e de novo no commit, para que leituras concorrentes não regravem um snapshot antigo
+    bump()
+    transaction.on_commit(bump)
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from ..enums.better_text_choices import BetterTextChoices
 
 
@@ -7,3 +9,37 @@ class VerticalEnum(BetterTextChoices):
     SAUDE = "S", "Saude"
     ENERGIA = "E", "Energia"
     TRABALHISTA = "W", "Trabalhista"
+
+    @property
+    def bit(self) -> int:
+        """Bit da vertical nas colunas verticais_mask, pela ordem de declaração"""
+        return 1 << list(type(self)).index(self)
+
+    @classmethod
+    def to_mask(cls, values: Iterable[str]) -> int:
+        mask = 0
+        for value in values:
+            mask |= cls(value).bit
+        return mask
+
+    @classmethod
+    def from_mask(cls, mask: int) -> list["VerticalEnum"]:
+        return [vertical for vertical in cls if mask & vertical.bit]
+
+    @classmethod
+    def mask_from_labels(cls, labels: Iterable[str]) -> int:
+        return cls.to_mask(cls.from_label(label) for label in labels)
+
+    @classmethod
+    def labels_from_mask(cls, mask: int) -> list[str]:
+        return [vertical.label for vertical in cls.from_mask(mask)]
+
+    @classmethod
+    def masks_intersecting(cls, mask: int) -> list[int]:
+        """
+        Todas as máscaras possíveis com algum bit em comum com `mask`.
+
+        Com poucas verticais, `verticais_mask & mask != 0` vira um `verticais_mask IN (...)`,
+        que usa o índice b-tree da coluna.
+        """
+        return [candidata for candidata in range(1, 1 << len(cls)) if candidata & mask]
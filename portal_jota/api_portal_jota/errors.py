@@ -1,3 +1,12 @@
 class ImageError(Exception):
     def __init__(self, message: str) -> None:
         self.message = message
+
+
+class UploadError(Exception):
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
+class UploadConflictError(UploadError):
+    pass
@@ -0,0 +1,159 @@
+"""
+Upload retomável de imagens de notícia, em partes.
+
+O cliente abre uma sessão com nome, tamanho e sha256 do arquivo, envia as partes indicando o offset em que
+cada uma começa e finaliza. Cada parte vai do corpo da requisição para um arquivo parcial em UPLOAD_TEMP_DIR
+em blocos pequenos, sem passar inteira pela memória. O tamanho desse arquivo é o offset da sessão: se a
+conexão cair no meio de uma parte, o que chegou fica gravado e o envio continua de onde parou.
+"""
+
+import fcntl
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import IO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+
+from .errors import ImageError, UploadConflictError, UploadError
+from .models.imagem_processada_schema import hash_file
+from .models.noticia_schema import check_image_header, check_image_type
+from .types import NoticiaId, UserId
+
+UPLOAD_BUFFER_SIZE = 64 * 1024
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass(frozen=True)
+class UploadSession:
+    id: str
+    noticia_id: NoticiaId
+    user_id: UserId
+    filename: str
+    tamanho: int
+    sha256: str
+
+    @property
+    def path(self) -> str:
+        return os.path.join(settings.UPLOAD_TEMP_DIR, f"{self.id}.part")
+
+
+def _session_key(upload_id: str) -> str:
+    return f"image_upload:{upload_id}"
+
+
+def _discard_expired_parts() -> None:
+    # Sessões abandonadas expiram no cache; os arquivos parciais delas são apagados na abertura das próximas
+    limite = time.time() - settings.UPLOAD_SESSION_TIMEOUT
+    with os.scandir(settings.UPLOAD_TEMP_DIR) as entradas:
+        for entrada in entradas:
+            if entrada.name.endswith(".part") and entrada.stat().st_mtime < limite:
+                os.remove(entrada.path)
+
+
+def start_upload(noticia_id: NoticiaId, user_id: UserId, filename: str, tamanho: int, sha256: str) -> UploadSession:
+    filename = os.path.basename(filename)
+    check_image_type(File(None, name=filename))
+
+    if not 0 < tamanho <= settings.IMAGE_MAX_BYTES:
+        raise ImageError(f"Imagem muito grande. O limite é de {settings.IMAGE_MAX_BYTES // (1024 * 1024)} MB")
+
+    sha256 = sha256.lower()
+    if not SHA256_PATTERN.match(sha256):
+        raise UploadError("sha256 deve ter 64 caracteres hexadecimais")
+
+    os.makedirs(settings.UPLOAD_TEMP_DIR, exist_ok=True)
+    _discard_expired_parts()
+
+    session = UploadSession(str(uuid.uuid4()), str(noticia_id), str(user_id), filename, tamanho, sha256)
+    open(session.path, "xb").close()
+    cache.set(_session_key(session.id), session, timeout=settings.UPLOAD_SESSION_TIMEOUT)
+    return session
+
+
+def get_upload_session(upload_id: str) -> UploadSession | None:
+    return cache.get(_session_key(upload_id))
+
+
+def upload_offset(session: UploadSession) -> int:
+    try:
+        return os.path.getsize(session.path)
+    except FileNotFoundError:
+        return 0
+
+
+def append_chunk(session: UploadSession, offset: int, stream: IO[bytes] | None, tamanho_parte: int) -> int:
+    """
+    Grava uma parte a partir de offset e devolve o novo offset.
+    """
+    if tamanho_parte > settings.UPLOAD_CHUNK_SIZE:
+        raise UploadError(f"Parte muito grande. O limite é de {settings.UPLOAD_CHUNK_SIZE} bytes")
+
+    if offset + tamanho_parte > session.tamanho:
+        raise UploadError(f"A parte ultrapassa o tamanho declarado de {session.tamanho} bytes")
+
+    with open(session.path, "ab") as parcial:
+        try:
+            # Uma parte por vez: outra requisição na mesma sessão recebe 409 em vez de intercalar bytes
+            fcntl.flock(parcial, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as error:
+            raise UploadConflictError("Outra parte desta sessão está sendo enviada") from error
+
+        atual = os.fstat(parcial.fileno()).st_size
+        if offset != atual:
+            raise UploadConflictError(f"Offset inválido. O próximo byte esperado é {atual}")
+
+        restante = tamanho_parte
+        while stream is not None and restante > 0:
+            bloco = stream.read(min(UPLOAD_BUFFER_SIZE, restante))
+            if not bloco:
+                break
+
+            parcial.write(bloco)
+            restante -= len(bloco)
+
+        parcial.flush()
+        cache.touch(_session_key(session.id), timeout=settings.UPLOAD_SESSION_TIMEOUT)
+        return atual + tamanho_parte - restante
+
+
+def discard_upload(session: UploadSession) -> None:
+    cache.delete(_session_key(session.id))
+    try:
+        os.remove(session.path)
+    except FileNotFoundError:
+        pass
+
+
+def open_finished_upload(session: UploadSession) -> File:
+    """
+    Confere tamanho, sha256 e cabeçalho do arquivo completo e o devolve aberto, pronto para ir para NoticiaSchema.
+    """
+    recebido = upload_offset(session)
+    if recebido != session.tamanho:
+        raise UploadConflictError(f"Upload incompleto: {recebido} de {session.tamanho} bytes recebidos")
+
+    imagem = File(open(session.path, "rb"), name=session.filename)
+    try:
+        # Mantido até o arquivo ser fechado: nenhuma parte nem outra finalização entra no meio
+        fcntl.flock(imagem, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError as error:
+        imagem.close()
+        raise UploadConflictError("Outra requisição está usando este upload") from error
+
+    try:
+        if hash_file(imagem) != session.sha256:
+            raise UploadError("sha256 não confere com o arquivo recebido")
+
+        check_image_header(imagem)
+    except (ImageError, UploadError):
+        # Conteúdo corrompido ou inválido não se corrige com mais partes: a sessão é descartada
+        imagem.close()
+        discard_upload(session)
+        raise
+
+    return imagem
@@ -0,0 +1,98 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections
+
+from ...db_pool import alias_temporario
+
+# Configuração de conexão de cada modo, por cima do banco default
+MODOS = {
+    # Como estão web WSGI, workers e beat sem POSTGRES_POOL: uma conexão por thread, reaproveitada por 60 s
+    "persistente": {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": False},
+    # Como está o web ASGI sem POSTGRES_POOL: uma conexão nova por requisição
+    "por_requisicao": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "pool": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara vazão e latência (p50/p99) de requisições simuladas ao banco default com conexões persistentes, "
+        "uma conexão por requisição e o pool do psycopg 3, em vários níveis de concorrência"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--modos", nargs="+", choices=list(MODOS), default=list(MODOS))
+        parser.add_argument("--concorrencia", nargs="+", type=int, default=[1, 10, 50])
+        parser.add_argument("--requisicoes", type=int, default=500, help="Requisições por nível de concorrência")
+        parser.add_argument("--pool-min", type=int, default=2)
+        parser.add_argument("--pool-max", type=int, default=8)
+        parser.add_argument("--consulta", default="SELECT 1", help="SQL executado em cada requisição")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for modo in options["modos"]:
+            config = dict(MODOS[modo])
+            if modo == "pool":
+                pool = {"min_size": options["pool_min"], "max_size": options["pool_max"]}
+                config["OPTIONS"] = {**connections.settings["default"]["OPTIONS"], "pool": pool}
+                self.stdout.write(f"{modo} (min {options['pool_min']}, max {options['pool_max']})")
+            else:
+                self.stdout.write(modo)
+
+            with alias_temporario(f"benchmark_{modo}", **config) as conexao:
+                for concorrencia in options["concorrencia"]:
+                    resultado = self.medir(conexao.alias, concorrencia, options["requisicoes"], options["consulta"])
+                    linha = (
+                        f"  concorrência {concorrencia:>4}: {resultado['vazao']:8.1f} req/s"
+                        f"  p50 {resultado['p50']:8.2f} ms  p99 {resultado['p99']:8.2f} ms"
+                    )
+
+                    if conexao.pool is not None:
+                        # Contadores zerados a cada nível; a espera é só o tempo na fila por uma conexão livre
+                        stats = conexao.pool.pop_stats()
+                        espera = stats.get("requests_wait_ms", 0) / max(stats.get("requests_num", 0), 1)
+                        linha += f"  espera no pool {espera:6.2f} ms  conexões abertas {stats.get('connections_num', 0)}"
+
+                    self.stdout.write(linha)
+
+    def medir(self, alias: str, concorrencia: int, requisicoes: int, consulta: str) -> dict[str, float]:
+        por_thread = [requisicoes // concorrencia + (i < requisicoes % concorrencia) for i in range(concorrencia)]
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+            latencias = [
+                latencia
+                for resultado in executor.map(lambda total: self.requisicoes(alias, total, consulta), por_thread)
+                for latencia in resultado
+            ]
+        duracao = time.perf_counter() - inicio
+
+        if len(latencias) > 1:
+            percentis = statistics.quantiles(latencias, n=100)
+            p50, p99 = percentis[49], percentis[98]
+        else:
+            p50 = p99 = latencias[0] if latencias else 0.0
+
+        return {"vazao": len(latencias) / duracao, "p50": p50, "p99": p99}
+
+    def requisicoes(self, alias: str, total: int, consulta: str) -> list[float]:
+        conexao = connections[alias]
+        latencias = []
+
+        try:
+            for _ in range(total):
+                inicio = time.perf_counter()
+                # O mesmo que request_started e request_finished fazem com as conexões do Django
+                conexao.close_if_unusable_or_obsolete()
+                with conexao.cursor() as cursor:
+                    cursor.execute(consulta)
+                    cursor.fetchall()
+                conexao.close_if_unusable_or_obsolete()
+                latencias.append((time.perf_counter() - inicio) * 1000)
+        finally:
+            conexao.close()
+
+        return latencias
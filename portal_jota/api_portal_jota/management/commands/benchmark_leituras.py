@@ -0,0 +1,122 @@
+import asyncio
+import statistics
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede vazão e latência (p50/p99) de leituras contra um servidor já rodando, em vários níveis de "
+        "concorrência, opcionalmente com clientes lentos segurando conexões abertas"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("urls", nargs="+", help="Ex.: http://localhost:8000/api/noticia/")
+        parser.add_argument("--concorrencia", nargs="+", type=int, default=[1, 10, 50])
+        parser.add_argument("--requisicoes", type=int, default=500, help="Requisições por nível de concorrência")
+        parser.add_argument("--token", help="Access token JWT enviado como Bearer")
+        parser.add_argument(
+            "--clientes-lentos",
+            type=int,
+            default=0,
+            help="Conexões que enviam a requisição pela metade e ficam abertas durante a medição",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for url in options["urls"]:
+            partes = urlsplit(url)
+            if partes.scheme != "http" or not partes.hostname:
+                raise CommandError(f"URL inválida: {url}. Só http é suportado")
+
+            self.stdout.write(f"{url} ({options['clientes_lentos']} clientes lentos)")
+            for concorrencia in options["concorrencia"]:
+                resultado = asyncio.run(
+                    self.medir(url, concorrencia, options["requisicoes"], options["token"], options["clientes_lentos"])
+                )
+                self.stdout.write(
+                    f"  concorrência {concorrencia:>4}: {resultado['vazao']:8.1f} req/s"
+                    f"  p50 {resultado['p50']:8.1f} ms  p99 {resultado['p99']:8.1f} ms  erros {resultado['erros']}"
+                )
+
+    async def medir(
+        self, url: str, concorrencia: int, requisicoes: int, token: str | None, clientes_lentos: int
+    ) -> dict[str, float]:
+        partes = urlsplit(url)
+        host, port = partes.hostname, partes.port or 80
+        alvo = partes.path + (f"?{partes.query}" if partes.query else "")
+
+        cabecalhos = f"GET {alvo} HTTP/1.1\r\nHost: {partes.netloc}\r\nConnection: close\r\n"
+        if token:
+            cabecalhos += f"Authorization: Bearer {token}\r\n"
+        requisicao = f"{cabecalhos}\r\n".encode()
+
+        lentos = [asyncio.create_task(self.cliente_lento(host, port, cabecalhos)) for _ in range(clientes_lentos)]
+        # Dá tempo para os clientes lentos ocuparem o servidor antes da medição
+        await asyncio.sleep(0.5 if lentos else 0)
+
+        semaforo = asyncio.Semaphore(concorrencia)
+        latencias: list[float] = []
+        erros = 0
+
+        async def uma_requisicao() -> None:
+            nonlocal erros
+            async with semaforo:
+                inicio = time.perf_counter()
+                try:
+                    status_code = await self.get(host, port, requisicao)
+                except OSError:
+                    status_code = 0
+
+                if status_code in (200, 304):
+                    latencias.append((time.perf_counter() - inicio) * 1000)
+                else:
+                    erros += 1
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(uma_requisicao() for _ in range(requisicoes)))
+        duracao = time.perf_counter() - inicio
+
+        for lento in lentos:
+            lento.cancel()
+        await asyncio.gather(*lentos, return_exceptions=True)
+
+        if len(latencias) > 1:
+            percentis = statistics.quantiles(latencias, n=100)
+            p50, p99 = percentis[49], percentis[98]
+        else:
+            p50 = p99 = latencias[0] if latencias else 0.0
+
+        return {"vazao": len(latencias) / duracao, "p50": p50, "p99": p99, "erros": erros}
+
+    async def get(self, host: str, port: int, requisicao: bytes) -> int:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(requisicao)
+            await writer.drain()
+            linha_status = await reader.readline()
+            # Connection: close; lê o corpo inteiro para a latência incluir a resposta toda
+            await reader.read()
+        finally:
+            writer.close()
+
+        try:
+            return int(linha_status.split()[1])
+        except (IndexError, ValueError):
+            return 0
+
+    async def cliente_lento(self, host: str, port: int, cabecalhos: str) -> None:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            return
+
+        try:
+            # Sem a linha em branco final o servidor continua esperando o resto dos cabeçalhos
+            writer.write(cabecalhos.encode())
+            await writer.drain()
+            await asyncio.Event().wait()
+        finally:
+            writer.close()
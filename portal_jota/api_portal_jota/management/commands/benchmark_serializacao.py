@@ -0,0 +1,136 @@
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ...enums.status_noticia_enum import StatusNoticiaEnum
+from ...enums.status_noticia_imagem_enum import StatusNoticiaImagemEnum
+from ...models import NoticiaSchema
+from ...renderers import ORJSONRenderer
+from ...serializers.noticia_serializer import CAMPOS_DA_LISTAGEM, NoticiaListSerializer, NoticiaSerializer
+
+# Colunas que a listagem carregava antes da projeção: todas menos o tsvector, adiado pelo manager
+COLUNAS_DO_MODEL = [field.attname for field in NoticiaSchema._meta.concrete_fields if field.name != "busca_vector"]
+
+CAMPOS_OMITIDOS_NA_LISTAGEM = [
+    "id",
+    "titulo",
+    "subtitulo",
+    "data_publicacao",
+    "autor_username",
+    "autor_id",
+    "is_pro",
+    "verticais",
+]
+
+
+class NoticiaSerializerAnterior(NoticiaSerializer):
+    """
+    A listagem antes da projeção: NoticiaSerializer sobre instâncias do model, com os campos que ela não devolve
+    retirados em get_fields e só a menor versão de cada formato no srcset.
+    """
+
+    def get_fields(self) -> dict[str, serializers.Field]:
+        fields = super().get_fields()
+        for campo in CAMPOS_OMITIDOS_NA_LISTAGEM:
+            fields.pop(campo)
+        return fields
+
+    def get_imagem_srcset(self, instance: NoticiaSchema) -> dict[str, dict[str, str]] | None:
+        srcset = super().get_imagem_srcset(instance)
+        if srcset is None:
+            return None
+        return {formato: dict(list(por_largura.items())[:1]) for formato, por_largura in srcset.items()}
+
+    def to_representation(self, instance: NoticiaSchema) -> dict:
+        return serializers.ModelSerializer.to_representation(self, instance)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o custo por linha da listagem reduzida de notícias, do resultado da consulta ao corpo JSON: instâncias "
+        "do model com NoticiaSerializer e JSONRenderer (antes) contra linhas de .values() com NoticiaListSerializer "
+        "e ORJSONRenderer (depois). Sem banco: as linhas são geradas em memória"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--linhas", type=int, default=100, help="Linhas por resposta, como o page_size")
+        parser.add_argument("--repeticoes", type=int, default=200)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        linhas, repeticoes = options["linhas"], options["repeticoes"]
+        colunas = [self.colunas(i) for i in range(linhas)]
+        context = {"request": Request(APIRequestFactory().get("/api/noticia/"))}
+
+        def antes_montagem() -> list:
+            # O que o ORM faz com cada linha do cursor antes da projeção
+            return [
+                NoticiaSchema.from_db("default", COLUNAS_DO_MODEL, [linha[coluna] for coluna in COLUNAS_DO_MODEL])
+                for linha in colunas
+            ]
+
+        def depois_montagem() -> list:
+            return [{campo: linha[campo] for campo in CAMPOS_DA_LISTAGEM} for linha in colunas]
+
+        caminhos = {
+            "antes": (antes_montagem, NoticiaSerializerAnterior, JSONRenderer()),
+            "depois": (depois_montagem, NoticiaListSerializer, ORJSONRenderer()),
+        }
+
+        self.stdout.write(f"{linhas} linhas por resposta, melhor de {repeticoes} repetições, µs por linha")
+        self.stdout.write(f"  {'':8}{'montagem':>12}{'serialização':>14}{'JSON':>10}{'total':>10}")
+
+        for nome, (montar, serializer_class, renderer) in caminhos.items():
+            objetos = montar()
+            data = serializer_class(objetos, many=True, context=context).data
+
+            tempos = [
+                self.medir(montar, repeticoes) / linhas,
+                self.medir(lambda: serializer_class(objetos, many=True, context=context).data, repeticoes) / linhas,
+                self.medir(lambda: renderer.render(data), repeticoes) / linhas,
+            ]
+            self.stdout.write(f"  {nome:8}{tempos[0]:12.2f}{tempos[1]:14.2f}{tempos[2]:10.2f}{sum(tempos):10.2f}")
+
+    def medir(self, funcao: Callable[[], Any], repeticoes: int) -> float:
+        # Melhor tempo, em µs: o mínimo é o que menos sofre com ruído do resto da máquina
+        melhor = float("inf")
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            melhor = min(melhor, time.perf_counter() - inicio)
+
+        return melhor * 1_000_000
+
+    def colunas(self, i: int) -> dict[str, Any]:
+        noticia_id = uuid.uuid4()
+        agora = timezone.now()
+        renditions = {
+            formato: {largura: f"noticias/{noticia_id}/foto-{largura}.{formato}" for largura in ("320", "640", "1280")}
+            for formato in ("webp", "avif")
+        }
+
+        return {
+            "id": noticia_id,
+            "titulo": f"Notícia {i}",
+            "subtitulo": "Subtítulo da notícia",
+            "imagem": f"noticias/{noticia_id}/foto.webp",
+            "status_imagem": StatusNoticiaImagemEnum.OK,
+            "imagem_renditions": renditions,
+            "imagem_processada_id": None,
+            "conteudo": "Conteúdo da notícia. " * 50,
+            "data_publicacao": agora - timedelta(minutes=i),
+            "autor_id": uuid.uuid4(),
+            "status": StatusNoticiaEnum.PUBLICADO,
+            "is_pro": False,
+            "verticais_mask": 1,
+            "publicacao_versao": 0,
+            "created_at": agora,
+            "updated_at": agora,
+        }
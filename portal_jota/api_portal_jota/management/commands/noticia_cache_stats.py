@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from ...noticia_cache import get_noticia_list_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Mostra os contadores de hit/miss do cache da listagem anônima de notícias"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stats = get_noticia_list_cache_stats()
+        total = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / total * 100 if total else 0.0
+
+        self.stdout.write(f"Hits: {stats['hits']}")
+        self.stdout.write(f"Misses: {stats['misses']}")
+        self.stdout.write(f"Hit rate: {hit_rate:.1f}%")
+        self.stdout.write(f"Geração: {stats['generation']}")
@@ -0,0 +1,30 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from ...db_pool import get_pool_stats
+
+
+class Command(BaseCommand):
+    help = "Mostra os contadores dos pools de conexão com o Postgres, somados entre todos os processos"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stats = get_pool_stats()
+        if not stats:
+            self.stdout.write("Nenhuma métrica de pool registrada (POSTGRES_POOL=1?)")
+
+        for alias, contadores in stats.items():
+            requisicoes = contadores["requests_num"]
+            na_fila = contadores["requests_queued"]
+            espera = contadores["requests_wait_ms"]
+            percentual_na_fila = na_fila / requisicoes * 100 if requisicoes else 0.0
+
+            self.stdout.write(f"{alias}:")
+            self.stdout.write(f"  Checkouts: {requisicoes}")
+            self.stdout.write(f"  Esperaram por conexão livre: {na_fila} ({percentual_na_fila:.1f}%)")
+            self.stdout.write(f"  Espera média por checkout: {espera / requisicoes if requisicoes else 0:.2f} ms")
+            self.stdout.write(f"  Espera média de quem esperou: {espera / na_fila if na_fila else 0:.2f} ms")
+            self.stdout.write(f"  Timeouts e erros no checkout: {contadores['requests_errors']}")
+            self.stdout.write(f"  Conexões abertas: {contadores['connections_num']}")
+            self.stdout.write(f"  Falhas ao conectar: {contadores['connections_errors']}")
+            self.stdout.write(f"  Descartadas no health check: {contadores['connections_lost']}")
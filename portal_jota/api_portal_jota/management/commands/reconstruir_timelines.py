@@ -0,0 +1,25 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...enums.vertical_enum import VerticalEnum
+from ...timelines import reconstruir_timeline
+
+
+class Command(BaseCommand):
+    help = "Reconstrói as timelines por vertical no Redis a partir das notícias publicadas no Postgres"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("verticais", nargs="*", help="Verticais a reconstruir, pelo nome; todas por padrão")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        verticais = []
+        for label in options["verticais"]:
+            vertical = VerticalEnum.from_label(label.capitalize())
+            if vertical is None:
+                raise CommandError(f"Vertical não encontrada: {label}. Verticais: {VerticalEnum.labels}")
+            verticais.append(vertical)
+
+        for vertical in verticais or VerticalEnum:
+            total = reconstruir_timeline(vertical)
+            self.stdout.write(f"{vertical.label}: {total} notícias")
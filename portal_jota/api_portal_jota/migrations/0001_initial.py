@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:50
+
+import api_portal_jota.models.noticia_schema
+import django.contrib.auth.models
+import django.contrib.auth.validators
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerticalSchema',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=25, unique=True)),
+                ('cod_categoria', models.CharField(choices=[('P', 'Poder'), ('T', 'Tributos'), ('S', 'Saude'), ('E', 'Energia'), ('W', 'Trabalhista')], max_length=1, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserSchema',
+            fields=[
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('username', models.CharField(error_messages={'unique': 'A user with that username already exists.'}, help_text='Required. 150 characters or fewer. Letters, digits and @/./+/-/_ only.', max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator()], verbose_name='username')),
+                ('first_name', models.CharField(blank=True, max_length=150, verbose_name='first name')),
+                ('last_name', models.CharField(blank=True, max_length=150, verbose_name='last name')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('role', models.CharField(choices=[('A', 'Admin'), ('E', 'Editor'), ('R', 'Leitor')], default='R', max_length=1)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
+            ],
+            options={
+                'verbose_name': 'user',
+                'verbose_name_plural': 'users',
+                'abstract': False,
+            },
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserPlanSchema',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('plan', models.CharField(choices=[('I', 'JOTA Info'), ('P', 'JOTA Pro')], default='I', max_length=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cd_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='user_plan', to=settings.AUTH_USER_MODEL)),
+                ('verticais', models.ManyToManyField(blank=True, to='api_portal_jota.verticalschema')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NoticiaSchema',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('titulo', models.CharField(max_length=50)),
+                ('subtitulo', models.CharField(max_length=100)),
+                ('imagem', models.FileField(blank=True, null=True, upload_to=api_portal_jota.models.noticia_schema.get_upload_to, validators=[api_portal_jota.models.noticia_schema.check_image_type])),
+                ('status_imagem', models.CharField(choices=[('K', 'OK'), ('P', 'Pendente'), ('I', 'Processando imagem'), ('E', 'Erro na imagem')], default='P', max_length=1)),
+                ('conteudo', models.TextField()),
+                ('data_publicacao', models.DateTimeField()),
+                ('status', models.CharField(choices=[('R', 'Rascunho'), ('P', 'Publicado')], default='R', max_length=1)),
+                ('is_pro', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('autor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='noticia', to=settings.AUTH_USER_MODEL)),
+                ('verticais', models.ManyToManyField(to='api_portal_jota.verticalschema')),
+            ],
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:50
+
+import api_portal_jota.models.noticia_schema
+import api_portal_jota.search
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_portal_jota', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImagemProcessadaSchema',
+            fields=[
+                ('sha256', models.CharField(editable=False, max_length=64, primary_key=True, serialize=False)),
+                ('imagem', models.CharField(max_length=255)),
+                ('renditions', models.JSONField(blank=True, default=dict)),
+                ('referencias', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='noticiaschema',
+            name='imagem_renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='noticiaschema',
+            name='publicacao_versao',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='noticiaschema',
+            name='verticais_mask',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userplanschema',
+            name='verticais_mask',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0),
+        ),
+        migrations.AlterField(
+            model_name='noticiaschema',
+            name='imagem',
+            field=models.FileField(blank=True, null=True, upload_to=api_portal_jota.models.noticia_schema.get_upload_to, validators=[api_portal_jota.models.noticia_schema.check_image_type, api_portal_jota.models.noticia_schema.check_image_header]),
+        ),
+        migrations.AddIndex(
+            model_name='userschema',
+            index=models.Index(fields=['role', 'id'], name='user_role_id_idx'),
+        ),
+        migrations.AddField(
+            model_name='noticiaschema',
+            name='imagem_processada',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='noticias', to='api_portal_jota.imagemprocessadaschema'),
+        ),
+        migrations.AddIndex(
+            model_name='noticiaschema',
+            index=models.Index(fields=['-data_publicacao', '-id'], name='noticia_publicacao_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='noticiaschema',
+            index=models.Index(condition=models.Q(('status', 'R')), fields=['data_publicacao'], name='noticia_rascunho_agendado_idx'),
+        ),
+        django.contrib.postgres.operations.UnaccentExtension(),
+        # unaccent() é STABLE (o dicionário vem do search_path) e não pode entrar em coluna gerada nem em índice; o
+        # wrapper fixa o dicionário e é declarado IMMUTABLE. Usado por busca_vector de NoticiaSchema
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+                AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS f_unaccent(text);",
+        ),
+        migrations.AddField(
+            model_name='noticiaschema',
+            name='busca_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector(api_portal_jota.search.Unaccent(models.F('titulo')), config='portuguese', weight='A'), '||', django.contrib.postgres.search.SearchVector(api_portal_jota.search.Unaccent(models.F('subtitulo')), config='portuguese', weight='B'), django.contrib.postgres.search.SearchConfig('portuguese')), '||', django.contrib.postgres.search.SearchVector(api_portal_jota.search.Unaccent(models.F('conteudo')), config='portuguese', weight='C'), django.contrib.postgres.search.SearchConfig('portuguese')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='noticiaschema',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['busca_vector'], name='noticia_busca_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+# Chaves de cada linha, no mesmo formato de contagem.py
+CHAVES_SQL = """
+CREATE OR REPLACE FUNCTION contador_chaves_plano(plan text) RETURNS SETOF text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT 'plano:' || plan $$;
+"""
+
+# Triggers por comando, não por linha: um update() em lote de planos é um UPDATE só e vira um único upsert agregado.
+# As chaves são gravadas em ordem, para dois comandos concorrentes travarem os contadores na mesma sequência
+CONTADOR_SQL = """
+CREATE OR REPLACE FUNCTION contador_atualizar() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+    DECLARE
+        chaves text := TG_ARGV[0];
+        deltas text;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            deltas := format('SELECT %s AS chave, 1 AS delta FROM novas', chaves);
+        ELSIF TG_OP = 'DELETE' THEN
+            deltas := format('SELECT %s AS chave, -1 AS delta FROM antigas', chaves);
+        ELSE
+            deltas := format(
+                'SELECT %1$s AS chave, -1 AS delta FROM antigas UNION ALL SELECT %1$s, 1 FROM novas', chaves
+            );
+        END IF;
+
+        EXECUTE format(
+            'INSERT INTO api_portal_jota_contadorschema (chave, total)
+             SELECT chave, sum(delta) FROM (%s) AS deltas GROUP BY chave HAVING sum(delta) <> 0 ORDER BY chave
+             ON CONFLICT (chave) DO UPDATE SET total = api_portal_jota_contadorschema.total + EXCLUDED.total',
+            deltas
+        );
+        RETURN NULL;
+    END
+    $$;
+"""
+
+
+def triggers_sql(tabela: str, chaves: str) -> str:
+    return f"""
+    CREATE TRIGGER contador_insert AFTER INSERT ON {tabela} REFERENCING NEW TABLE AS novas
+        FOR EACH STATEMENT EXECUTE FUNCTION contador_atualizar('{chaves}');
+    CREATE TRIGGER contador_update AFTER UPDATE ON {tabela} REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+        FOR EACH STATEMENT EXECUTE FUNCTION contador_atualizar('{chaves}');
+    CREATE TRIGGER contador_delete AFTER DELETE ON {tabela} REFERENCING OLD TABLE AS antigas
+        FOR EACH STATEMENT EXECUTE FUNCTION contador_atualizar('{chaves}');
+    -- Linhas que já existiam antes dos triggers
+    INSERT INTO api_portal_jota_contadorschema (chave, total)
+    SELECT chave, count(*) FROM (SELECT {chaves} AS chave FROM {tabela}) AS chaves GROUP BY chave
+    ON CONFLICT (chave) DO UPDATE SET total = EXCLUDED.total;
+    """
+
+
+def drop_triggers_sql(tabela: str) -> str:
+    return f"""
+    DROP TRIGGER IF EXISTS contador_insert ON {tabela};
+    DROP TRIGGER IF EXISTS contador_update ON {tabela};
+    DROP TRIGGER IF EXISTS contador_delete ON {tabela};
+    """
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_portal_jota', '0002_verticais_imagens_busca_e_indices'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorSchema',
+            fields=[
+                ('chave', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('total', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunSQL(
+            sql=CHAVES_SQL + CONTADOR_SQL,
+            reverse_sql="""
+            DROP FUNCTION IF EXISTS contador_atualizar();
+            DROP FUNCTION IF EXISTS contador_chaves_plano(text);
+            """,
+        ),
+        migrations.RunSQL(
+            sql=triggers_sql("api_portal_jota_userplanschema", "contador_chaves_plano(plan)"),
+            reverse_sql=drop_triggers_sql("api_portal_jota_userplanschema"),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+from django.db.models import F
+
+# Bit de cada vertical (VerticalEnum.bit) fixado aqui: a migração não pode mudar se a ordem do enum mudar
+BITS_DAS_VERTICAIS = {"P": 1 << 0, "T": 1 << 1, "S": 1 << 2, "E": 1 << 3, "W": 1 << 4}
+
+
+def preencher_verticais_mask(apps, schema_editor) -> None:
+    """
+    Bancos atualizados a partir da 0001_initial ganharam verticais_mask zerada na 0002; a máscara passa a refletir o
+    m2m verticais que as notícias e os planos já tinham. Um UPDATE por vertical e por tabela, com OR do bit, para não
+    percorrer as linhas uma a uma.
+    """
+    VerticalSchema = apps.get_model("api_portal_jota", "VerticalSchema")
+
+    for model_name in ("NoticiaSchema", "UserPlanSchema"):
+        model = apps.get_model("api_portal_jota", model_name)
+        for vertical in VerticalSchema.objects.all():
+            model.objects.filter(verticais=vertical).update(
+                verticais_mask=F("verticais_mask").bitor(BITS_DAS_VERTICAIS[vertical.cod_categoria])
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_portal_jota', '0003_contadores'),
+    ]
+
+    operations = [
+        migrations.RunPython(preencher_verticais_mask, migrations.RunPython.noop),
+    ]
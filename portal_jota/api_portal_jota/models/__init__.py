@@ -1,3 +1,5 @@
+from .contador_schema import ContadorSchema
+from .imagem_processada_schema import ImagemProcessadaSchema
 from .noticia_schema import NoticiaSchema
 from .user_plan_schema import UserPlanSchema
 from .user_schema import UserSchema
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class ContadorSchema(models.Model):
+    """
+    Total de linhas por chave (planos por tipo), mantido por triggers no Postgres a cada INSERT, UPDATE e DELETE,
+    inclusive os feitos por update() e bulk_create. As chaves estão em contagem.py
+    """
+
+    chave = models.CharField(max_length=50, primary_key=True)
+    total = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"Contador: {self.chave} = {self.total}"
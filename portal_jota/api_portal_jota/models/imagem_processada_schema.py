@@ -0,0 +1,57 @@
+from hashlib import sha256
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import models
+from django.db.models import F
+from django.db.transaction import atomic, on_commit
+
+
+def hash_file(file: File) -> str:
+    # Lê em blocos; o upload nunca fica inteiro na memória
+    digest = sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+
+    file.seek(0)
+    return digest.hexdigest()
+
+
+class ImagemProcessadaSchema(models.Model):
+    """
+    Saídas de process_image endereçadas pelo sha256 do upload original, compartilhadas entre notícias.
+    Os arquivos só são apagados quando a última notícia que os referencia deixa de usá-los.
+    """
+
+    sha256 = models.CharField(max_length=64, primary_key=True, editable=False)
+    imagem = models.CharField(max_length=255)
+    renditions = models.JSONField(default=dict, blank=True)
+    referencias = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+
+    def __str__(self) -> str:
+        return f"ImagemProcessada: {self.sha256} - {self.referencias} referências"
+
+    def arquivos(self) -> list[str]:
+        return [self.imagem, *(name for por_largura in self.renditions.values() for name in por_largura.values())]
+
+    @classmethod
+    def acquire(cls, sha256: str) -> None:
+        cls.objects.filter(sha256=sha256).update(referencias=F("referencias") + 1)
+
+    @classmethod
+    @atomic
+    def release(cls, sha256: str) -> None:
+        # O lock serializa com quem está reaproveitando a mesma imagem
+        processada = cls.objects.select_for_update().filter(sha256=sha256).first()
+        if processada is None:
+            return
+
+        if processada.referencias > 1:
+            cls.objects.filter(sha256=sha256).update(referencias=F("referencias") - 1)
+            return
+
+        arquivos = processada.arquivos()
+        processada.delete()
+        on_commit(lambda: [default_storage.delete(name) for name in arquivos])
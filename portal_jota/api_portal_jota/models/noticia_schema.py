@@ -3,15 +3,22 @@ from __future__ import annotations
 import uuid
 from typing import Any
 
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.db.models import FileField
-from django.db.transaction import atomic
+from django.db.models import FileField, Q
+from django.db.transaction import atomic, on_commit
 from django.utils import timezone
 
 from ..enums.email_type_enum import EmailTypeEnum
 from ..enums.status_noticia_enum import StatusNoticiaEnum
 from ..enums.status_noticia_imagem_enum import StatusNoticiaImagemEnum
 from ..errors import ImageError
+from ..noticia_cache import invalidate_noticia_list_cache
+from ..search import busca_vector
+from ..timelines import sincronizar_timelines_no_commit
+from .imagem_processada_schema import ImagemProcessadaSchema, hash_file
 
 
 def get_upload_to(instance: "NoticiaSchema", filename: str) -> str:
@@ -31,37 +38,160 @@ def check_image_type(file: FileField) -> FileField:
     return file
 
 
+def check_image_header(file: FileField) -> FileField:
+    """
+    Confere o formato real e as dimensões lendo só o cabeçalho, para recusar o arquivo antes de enfileirá-lo.
+    """
+    # Só o web valida uploads; a imagem do beat carrega os models sem o Pillow
+    from PIL import Image, UnidentifiedImageError
+
+    if file.size > settings.IMAGE_MAX_BYTES:
+        raise ImageError(f"Imagem muito grande. O limite é de {settings.IMAGE_MAX_BYTES // (1024 * 1024)} MB")
+
+    try:
+        # Image.open é preguiçoso: lê o cabeçalho e não decodifica os pixels
+        with Image.open(file) as image:
+            formato, (largura, altura) = image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError) as error:
+        raise ImageError("Arquivo de imagem inválido") from error
+    finally:
+        file.seek(0)
+
+    if formato not in ["JPEG", "PNG"]:
+        raise ImageError(f"Imagem incompatível. O conteúdo do arquivo é {formato}")
+
+    if largura * altura > settings.IMAGE_MAX_PIXELS:
+        raise ImageError(f"Imagem muito grande. O limite é de {settings.IMAGE_MAX_PIXELS} pixels")
+
+    return file
+
+
+class NoticiaManager(models.Manager):
+    def get_queryset(self) -> models.QuerySet:
+        # O tsvector só é usado no WHERE da busca; não precisa trafegar em cada SELECT
+        return super().get_queryset().defer("busca_vector")
+
+
 class NoticiaSchema(models.Model):
     id = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
     titulo = models.CharField(max_length=50)
     subtitulo = models.CharField(max_length=100)
-    imagem = models.FileField(upload_to=get_upload_to, blank=True, null=True, validators=[check_image_type])
+    imagem = models.FileField(
+        upload_to=get_upload_to, blank=True, null=True, validators=[check_image_type, check_image_header]
+    )
     status_imagem = models.CharField(
         max_length=1, choices=StatusNoticiaImagemEnum.choices, default=StatusNoticiaImagemEnum.PENDENTE
     )
+    # Versões menores da imagem por formato e largura ({"webp": {"320": nome}}), geradas por process_image
+    imagem_renditions = models.JSONField(default=dict, blank=True)
+    # Saída compartilhada de onde vêm imagem e imagem_renditions depois de processadas
+    imagem_processada = models.ForeignKey(
+        "ImagemProcessadaSchema", null=True, blank=True, on_delete=models.PROTECT, related_name="noticias"
+    )
     conteudo = models.TextField()
     data_publicacao = models.DateTimeField()
     autor = models.ForeignKey("UserSchema", on_delete=models.CASCADE, related_name="noticia")
     status = models.CharField(max_length=1, choices=StatusNoticiaEnum.choices, default=StatusNoticiaEnum.RASCUNHO)
     is_pro = models.BooleanField(default=False)
     verticais = models.ManyToManyField("VerticalSchema")
+    # Cópia desnormalizada de verticais (bits de VerticalEnum), mantida pelo sinal m2m_changed
+    # Sem índice: só é lida com bitand, que um btree não atende
+    verticais_mask = models.PositiveSmallIntegerField(default=0)
+    # Token de agendamento; cada nova data_publicacao invalida as tarefas de publicação já enfileiradas
+    publicacao_versao = models.PositiveIntegerField(default=0)
+    # Recalculado pelo Postgres a cada escrita da linha; ver search.py
+    busca_vector = models.GeneratedField(expression=busca_vector(), output_field=SearchVectorField(), db_persist=True)
 
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = NoticiaManager()
+
+    class Meta:
+        # autor usa o índice do próprio FK (filtro do editor e cascade ao apagar o usuário). is_pro não tem índice:
+        # é um booleano avaliado nas linhas já alcançadas por outro índice. Os planos das consultas quentes são
+        # conferidos em tests/tests_query_plans.py
+        indexes = [
+            # Suporta a paginação por keyset da listagem (data_publicacao DESC, id DESC)
+            models.Index(fields=["-data_publicacao", "-id"], name="noticia_publicacao_id_idx"),
+            # Rascunhos a publicar (publicar_noticia e agendamento por ETA); as publicadas, quase todas as linhas,
+            # ficam de fora do índice
+            models.Index(
+                fields=["data_publicacao"],
+                name="noticia_rascunho_agendado_idx",
+                condition=Q(status=StatusNoticiaEnum.RASCUNHO),
+            ),
+            GinIndex(fields=["busca_vector"], name="noticia_busca_vector_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"Noticia: {self.titulo} - {self.data_publicacao} - {self.autor.username}"
 
+    def usar_imagem_processada(self, processada: ImagemProcessadaSchema) -> str | None:
+        """
+        Aponta a notícia para uma imagem já processada e devolve a referência anterior,
+        que deve ser liberada com trocar_imagem_processada depois de salvar.
+        """
+        anterior = self.imagem_processada_id
+        self.imagem = processada.imagem
+        self.imagem_renditions = processada.renditions
+        self.imagem_processada = processada
+        self.status_imagem = StatusNoticiaImagemEnum.OK
+        return anterior
+
+    @staticmethod
+    def trocar_imagem_processada(anterior: str | None, nova: str) -> None:
+        if anterior == nova:
+            return
+
+        ImagemProcessadaSchema.acquire(nova)
+        if anterior is not None:
+            ImagemProcessadaSchema.release(anterior)
+
     @atomic  # type: ignore
     def save(self, *args: tuple, **kwargs: dict[str, list | Any]) -> None:
         is_new = self._state.adding
+        # Upload recém-recebido, ainda não gravado no storage
+        imagem_enviada = bool(self.imagem) and not self.imagem._committed
+
+        reaproveitada = None
+        if imagem_enviada:
+            # Mesmo conteúdo já processado: reaproveita as saídas e não grava nem processa o upload
+            processada = ImagemProcessadaSchema.objects.select_for_update().filter(sha256=hash_file(self.imagem))
+            reaproveitada = processada.first()
+
+        if reaproveitada is not None:
+            imagem_anterior = self.usar_imagem_processada(reaproveitada)
+            if kwargs.get("update_fields") is not None:
+                campos_imagem = ["imagem", "imagem_renditions", "imagem_processada", "status_imagem"]
+                kwargs["update_fields"] = [*kwargs["update_fields"], *campos_imagem]
+
         has_image = bool(self.imagem)
 
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "updated_at" not in update_fields:
+            # auto_now só é gravado se estiver em update_fields; os validadores de GET condicional dependem dele
+            kwargs["update_fields"] = [*update_fields, "updated_at"]
+
+        reagendada = update_fields is None or "data_publicacao" in update_fields
+        if reagendada:
+            self.publicacao_versao += 1
+            if update_fields is not None:
+                kwargs["update_fields"] = [*kwargs["update_fields"], "publicacao_versao"]
+
         super().save(*args, **kwargs)
 
+        if reaproveitada is not None:
+            self.trocar_imagem_processada(imagem_anterior, reaproveitada.sha256)
+
+        invalidate_noticia_list_cache()
+
+        if update_fields is None or {"status", "data_publicacao", "verticais_mask", "is_pro"} & set(update_fields):
+            sincronizar_timelines_no_commit([self.id])
+
         agora = timezone.now()
 
-        update_fields: list | dict = kwargs.get("update_fields", [])
+        update_fields: list | dict = kwargs.get("update_fields") or []
 
         if all(
             [
@@ -83,7 +213,7 @@ class NoticiaSchema(models.Model):
                 }
             )
 
-        imagem_alterada = "imagem" in update_fields
+        imagem_alterada = "imagem" in update_fields or imagem_enviada
 
         if any(
             [
@@ -94,8 +224,21 @@ class NoticiaSchema(models.Model):
             if get_image_extension(self.imagem) != "webp":
                 from ..tasks.process_image import process_image
 
-                process_image.delay(str(self.id))
-
                 if not is_new:
+                    # Antes de enfileirar, para não sobrescrever o status gravado pela tarefa
                     self.status_imagem = StatusNoticiaImagemEnum.PENDENTE
                     self.save(update_fields=["status_imagem"])
+
+                process_image.delay(str(self.id))
+
+        if all(
+            [
+                settings.PUBLICACAO_POR_ETA,
+                reagendada,
+                self.status == StatusNoticiaEnum.RASCUNHO,
+            ]
+        ):
+            from ..tasks.publicar_noticia import agendar_publicacao
+
+            noticia_id, versao, data_publicacao = str(self.id), self.publicacao_versao, self.data_publicacao
+            on_commit(lambda: agendar_publicacao(noticia_id, versao, data_publicacao))
@@ -10,6 +10,8 @@ class UserPlanSchema(models.Model):
     plan = models.CharField(max_length=1, choices=PlanEnum.choices, default=PlanEnum.JOTA_INFO)
     cd_user = models.OneToOneField("UserSchema", on_delete=models.CASCADE, related_name="user_plan")
     verticais = models.ManyToManyField("VerticalSchema", blank=True)
+    # Cópia desnormalizada de verticais (bits de VerticalEnum), mantida pelo sinal m2m_changed
+    verticais_mask = models.PositiveSmallIntegerField(default=0, db_index=True)
 
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
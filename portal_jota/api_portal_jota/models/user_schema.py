@@ -17,6 +17,12 @@ class UserSchema(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Distribuição de e-mails percorre os leitores em ordem de id
+            models.Index(fields=["role", "id"], name="user_role_id_idx"),
+        ]
+
     def __str__(self) -> str:
         default_str = f"{self.username}: <Role: {self.role}>"
 
@@ -0,0 +1,82 @@
+"""
+Cache de respostas da listagem anônima de notícias.
+
+As chaves incluem uma geração global; qualquer escrita em NoticiaSchema incrementa a geração e
+todas as páginas em cache deixam de ser alcançáveis, expirando sozinhas pelo timeout.
+"""
+
+from hashlib import sha256
+from typing import TYPE_CHECKING, Any, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+if TYPE_CHECKING:
+    # Worker e beat não instalam o DRF
+    from rest_framework.request import Request
+
+LIST_CACHE_TIMEOUT = 60 * 5
+
+GENERATION_KEY = "noticia_list:generation"
+HITS_KEY = "noticia_list:hits"
+MISSES_KEY = "noticia_list:misses"
+
+
+def _incr(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+async def _aincr(key: str) -> None:
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, timeout=None)
+
+
+def _list_key(request: "Request", generation: int) -> str:
+    # Host entra na chave porque as URLs de imagem e de paginação são absolutas
+    params = sorted(request.query_params.lists())
+    digest = sha256(f"{request.get_host()}|{request.path}|{params}".encode()).hexdigest()
+    return f"noticia_list:{generation}:{digest}"
+
+
+def get_cached_list(request: "Request") -> tuple[str, Optional[Any]]:
+    key = _list_key(request, cache.get_or_set(GENERATION_KEY, 1, timeout=None))
+    data = cache.get(key)
+
+    _incr(MISSES_KEY if data is None else HITS_KEY)
+    return key, data
+
+
+async def aget_cached_list(request: "Request") -> tuple[str, Optional[Any]]:
+    key = _list_key(request, await cache.aget_or_set(GENERATION_KEY, 1, timeout=None))
+    data = await cache.aget(key)
+
+    await _aincr(MISSES_KEY if data is None else HITS_KEY)
+    return key, data
+
+
+def cache_list(key: str, data: Any) -> None:
+    cache.set(key, data, timeout=LIST_CACHE_TIMEOUT)
+
+
+async def acache_list(key: str, data: Any) -> None:
+    await cache.aset(key, data, timeout=LIST_CACHE_TIMEOUT)
+
+
+def invalidate_noticia_list_cache() -> None:
+    # Incrementa já e de novo no commit, para não guardar uma página lida antes do commit
+    _incr(GENERATION_KEY)
+    transaction.on_commit(lambda: _incr(GENERATION_KEY))
+
+
+def get_noticia_list_cache_stats() -> dict[str, int]:
+    stats = cache.get_many([HITS_KEY, MISSES_KEY, GENERATION_KEY])
+    return {
+        "hits": stats.get(HITS_KEY, 0),
+        "misses": stats.get(MISSES_KEY, 0),
+        "generation": stats.get(GENERATION_KEY, 1),
+    }
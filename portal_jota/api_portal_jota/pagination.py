@@ -0,0 +1,296 @@
+import json
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .contagem import Contagem, contar
+from .enums.vertical_enum import VerticalEnum
+from .timelines import ler_timelines
+
+Position = tuple[datetime, str]
+
+
+class NoticiaCursorPagination(BasePagination):
+    """
+    Paginação por keyset ordenada por (data_publicacao DESC, id DESC).
+
+    Só é ativada quando o cliente envia `cursor` ou `page_size`, mantendo a listagem
+    completa como comportamento padrão. Cada página é resolvida por uma faixa do índice
+    `noticia_publicacao_id_idx`, sem COUNT(*) e sem OFFSET.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 20
+    max_page_size = 100
+    invalid_cursor_message = "Cursor inválido."
+
+    def is_requested(self, request: Request) -> bool:
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> Optional[list]:
+        if not self.is_requested(request):
+            return None
+
+        self.page = self.fetch_page(self.get_page_queryset(queryset, request))
+        return self.page
+
+    def get_page_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        """Queryset da página pedida, ainda não avaliado, com uma linha extra para saber se há mais"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        ordering = ("data_publicacao", "id") if self.reverse else ("-data_publicacao", "-id")
+        queryset = queryset.order_by(*ordering)
+
+        if self.position is not None:
+            queryset = queryset.filter(self._after(self.position, self.reverse))
+
+        return queryset[: self.page_size + 1]
+
+    def fetch_page(self, page_queryset: Iterable) -> list:
+        results = list(page_queryset)
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        return results
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def encode_cursor(self, position: Position, reverse: bool) -> str:
+        data_publicacao, noticia_id = position
+        payload = json.dumps({"d": data_publicacao.isoformat(), "i": noticia_id, "r": int(reverse)})
+        token = urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request: Request) -> tuple[Optional[Position], bool]:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+
+        try:
+            payload = json.loads(urlsafe_b64decode(token.encode()).decode())
+            position = (datetime.fromisoformat(payload["d"]), str(uuid.UUID(payload["i"])))
+            return position, bool(payload.get("r", 0))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+    @staticmethod
+    def _position(noticia: Any) -> Position:
+        # Instância do model ou linha de .values() da listagem reduzida
+        if isinstance(noticia, dict):
+            return noticia["data_publicacao"], str(noticia["id"])
+        return noticia.data_publicacao, str(noticia.id)
+
+    @staticmethod
+    def _after(position: Position, reverse: bool) -> Q:
+        data_publicacao, noticia_id = position
+
+        # O predicado redundante em data_publicacao mantém a busca como range scan no índice composto
+        if reverse:
+            return Q(data_publicacao__gte=data_publicacao) & (
+                Q(data_publicacao__gt=data_publicacao) | Q(id__gt=noticia_id)
+            )
+        return Q(data_publicacao__lte=data_publicacao) & (Q(data_publicacao__lt=data_publicacao) | Q(id__lt=noticia_id))
+
+
+class TimelinePagination(NoticiaCursorPagination):
+    """
+    Mesma paginação por keyset, com os ids de cada página lidos das timelines das verticais no Redis e as notícias
+    carregadas em uma consulta por chave primária. Sem timeline pronta, a página sai do índice no Postgres.
+    """
+
+    def is_requested(self, request: Request) -> bool:
+        # A timeline de uma vertical é grande demais para sair inteira
+        return True
+
+    def paginate_timeline(
+        self, queryset: QuerySet, request: Request, verticais: list[VerticalEnum], abertas: bool = False
+    ) -> list:
+        page_queryset = self.get_page_queryset(queryset, request)
+
+        ids = ler_timelines(verticais, self.position, self.reverse, self.page_size + 1, abertas)
+        if ids is None:
+            self.page = self.fetch_page(page_queryset)
+            return self.page
+
+        # filter em vez de in_bulk: o queryset pode ser de .values()
+        noticias = {self._position(noticia)[1]: noticia for noticia in queryset.filter(id__in=ids)}
+        if len(noticias) < len(ids):
+            # Id que saiu do banco ou da vertical antes de o commit chegar ao Redis: a página vem do Postgres
+            self.page = self.fetch_page(page_queryset)
+            return self.page
+
+        self.page = self.fetch_page(noticias[noticia_id] for noticia_id in ids)
+        return self.page
+
+
+class ContagemPage(Page):
+    def __init__(self, object_list: list, number: int, paginator: "ContagemPaginator", has_next: bool) -> None:
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+
+class ContagemPaginator(DjangoPaginator):
+    """
+    Paginator com o total vindo de contagem.py. Com total estimado, as páginas não são limitadas por ele: cada
+    página é lida com uma linha extra, que diz se existe a próxima.
+    """
+
+    def __init__(self, object_list: QuerySet, per_page: int, chaves: Optional[list[str]] = None) -> None:
+        super().__init__(object_list, per_page)
+        self.chaves = chaves
+
+    @cached_property
+    def contagem(self) -> Contagem:
+        return contar(self.object_list, self.chaves)
+
+    @cached_property
+    def count(self) -> int:
+        return self.contagem.total
+
+    def validate_number(self, number: Any) -> int:
+        if self.contagem.exata:
+            return super().validate_number(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"]) from None
+
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+
+        return number
+
+    def page(self, number: Any) -> Page:
+        if self.contagem.exata:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom : bottom + self.per_page + 1])
+
+        if not object_list and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+
+        return ContagemPage(object_list[: self.per_page], number, self, len(object_list) > self.per_page)
+
+
+class ContagemPagination(PageNumberPagination):
+    """
+    PageNumberPagination sem COUNT(*) exato em tabelas grandes (ver contagem.py); `count_exato` na resposta diz
+    se o total é exato ou estimado.
+
+    A view pode informar as chaves de ContadorSchema que somam o total do seu filtro em `get_contagem_chaves`.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view: Any = None) -> Optional[list]:
+        get_chaves = getattr(view, "get_contagem_chaves", None)
+        self.chaves = get_chaves() if get_chaves is not None else None
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, queryset: QuerySet, page_size: int) -> ContagemPaginator:
+        # Chamado pelo PageNumberPagination no lugar da classe do Django
+        return ContagemPaginator(queryset, page_size, self.chaves)
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.page.paginator.count),
+                    ("count_exato", self.page.paginator.contagem.exata),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_exato"] = {
+            "type": "boolean",
+            "description": "Falso quando count é uma estimativa",
+        }
+        return response_schema
+
+
+class NoticiaBuscaPagination(ContagemPagination):
+    """
+    Paginação da busca textual, que é ordenada por relevância e não pela posição no índice da listagem.
+    """
+
+    page_size = 20
@@ -41,5 +41,5 @@ class IsEditorOrAdmin(BasePermission):
 
     def has_object_permission(self, request: Request, view: object, obj: NoticiaSchema) -> bool:
         is_admin = request.user.role == UserRoleEnum.ADMIN
-        is_autor = obj.autor == request.user
+        is_autor = obj.autor_id == request.user.id
         return any([is_admin, is_autor])
@@ -0,0 +1,30 @@
+from typing import Any, Optional
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Datas passam pelo encoder do DRF ("Z" no lugar de "+00:00"), para o corpo não mudar com o renderer
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer com orjson: o mesmo corpo do renderer do DRF, codificado em C. Tipos que o orjson não conhece
+    (datas, Decimal, lazy strings) caem no JSONEncoder do DRF; com indentação pedida (Accept com indent, API
+    navegável) o renderer do DRF é usado.
+    """
+
+    def render(
+        self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Optional[dict] = None
+    ) -> bytes:
+        if data is None:
+            return b""
+
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+
+        # Como o DRF: U+2028 e U+2029 são JSON válido, mas quebram o JSON embutido em <script>
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
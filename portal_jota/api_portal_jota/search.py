@@ -0,0 +1,32 @@
+"""
+Busca textual das notícias no Postgres.
+
+O tsvector é uma coluna gerada e armazenada em NoticiaSchema (titulo com peso A, subtitulo B, conteudo C),
+na configuração portuguese e sem acentos, com índice GIN. A consulta passa pelas mesmas funções, então
+"acao" encontra "ação" e "publicações" encontra "publicação".
+"""
+
+from django.contrib.postgres.search import CombinedSearchVector, SearchQuery, SearchVector
+from django.db.models import F, Func, TextField, Value
+
+BUSCA_CONFIG = "portuguese"
+
+
+class Unaccent(Func):
+    # Wrapper IMMUTABLE de unaccent() criado na migração 0002_verticais_imagens_busca_e_indices; unaccent() é STABLE
+    # e não pode entrar em coluna gerada nem em índice
+    function = "f_unaccent"
+    output_field = TextField()
+
+
+def busca_vector() -> CombinedSearchVector:
+    return (
+        SearchVector(Unaccent(F("titulo")), weight="A", config=BUSCA_CONFIG)
+        + SearchVector(Unaccent(F("subtitulo")), weight="B", config=BUSCA_CONFIG)
+        + SearchVector(Unaccent(F("conteudo")), weight="C", config=BUSCA_CONFIG)
+    )
+
+
+def busca_query(texto: str) -> SearchQuery:
+    # websearch aceita a sintaxe de buscadores ("frase exata", or, -termo) e nunca falha por erro de sintaxe
+    return SearchQuery(Unaccent(Value(texto)), config=BUSCA_CONFIG, search_type="websearch")
@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+
+class ImagemUploadSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    tamanho = serializers.IntegerField(min_value=1, help_text="Tamanho do arquivo completo em bytes")
+    sha256 = serializers.CharField(min_length=64, max_length=64, help_text="sha256 do arquivo completo, em hexadecimal")
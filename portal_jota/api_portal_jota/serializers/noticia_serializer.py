@@ -1,10 +1,34 @@
+from datetime import datetime, tzinfo
+from functools import cached_property
+from typing import Any
+
+from django.core.files.storage import Storage
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from ..enums.status_noticia_enum import StatusNoticiaEnum
 from ..enums.status_noticia_imagem_enum import StatusNoticiaImagemEnum
 from ..enums.vertical_enum import VerticalEnum
 from ..models import NoticiaSchema, VerticalSchema
 
+# Colunas da listagem reduzida (por_vertical, feed e list); id e data_publicacao só posicionam o cursor
+CAMPOS_DA_LISTAGEM = (
+    "id",
+    "data_publicacao",
+    "imagem",
+    "imagem_renditions",
+    "status_imagem",
+    "conteudo",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+STATUS_LABELS = dict(StatusNoticiaEnum.choices)
+
+SRCSET_SCHEMA = serializers.DictField(child=serializers.DictField(child=serializers.URLField()))
+
 
 class NoticiaSerializer(serializers.ModelSerializer):
     verticais = serializers.ListField(
@@ -14,6 +38,7 @@ class NoticiaSerializer(serializers.ModelSerializer):
         help_text=f"Lista de verticais. Valores possíveis: {VerticalEnum.labels}",
     )
     imagem_url = serializers.SerializerMethodField(read_only=True)
+    imagem_srcset = serializers.SerializerMethodField(read_only=True)
     autor_id = serializers.UUIDField(source="autor.id", read_only=True)
     autor_username = serializers.CharField(source="autor.username", read_only=True)
     status = serializers.CharField(source="get_status_display", read_only=True)
@@ -27,6 +52,7 @@ class NoticiaSerializer(serializers.ModelSerializer):
             "subtitulo",
             "imagem",
             "imagem_url",
+            "imagem_srcset",
             "status_imagem",
             "conteudo",
             "data_publicacao",
@@ -47,9 +73,27 @@ class NoticiaSerializer(serializers.ModelSerializer):
             return instance.imagem.url
         return None
 
+    @extend_schema_field(SRCSET_SCHEMA)  # type: ignore
+    def get_imagem_srcset(self, instance: NoticiaSchema) -> dict[str, dict[str, str]] | None:
+        """
+        URLs das versões da imagem por formato e largura, no formato do srcset: {"webp": {"320w": url}}.
+        """
+        if instance.status_imagem != StatusNoticiaImagemEnum.OK:
+            return None
+
+        storage = instance.imagem.storage
+        srcset = {}
+
+        for formato, por_largura in instance.imagem_renditions.items():
+            larguras = sorted(por_largura, key=int)
+            srcset[formato] = {f"{largura}w": storage.url(por_largura[largura]) for largura in larguras}
+
+        return srcset
+
     def create(self, validated_data: dict) -> NoticiaSchema:
         verticais = validated_data.pop("verticais")
-        validated_data["autor"] = self.context["request"].user
+        validated_data["autor_id"] = self.context["request"].user.id
+        validated_data["verticais_mask"] = VerticalEnum.mask_from_labels(verticais)
 
         noticia = super().create(validated_data)
 
@@ -57,29 +101,85 @@ class NoticiaSerializer(serializers.ModelSerializer):
         noticia.verticais.set(verticais_objects)
         return noticia
 
+    def update(self, instance: NoticiaSchema, validated_data: dict) -> NoticiaSchema:
+        verticais = validated_data.pop("verticais", None)
+
+        if verticais is not None:
+            validated_data["verticais_mask"] = VerticalEnum.mask_from_labels(verticais)
+
+        instance = super().update(instance, validated_data)
+
+        if verticais is not None:
+            instance.verticais.set(VerticalSchema.objects.filter(name__in=verticais))
+
+        return instance
+
     def to_representation(self, instance: NoticiaSchema) -> dict:
-        verticais = [v.name for v in instance.verticais.all()]
-        action = self.context.get("view").action
         representation = super().to_representation(instance)
-        representation["verticais"] = verticais
-
-        if action not in ["por_vertical", "list"]:
-            # Retorno completo para outras ações
-            return representation
-
-        [
-            representation.pop(f)
-            for f in [
-                "id",
-                "titulo",
-                "subtitulo",
-                "data_publicacao",
-                "autor_username",
-                "autor_id",
-                "is_pro",
-                "verticais",
-            ]
-        ]
-
-        # Retorno reduzido para por_vertical e listagem
+        representation["verticais"] = VerticalEnum.labels_from_mask(instance.verticais_mask)
         return representation
+
+
+class NoticiaListSerializer(serializers.Serializer):
+    """
+    Representação reduzida de por_vertical, feed e listagem, montada direto das linhas de
+    `.values(*CAMPOS_DA_LISTAGEM)`: sem instâncias do model e sem passar pelos campos do DRF a cada linha.
+    Os campos declarados só descrevem a resposta no schema da API; a saída é a mesma que eles produziriam.
+    """
+
+    imagem = serializers.FileField(read_only=True)
+    imagem_url = serializers.URLField(read_only=True, allow_null=True)
+    imagem_srcset = serializers.DictField(
+        child=serializers.DictField(child=serializers.URLField()),
+        read_only=True,
+        allow_null=True,
+        help_text="Só a menor versão de cada formato",
+    )
+    status_imagem = serializers.ChoiceField(choices=StatusNoticiaImagemEnum.choices, read_only=True)
+    conteudo = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
+
+    def to_representation(self, row: dict[str, Any]) -> dict:
+        # Uma chamada ao storage para imagem e imagem_url, que apontam para o mesmo arquivo
+        url = self._storage.url(row["imagem"]) if row["imagem"] else None
+        imagem_ok = row["status_imagem"] == StatusNoticiaImagemEnum.OK
+
+        return {
+            "imagem": self._absolute_url(url) if url is not None else None,
+            "imagem_url": url if imagem_ok else None,
+            "imagem_srcset": self._srcset(row["imagem_renditions"]) if imagem_ok else None,
+            "status_imagem": row["status_imagem"],
+            "conteudo": row["conteudo"],
+            "status": STATUS_LABELS.get(row["status"], row["status"]),
+            "created_at": self._data_hora(row["created_at"]),
+            "updated_at": self._data_hora(row["updated_at"]),
+        }
+
+    # Resolvidos uma vez por resposta: com many=True a mesma instância monta todas as linhas
+    @cached_property
+    def _storage(self) -> Storage:
+        return NoticiaSchema._meta.get_field("imagem").storage
+
+    @cached_property
+    def _timezone(self) -> tzinfo:
+        return timezone.get_current_timezone()
+
+    def _absolute_url(self, url: str) -> str:
+        # Como o FileField do DRF: URL absoluta quando há request no contexto
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def _srcset(self, renditions: dict[str, dict[str, str]]) -> dict[str, dict[str, str]]:
+        srcset = {}
+        for formato, por_largura in renditions.items():
+            larguras = sorted(por_largura, key=int)[:1]
+            srcset[formato] = {f"{largura}w": self._storage.url(por_largura[largura]) for largura in larguras}
+
+        return srcset
+
+    def _data_hora(self, valor: datetime) -> str:
+        # ISO 8601 no fuso atual, como o DateTimeField do DRF
+        texto = valor.astimezone(self._timezone).isoformat()
+        return texto[:-6] + "Z" if texto.endswith("+00:00") else texto
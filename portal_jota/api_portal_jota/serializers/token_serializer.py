@@ -1,9 +1,20 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from ..authentication import user_claims
 from ..enums.user_role_enum import UserRoleEnum
+from ..models import UserSchema
 
 
 class TokenSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user: UserSchema) -> RefreshToken:
+        token = super().get_token(user)
+        # Copiadas para o access token; a autenticação monta o usuário da requisição a partir delas
+        token.payload.update(user_claims(user))
+        return token
+
     def validate(self, attrs: dict) -> dict:
         data = super().validate(attrs)
 
@@ -18,3 +29,15 @@ class TokenSerializer(TokenObtainPairSerializer):
             data["verticais"] = [v.name for v in self.user.user_plan.verticais.all()]
 
         return data
+
+
+class TokenClaimsRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs: dict) -> dict:
+        data = super().validate(attrs)
+
+        # As claims do refresh token são as do login; o novo access token leva o plano e o cadastro atuais
+        access = AccessToken(data["access"])
+        access.payload.update(user_claims(UserSchema.objects.get(id=access[jwt_settings.USER_ID_CLAIM])))
+        data["access"] = str(access)
+
+        return data
@@ -54,16 +54,21 @@ class UserPlanSerializer(serializers.ModelSerializer):
 
     def update(self, instance: UserPlanSchema, validated_data: dict) -> UserPlanSchema:
         verticais_data = validated_data.pop("verticais", None)
+        plano_pro = validated_data.get("plan", instance.plan) == PlanEnum.JOTA_PRO
+        atualiza_verticais = plano_pro and verticais_data is not None
+
+        if atualiza_verticais:
+            validated_data["verticais_mask"] = VerticalEnum.mask_from_labels(verticais_data)
 
         instance = super().update(instance, validated_data)
 
-        if instance.plan == PlanEnum.JOTA_PRO and verticais_data is not None:
+        if atualiza_verticais:
             instance.verticais.set(VerticalSchema.objects.filter(name__in=verticais_data))
 
         return instance
 
     def to_representation(self, instance: UserPlanSchema) -> dict:
         data = super().to_representation(instance)
-        data["verticais"] = [v.name for v in instance.verticais.all()]
+        data["verticais"] = VerticalEnum.labels_from_mask(instance.verticais_mask)
         data["plan"] = instance.get_plan_display()  # type: ignore
         return data
@@ -1,2 +1,12 @@
 from .auto_gen_verticais import populate_verticals
 from .create_default_admin import create_default_admin
+from .invalidate_entitlement import (
+    invalidate_on_plan_save,
+    invalidate_on_plan_verticais_change,
+    invalidate_on_user_change,
+)
+from .sync_verticais_mask import sync_noticia_verticais_mask, sync_user_plan_verticais_mask
+from .invalidate_noticia_cache import invalidate_on_noticia_delete
+from .release_imagem_processada import release_on_noticia_delete
+from .sync_timelines import sync_timelines_on_noticia_delete, sync_timelines_on_verticais_change
+from .pool_stats import send_pool_stats_on_request_finished
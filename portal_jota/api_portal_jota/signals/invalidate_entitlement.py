@@ -0,0 +1,49 @@
+"""
+Invalida o snapshot de acesso do leitor quando o plano ou suas verticais mudam, e as claims dos tokens já emitidos
+quando o cadastro do usuário muda (role, is_active, senha, exclusão)
+"""
+
+from typing import Any, Optional
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from ..entitlements import invalidate_reader_entitlement
+from ..models import UserPlanSchema, UserSchema
+
+
+@receiver(post_save, sender=UserPlanSchema)  # type: ignore
+def invalidate_on_plan_save(sender: Any, instance: UserPlanSchema, **kwargs: dict) -> None:
+    invalidate_reader_entitlement(str(instance.cd_user_id))
+
+
+@receiver(post_save, sender=UserSchema)  # type: ignore
+@receiver(post_delete, sender=UserSchema)  # type: ignore
+def invalidate_on_user_change(sender: Any, instance: UserSchema, **kwargs: dict) -> None:
+    invalidate_reader_entitlement(str(instance.id))
+
+
+@receiver(m2m_changed, sender=UserPlanSchema.verticais.through)  # type: ignore
+def invalidate_on_plan_verticais_change(
+    sender: Any,
+    instance: Any,
+    action: str,
+    reverse: bool,
+    pk_set: Optional[set],
+    **kwargs: dict,
+) -> None:
+    if action not in {"post_add", "post_remove", "pre_clear"}:
+        return
+
+    if not reverse:
+        invalidate_reader_entitlement(str(instance.cd_user_id))
+        return
+
+    # Alteração feita a partir da vertical: afeta todos os planos envolvidos
+    if pk_set is None:
+        planos = UserPlanSchema.objects.filter(verticais=instance)
+    else:
+        planos = UserPlanSchema.objects.filter(id__in=pk_set)
+
+    for user_id in planos.values_list("cd_user_id", flat=True):
+        invalidate_reader_entitlement(str(user_id))
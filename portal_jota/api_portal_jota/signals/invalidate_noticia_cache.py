@@ -0,0 +1,16 @@
+"""
+Invalida o cache da listagem de notícias quando uma notícia é removida
+"""
+
+from typing import Any
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from ..models import NoticiaSchema
+from ..noticia_cache import invalidate_noticia_list_cache
+
+
+@receiver(post_delete, sender=NoticiaSchema)  # type: ignore
+def invalidate_on_noticia_delete(sender: Any, instance: NoticiaSchema, **kwargs: dict) -> None:
+    invalidate_noticia_list_cache()
@@ -0,0 +1,17 @@
+"""
+Envia as métricas dos pools de conexão deste processo no fim das requisições (ver api_portal_jota/db_pool.py)
+"""
+
+from typing import Any
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.dispatch import receiver
+
+from ..db_pool import enviar_pool_stats
+
+
+@receiver(request_finished)  # type: ignore
+def send_pool_stats_on_request_finished(sender: Any, **kwargs: dict) -> None:
+    if settings.POSTGRES_POOL:
+        enviar_pool_stats()
@@ -0,0 +1,16 @@
+"""
+Libera a referência à imagem processada compartilhada quando uma notícia é removida
+"""
+
+from typing import Any
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from ..models import ImagemProcessadaSchema, NoticiaSchema
+
+
+@receiver(post_delete, sender=NoticiaSchema)  # type: ignore
+def release_on_noticia_delete(sender: Any, instance: NoticiaSchema, **kwargs: dict) -> None:
+    if instance.imagem_processada_id is not None:
+        ImagemProcessadaSchema.release(instance.imagem_processada_id)
@@ -0,0 +1,30 @@
+"""
+Mantém as timelines por vertical no Redis quando as verticais de uma notícia mudam ou ela é removida
+"""
+
+from typing import Any, Optional
+
+from django.db.models.signals import m2m_changed, post_delete
+from django.dispatch import receiver
+
+from ..models import NoticiaSchema
+from ..timelines import sincronizar_timelines_no_commit
+
+
+@receiver(m2m_changed, sender=NoticiaSchema.verticais.through)  # type: ignore
+def sync_timelines_on_verticais_change(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: Optional[set], **kwargs: dict
+) -> None:
+    if not reverse and action in {"post_clear", "post_add", "post_remove"}:
+        sincronizar_timelines_no_commit([instance.pk])
+    elif reverse and action == "pre_clear":
+        # Depois do clear a vertical não tem mais como dizer quais notícias perdeu
+        afetadas = NoticiaSchema.objects.filter(verticais=instance).values_list("pk", flat=True)
+        sincronizar_timelines_no_commit(list(afetadas))
+    elif reverse and action in {"post_add", "post_remove"}:
+        sincronizar_timelines_no_commit(list(pk_set))
+
+
+@receiver(post_delete, sender=NoticiaSchema)  # type: ignore
+def sync_timelines_on_noticia_delete(sender: Any, instance: NoticiaSchema, **kwargs: dict) -> None:
+    sincronizar_timelines_no_commit([instance.pk])
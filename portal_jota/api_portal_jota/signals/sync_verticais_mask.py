@@ -0,0 +1,82 @@
+"""
+Mantém a coluna verticais_mask de NoticiaSchema e UserPlanSchema igual ao m2m verticais
+"""
+
+from typing import Any, Optional
+
+from django.db.models import F, Model, Value
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from ..enums.vertical_enum import VerticalEnum
+from ..models import NoticiaSchema, UserPlanSchema, VerticalSchema
+from ..noticia_cache import invalidate_noticia_list_cache
+
+
+def _mask_of_verticais(vertical_ids: set) -> int:
+    codigos = VerticalSchema.objects.filter(id__in=vertical_ids).values_list("cod_categoria", flat=True)
+    return VerticalEnum.to_mask(codigos)
+
+
+def _sync_forward(model: type[Model], instance: Any, action: str, pk_set: Optional[set]) -> int:
+    if action == "post_clear":
+        new_mask = Value(0)
+    elif action == "post_add":
+        new_mask = F("verticais_mask").bitor(_mask_of_verticais(pk_set))
+    else:
+        new_mask = F("verticais_mask").bitand(~_mask_of_verticais(pk_set))
+
+    # A máscara é calculada no UPDATE, não a partir da instância: duas alterações concorrentes do m2m da mesma linha
+    # não se sobrescrevem. O serializer já grava a máscara final; a linha só é escrita se algo mudou
+    atualizadas = (
+        model.objects.filter(pk=instance.pk)
+        .exclude(verticais_mask=new_mask)
+        .update(verticais_mask=new_mask, updated_at=timezone.now())
+    )
+    if atualizadas:
+        instance.refresh_from_db(fields=["verticais_mask", "updated_at"])
+
+    return atualizadas
+
+
+def _sync_reverse(model: type[Model], vertical: VerticalSchema, action: str, pk_set: Optional[set]) -> int:
+    bit = VerticalEnum(vertical.cod_categoria).bit
+    agora = timezone.now()
+
+    if action == "pre_clear":
+        afetados = model.objects.filter(verticais=vertical)
+    else:
+        afetados = model.objects.filter(pk__in=pk_set)
+
+    if action == "post_add":
+        return afetados.update(verticais_mask=F("verticais_mask").bitor(bit), updated_at=agora)
+
+    return afetados.update(verticais_mask=F("verticais_mask").bitand(~bit), updated_at=agora)
+
+
+def _sync_verticais_mask(model: type[Model], instance: Any, action: str, reverse: bool, pk_set: Optional[set]) -> None:
+    if reverse and action in {"pre_clear", "post_add", "post_remove"}:
+        atualizadas = _sync_reverse(model, instance, action, pk_set)
+    elif not reverse and action in {"post_clear", "post_add", "post_remove"}:
+        atualizadas = _sync_forward(model, instance, action, pk_set)
+    else:
+        return
+
+    # O update() não passa pelo save(): a listagem anônima em cache ficaria com o updated_at e o ETag antigos
+    if atualizadas and model is NoticiaSchema:
+        invalidate_noticia_list_cache()
+
+
+@receiver(m2m_changed, sender=NoticiaSchema.verticais.through)  # type: ignore
+def sync_noticia_verticais_mask(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: Optional[set], **kwargs: dict
+) -> None:
+    _sync_verticais_mask(NoticiaSchema, instance, action, reverse, pk_set)
+
+
+@receiver(m2m_changed, sender=UserPlanSchema.verticais.through)  # type: ignore
+def sync_user_plan_verticais_mask(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: Optional[set], **kwargs: dict
+) -> None:
+    _sync_verticais_mask(UserPlanSchema, instance, action, reverse, pk_set)
@@ -2,13 +2,23 @@ from django.conf import settings
 
 match settings.ENV_TYPE:
     case "beat":
-        from .publicar_noticia import publicar_noticia
+        from .publicar_noticia import publicar_noticia, publicar_noticia_agendada
 
     case "worker":
         from .process_image import process_image
+        from .publicar_noticia import publicar_noticia_agendada
         from .send_email import send_email
 
+    case "worker_imagens":
+        from .process_image import process_image
+
+    case "worker_email" | "worker_email_massa":
+        from .send_email import send_email
+
+    case "worker_publicacao":
+        from .publicar_noticia import publicar_noticia, publicar_noticia_agendada
+
     case _:
         from .process_image import process_image
-        from .publicar_noticia import publicar_noticia
+        from .publicar_noticia import publicar_noticia, publicar_noticia_agendada
         from .send_email import send_email
@@ -1,15 +1,114 @@
 import os
-from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import IO
 
 from celery import shared_task
-from django.core.files.uploadedfile import SimpleUploadedFile
-from PIL import Image
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+from PIL import Image, features
 
 from ..enums.email_type_enum import EmailTypeEnum
 from ..enums.status_noticia_imagem_enum import StatusNoticiaImagemEnum
+from ..errors import ImageError
+from ..models.imagem_processada_schema import ImagemProcessadaSchema, hash_file
 from ..types import NoticiaId
 from .send_email import send_email
 
+Renditions = dict[str, dict[str, str]]
+
+
+def _resize(image: Image.Image, width: int) -> Image.Image:
+    height = max(1, round(image.height * width / image.width))
+    # reducing_gap reduz por fator inteiro antes do filtro, bem mais barato que o LANCZOS na resolução cheia
+    return image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def _decode(arquivo: IO[bytes]) -> Image.Image:
+    # Lê direto do arquivo, sem copiar o upload inteiro para a memória
+    image = Image.open(arquivo)
+    max_width = settings.IMAGE_MAX_WIDTH
+
+    if image.width * image.height > settings.IMAGE_MAX_PIXELS:
+        raise ImageError(f"Imagem muito grande. O limite é de {settings.IMAGE_MAX_PIXELS} pixels")
+
+    if image.width > max_width:
+        # Em JPEG o draft decodifica direto em 1/2, 1/4 ou 1/8 da resolução, sem passar pela resolução cheia
+        image.draft("RGB", (max_width, image.height * max_width // image.width))
+
+    image = image.convert("RGB")
+
+    if image.width > max_width:
+        image = _resize(image, max_width)
+
+    return image
+
+
+def _encode(image: Image.Image, formato: str, name: str) -> File:
+    # Saídas grandes passam para disco em vez de ficar inteiras na memória do worker
+    spooled = SpooledTemporaryFile(max_size=settings.IMAGE_SPOOL_MAX_SIZE)
+    image.save(spooled, format=formato)
+    spooled.seek(0)
+    return File(spooled, name=name)
+
+
+def _rendition_formats() -> list[str]:
+    formatos = ["webp"]
+    if settings.IMAGE_RENDITION_AVIF and features.check("avif"):
+        formatos.append("avif")
+    return formatos
+
+
+def _delete_renditions(storage: Storage, renditions: Renditions) -> None:
+    for por_largura in renditions.values():
+        for name in por_largura.values():
+            storage.delete(name)
+
+
+def _save_renditions(storage: Storage, image: Image.Image, stem: str) -> Renditions:
+    renditions: Renditions = {}
+    larguras = sorted((width for width in settings.IMAGE_RENDITION_WIDTHS if width < image.width), reverse=True)
+
+    # Da maior para a menor, cada versão parte da anterior e não da imagem cheia
+    for width in larguras:
+        image = _resize(image, width)
+
+        for formato in _rendition_formats():
+            with _encode(image, formato, f"{stem}-{width}w.{formato}") as arquivo:
+                name = storage.save(arquivo.name, arquivo)
+            renditions.setdefault(formato, {})[str(width)] = name
+
+    return renditions
+
+
+def _processar(imagem: FieldFile, digest: str) -> ImagemProcessadaSchema:
+    storage = imagem.storage
+    # Endereçado pelo conteúdo: notícias com o mesmo upload compartilham estes arquivos
+    stem = f"imagens/{digest}/{os.path.basename(imagem.name).split('.')[0]}"
+
+    # Uma única decodificação alimenta a imagem principal e todas as versões menores
+    with imagem.open("rb") as arquivo:
+        image = _decode(arquivo)
+
+    renditions = _save_renditions(storage, image, stem)
+
+    with _encode(image, "webp", stem + ".webp") as imagem_webp:
+        image.close()
+        nome = storage.save(imagem_webp.name, imagem_webp)
+
+    processada, criada = ImagemProcessadaSchema.objects.get_or_create(
+        sha256=digest, defaults={"imagem": nome, "renditions": renditions}
+    )
+
+    if not criada:
+        # Outra tarefa processou o mesmo conteúdo antes; fica valendo a dela
+        _delete_renditions(storage, renditions)
+        storage.delete(nome)
+
+    return processada
+
 
 @shared_task  # type: ignore
 def process_image(noticia_id: NoticiaId) -> str:
@@ -20,27 +119,28 @@ def process_image(noticia_id: NoticiaId) -> str:
     noticia.save(update_fields=["status_imagem"])
 
     try:
-        old_path = noticia.imagem.path
-
-        image = Image.open(BytesIO(noticia.imagem.read()))
-        image = image.convert("RGB")
-
-        image_io = BytesIO()
-        image.save(image_io, format="webp")
-
-        new_name = noticia.imagem.name.split(".")[0] + ".webp"
-
-        noticia.imagem = SimpleUploadedFile(
-            name=new_name,
-            content=image_io.getvalue(),
-            content_type="image/webp",
-        )
-
-        if os.path.exists(old_path):
-            os.remove(old_path)
-
-        noticia.status_imagem = StatusNoticiaImagemEnum.OK
-        noticia.save(update_fields=["imagem", "status_imagem"])
+        imagem_original = noticia.imagem.name
+        storage = noticia.imagem.storage
+        digest = hash_file(noticia.imagem)
+
+        processada = None
+        while processada is None:
+            if not ImagemProcessadaSchema.objects.filter(sha256=digest).exists():
+                _processar(noticia.imagem, digest)
+
+            with transaction.atomic():
+                # O lock impede que um release concorrente apague a imagem durante a troca. Se o release da última
+                # referência apagou a linha entre a consulta acima e o lock, a imagem é processada de novo
+                processada = ImagemProcessadaSchema.objects.select_for_update().filter(sha256=digest).first()
+                if processada is None:
+                    continue
+
+                imagem_anterior = noticia.usar_imagem_processada(processada)
+                noticia.save(update_fields=["imagem", "imagem_renditions", "imagem_processada", "status_imagem"])
+                NoticiaSchema.trocar_imagem_processada(imagem_anterior, processada.sha256)
+
+        if imagem_original != processada.imagem:
+            storage.delete(imagem_original)
 
         send_email.delay(
             {
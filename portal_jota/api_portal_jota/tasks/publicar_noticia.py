@@ -1,32 +1,124 @@
+from datetime import datetime
+
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
+from ..db_router import ler_da_replica
 from ..enums.email_type_enum import EmailTypeEnum
 from ..enums.status_noticia_enum import StatusNoticiaEnum
+from ..noticia_cache import invalidate_noticia_list_cache
+from ..timelines import sincronizar_timelines_no_commit
+from ..types import NoticiaId
 from .send_email import send_email
 
+PUBLICACAO_BATCH_SIZE = 500
+
+
+def _notificar_publicacao(noticia_ids: list[NoticiaId]) -> None:
+    for noticia_id in noticia_ids:
+        send_email.delay(
+            {
+                "email_type": EmailTypeEnum.NOTICIA_PUBLICADA,
+                "news_id": noticia_id,
+            }
+        )
+
+
+def _publicar_lote(agora: datetime) -> list[NoticiaId]:
+    from ..models import NoticiaSchema
+
+    with transaction.atomic():
+        # SKIP LOCKED: execuções sobrepostas do beat reivindicam lotes diferentes, nunca a mesma notícia
+        noticia_ids = list(
+            NoticiaSchema.objects.select_for_update(skip_locked=True)
+            .filter(status=StatusNoticiaEnum.RASCUNHO, data_publicacao__lte=agora)
+            .order_by("data_publicacao")
+            .values_list("id", flat=True)[:PUBLICACAO_BATCH_SIZE]
+        )
+
+        if not noticia_ids:
+            return []
+
+        NoticiaSchema.objects.filter(id__in=noticia_ids).update(status=StatusNoticiaEnum.PUBLICADO, updated_at=agora)
+
+        publicadas = [str(noticia_id) for noticia_id in noticia_ids]
+        sincronizar_timelines_no_commit(publicadas)
+        transaction.on_commit(lambda: _notificar_publicacao(publicadas))
+
+    return publicadas
+
 
 @shared_task  # type: ignore
 def publicar_noticia() -> str:
+    agora = timezone.now()
+    publicadas = 0
+
+    while True:
+        lote = _publicar_lote(agora)
+        publicadas += len(lote)
+
+        if len(lote) < PUBLICACAO_BATCH_SIZE:
+            break
+
+    if publicadas:
+        invalidate_noticia_list_cache()
+
+    if settings.PUBLICACAO_POR_ETA:
+        _agendar_proximas(agora)
+
+    mensagem_publicados = f"{publicadas} notícias publicadas"
+
+    return mensagem_publicados
+
+
+def agendar_publicacao(noticia_id: NoticiaId, versao: int, data_publicacao: datetime) -> None:
+    if data_publicacao - timezone.now() > settings.PUBLICACAO_ETA_HORIZONTE:
+        # Fora do horizonte o beat agenda quando ela se aproximar
+        return
+
+    publicar_noticia_agendada.apply_async((noticia_id, versao), eta=data_publicacao)
+
+
+def _agendar_proximas(agora: datetime) -> None:
+    from ..models import NoticiaSchema
+
+    # Fora de transação e só leitura; um rascunho que a réplica ainda não tem é agendado pela próxima execução
+    with ler_da_replica():
+        proximas = list(
+            NoticiaSchema.objects.filter(
+                status=StatusNoticiaEnum.RASCUNHO,
+                data_publicacao__gt=agora,
+                data_publicacao__lte=agora + settings.PUBLICACAO_ETA_HORIZONTE,
+            ).values_list("id", "publicacao_versao", "data_publicacao")
+        )
+
+    # Tarefas repetidas de execuções anteriores do beat são inofensivas: só uma consegue publicar
+    for noticia_id, versao, data_publicacao in proximas:
+        publicar_noticia_agendada.apply_async((str(noticia_id), versao), eta=data_publicacao)
+
+
+@shared_task  # type: ignore
+def publicar_noticia_agendada(noticia_id: NoticiaId, versao: int) -> str:
     from ..models import NoticiaSchema
 
     agora = timezone.now()
 
-    noticias = NoticiaSchema.objects.filter(
-        status=StatusNoticiaEnum.RASCUNHO,
-        data_publicacao__lte=agora,
-    )
-    for noticia in noticias:
-        noticia.status = StatusNoticiaEnum.PUBLICADO
-        noticia.save(update_fields=["status"])
+    with transaction.atomic():
+        # A versão descarta execuções de agendamentos anteriores; o status torna a tarefa idempotente
+        publicadas = NoticiaSchema.objects.filter(
+            id=noticia_id,
+            publicacao_versao=versao,
+            status=StatusNoticiaEnum.RASCUNHO,
+            data_publicacao__lte=agora,
+        ).update(status=StatusNoticiaEnum.PUBLICADO, updated_at=agora)
 
-        send_email.delay(
-            {
-                "email_type": EmailTypeEnum.NOTICIA_PUBLICADA,
-                "news_id": str(noticia.id),
-            }
-        )
+        if publicadas:
+            invalidate_noticia_list_cache()
+            sincronizar_timelines_no_commit([noticia_id])
+            transaction.on_commit(lambda: _notificar_publicacao([noticia_id]))
 
-    mensagem_publicados = f"{noticias.count()} notícias publicadas"
+    mensagem_publicados = f"{publicadas} notícias publicadas"
 
     return mensagem_publicados
@@ -0,0 +1,25 @@
+from typing import Any
+
+from ..enums.email_type_enum import EmailTypeEnum
+
+
+def route_send_email(name: str, args: tuple, kwargs: dict, options: dict, **extra: Any) -> dict[str, Any] | None:
+    """
+    Roteador do Celery para send_email: emails transacionais vão para a fila "email" e a distribuição de
+    NOTICIA_PUBLICADA para "email_massa". As demais tarefas seguem o mapa de CELERY_TASK_ROUTES.
+    """
+    if name != "api_portal_jota.tasks.send_email.send_email":
+        return None
+
+    email_data = args[0] if args else kwargs["email_data"]
+
+    match EmailTypeEnum(email_data["email_type"]):
+        case EmailTypeEnum.BEM_VINDO:
+            return {"queue": "email", "priority": 9}
+
+        case EmailTypeEnum.NOTICIA_PUBLICADA:
+            # O coordenador só pagina ids e despacha os lotes; passa na frente para a distribuição começar logo
+            return {"queue": "email_massa", "priority": 3 if email_data.get("to") else 6}
+
+        case _:
+            return {"queue": "email", "priority": 6}
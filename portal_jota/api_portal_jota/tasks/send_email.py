@@ -1,9 +1,53 @@
 from celery import shared_task
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.mail import EmailMessage, get_connection
 
+from ..db_router import ler_da_replica
 from ..enums.email_type_enum import EmailTypeEnum
 from ..enums.user_role_enum import UserRoleEnum
-from ..models import NoticiaSchema, UserSchema, VerticalSchema
-from ..types import EmailData
+from ..enums.vertical_enum import VerticalEnum
+from ..models import NoticiaSchema, UserSchema
+from ..types import EmailData, NoticiaId, UserId
+
+
+def _distribuir_publicacao(noticia: NoticiaSchema) -> str:
+    """
+    Percorre os leitores com um cursor no servidor e despacha um send_email por lote de ids,
+    para a memória não crescer com a base e os lotes se espalharem pelos workers.
+    """
+    leitores = UserSchema.objects.filter(role=UserRoleEnum.READER)
+    if noticia.is_pro:
+        # verticais_mask fica em user_plan (um para um), então cada leitor aparece uma única vez
+        verticais_masks = VerticalEnum.masks_intersecting(noticia.verticais_mask)
+        leitores = leitores.filter(user_plan__verticais_mask__in=verticais_masks)
+
+    tamanho_lote = settings.EMAIL_BATCH_SIZE
+    lote: list[UserId] = [str(noticia.autor_id)]
+    lotes = destinatarios = 0
+
+    for user_id in leitores.order_by("id").values_list("id", flat=True).iterator(chunk_size=tamanho_lote):
+        lote.append(str(user_id))
+
+        if len(lote) == tamanho_lote:
+            _enviar_lote(noticia.id, lote)
+            lotes, destinatarios, lote = lotes + 1, destinatarios + len(lote), []
+
+    if lote:
+        _enviar_lote(noticia.id, lote)
+        lotes, destinatarios = lotes + 1, destinatarios + len(lote)
+
+    return f"Email NOTICIA_PUBLICADA distribuído para {destinatarios} destinatários em {lotes} lotes"
+
+
+def _enviar_lote(noticia_id: NoticiaId, user_ids: list[UserId]) -> None:
+    send_email.delay(
+        {
+            "email_type": EmailTypeEnum.NOTICIA_PUBLICADA,
+            "to": user_ids,
+            "news_id": str(noticia_id),
+        }
+    )
 
 
 @shared_task  # type: ignore
@@ -18,15 +62,19 @@ def send_email(email_data: EmailData) -> str:
             "news_id": Optional[NoticiaId]
         }
 
-    """
+        NOTICIA_PUBLICADA sem "to" distribui a notícia em lotes de EMAIL_BATCH_SIZE destinatários,
+        cada um enviado por outro send_email.
 
-    def get_email_list(verticais: list[VerticalSchema]) -> list[UserSchema]:
-        users = UserSchema.objects.filter(role=UserRoleEnum.READER)
-        if verticais:
-            users = users.filter(user_plan__verticais__in=verticais)
+    """
+    try:
+        # Só leituras: a réplica atende, a não ser que ainda não tenha a linha recém-gravada no primário
+        with ler_da_replica():
+            return _send_email(email_data)
+    except ObjectDoesNotExist:
+        return _send_email(email_data)
 
-        return list(users.values_list("email", flat=True))
 
+def _send_email(email_data: EmailData) -> str:
     send_to: str | list[str]
     subject: str | list[str]
     body: str
@@ -45,11 +93,11 @@ def send_email(email_data: EmailData) -> str:
         case EmailTypeEnum.NOTICIA_PUBLICADA:
             noticia = NoticiaSchema.objects.get(id=email_data["news_id"])
 
-            verticais = noticia.verticais.all() if noticia.is_pro else []
+            if email_data.get("to") is None:
+                # Sem destinatários é o coordenador: só distribui os lotes
+                return _distribuir_publicacao(noticia)
 
-            autor_email = noticia.autor.email
-            send_to = [autor_email]
-            send_to += get_email_list(verticais)
+            send_to = list(UserSchema.objects.filter(id__in=email_data["to"]).values_list("email", flat=True))
 
             subject = f"Nova noticia para o portal jota! - {noticia.titulo}"
             body = f"""
@@ -109,5 +157,9 @@ def send_email(email_data: EmailData) -> str:
         case _:
             return "Tipo de email inválido"
 
-    print(f'Enviando email para {send_to} com assunto "{subject}" e corpo"{body}"')
-    return f"Email {email_type.name} enviado para {send_to}"
+    destinatarios = [send_to] if isinstance(send_to, str) else send_to
+    # Uma mensagem por destinatário; o backend reaproveita as conexões SMTP entre elas
+    mensagens = [EmailMessage(subject, body, to=[destinatario]) for destinatario in destinatarios]
+    enviados = get_connection().send_messages(mensagens)
+
+    return f"Email {email_type.name} enviado para {enviados} destinatários"
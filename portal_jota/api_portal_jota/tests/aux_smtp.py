@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from typing import Any
+
+
+class LocalSMTPServer:
+    """
+    Servidor SMTP mínimo em uma thread, para testar o backend de email sem rede.
+
+    latencia simula o tempo do servidor para aceitar cada mensagem; falhas é o número de DATA
+    respondidos com codigo_falha antes de aceitar. conexoes_simultaneas é o maior número de conexões
+    abertas ao mesmo tempo.
+    """
+
+    def __init__(self, latencia: float = 0.0, falhas: int = 0, codigo_falha: int = 451) -> None:
+        self.latencia = latencia
+        self.falhas = falhas
+        self.codigo_falha = codigo_falha
+        self.conexoes = 0
+        self.conexoes_abertas = 0
+        self.conexoes_simultaneas = 0
+        self.mensagens: list[bytes] = []
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def __enter__(self) -> "LocalSMTPServer":
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle, "127.0.0.1", 0), self._loop
+        ).result()
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._server.close()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.conexoes += 1
+        self.conexoes_abertas += 1
+        self.conexoes_simultaneas = max(self.conexoes_simultaneas, self.conexoes_abertas)
+        writer.write(b"220 localhost ESMTP\r\n")
+
+        try:
+            while line := await reader.readline():
+                comando = line[:4].upper()
+
+                if comando in (b"EHLO", b"HELO"):
+                    writer.write(b"250 localhost\r\n")
+                elif comando == b"DATA":
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    await self._receive_data(reader, writer)
+                elif comando == b"QUIT":
+                    writer.write(b"221 Bye\r\n")
+                    break
+                else:
+                    writer.write(b"250 OK\r\n")
+
+                await writer.drain()
+        finally:
+            self.conexoes_abertas -= 1
+            writer.close()
+
+    async def _receive_data(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        corpo = b""
+        while (line := await reader.readline()) != b".\r\n":
+            corpo += line
+
+        if self.falhas:
+            self.falhas -= 1
+            writer.write(f"{self.codigo_falha} Message rejected\r\n".encode())
+            return
+
+        await asyncio.sleep(self.latencia)
+        self.mensagens.append(corpo)
+        writer.write(b"250 OK\r\n")
@@ -1,13 +1,17 @@
+from django.core.cache import cache
 from django.test import Client, TestCase
 from faker import Faker
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
 
+from ..enums.plan_enum import PlanEnum
 from ..enums.user_role_enum import UserRoleEnum
 from ..enums.vertical_enum import VerticalEnum
+from ..models import VerticalSchema
 from ..models.user_schema import UserSchema
 from ..serializers.token_serializer import TokenSerializer
 from ..serializers.user_serializer import UserSerializer
-from ..tests.aux_funcs import PASSWORD, create_user
+from ..tests.aux_funcs import PASSWORD, create_noticia, create_user
 from ..views.token_view import TokenView
 
 
@@ -102,3 +106,72 @@ class TestTokenAuth(TestCase, Client):
         self.assertEqual(status_code, status.HTTP_200_OK, response.data)
 
         self.assertEqual(1, 1)
+
+    def login(self, user: UserSchema) -> dict[str, str]:
+        response = self.client.post(self.get_token_url, {"username": user.username, "password": PASSWORD})
+        return response.data
+
+    def test_access_token_claims_authenticate_without_user_query(self) -> None:
+        reader = create_user(UserRoleEnum.READER, True, [VerticalEnum.SAUDE])
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_pro=True, verticais=[VerticalEnum.SAUDE])
+
+        access = self.login(reader)["access"]
+        claims = AccessToken(access)
+        self.assertEqual(claims["role"], UserRoleEnum.READER)
+        self.assertEqual(claims["plan"], PlanEnum.JOTA_PRO)
+        self.assertEqual(claims["verticais_mask"], reader.user_plan.verticais_mask)
+
+        # Só a consulta da notícia: usuário e plano vêm do token
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/noticia/{noticia.id}/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def test_stale_claims_fall_back_to_database_until_refresh(self) -> None:
+        reader = create_user(UserRoleEnum.READER)
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_pro=True, verticais=[VerticalEnum.SAUDE])
+        url = f"/api/noticia/{noticia.id}/"
+
+        tokens = self.login(reader)
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, response.data)
+
+        reader.user_plan.plan = PlanEnum.JOTA_PRO
+        reader.user_plan.save()
+        reader.user_plan.verticais.set(VerticalSchema.objects.filter(cod_categoria=VerticalEnum.SAUDE))
+
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        access = self.client.post(self.refresh_url, {"refresh": tokens["refresh"]}).data["access"]
+        self.assertEqual(AccessToken(access)["plan"], PlanEnum.JOTA_PRO)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def test_claims_issued_before_a_downgrade_stay_stale_after_version_eviction(self) -> None:
+        reader = create_user(UserRoleEnum.READER, True, [VerticalEnum.SAUDE])
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_pro=True, verticais=[VerticalEnum.SAUDE])
+        url = f"/api/noticia/{noticia.id}/"
+        version_key = f"entitlement:version:{reader.id}"
+
+        # A versão some do Redis antes do login e depois do downgrade: a recriada não pode ser a do token
+        cache.delete(version_key)
+        access = self.login(reader)["access"]
+
+        reader.user_plan.plan = PlanEnum.JOTA_INFO
+        reader.user_plan.save()
+        cache.delete(version_key)
+
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, response.data)
+
+    def test_access_token_stops_working_when_user_is_deactivated(self) -> None:
+        reader = create_user(UserRoleEnum.READER)
+        access = self.login(reader)["access"]
+
+        reader.is_active = False
+        reader.save(update_fields=["is_active"])
+
+        response = self.client.get(f"/api/user-plan/{reader.user_plan.id}/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED, response.data)
@@ -0,0 +1,121 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import include, path
+from rest_framework import status
+from rest_framework.test import URLPatternsTestCase
+
+from ..enums.plan_enum import PlanEnum
+from ..enums.user_role_enum import UserRoleEnum
+from ..enums.vertical_enum import VerticalEnum
+from ..models import UserSchema
+from ..serializers.token_serializer import TokenSerializer
+from ..urls import async_read_urlpatterns
+from .aux_funcs import create_noticia, create_user, generate_noticia_data
+
+
+class TestAsyncRead(TestCase, URLPatternsTestCase):
+    # /api/ com as leituras assíncronas do perfil ASGI; /sync/ só com os viewsets, para comparar as respostas
+    urlpatterns = [
+        path("api/", include(async_read_urlpatterns)),
+        path("api/", include("api_portal_jota.urls")),
+        path("sync/", include("api_portal_jota.urls")),
+    ]
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def auth(self, user: UserSchema) -> dict[str, str]:
+        return {"HTTP_AUTHORIZATION": f"Bearer {TokenSerializer.get_token(user).access_token}"}
+
+    def assertSameResponse(self, url: str, **headers: str) -> None:
+        async_response = self.client.get(f"/api/{url}", **headers)
+        sync_response = self.client.get(f"/sync/{url}", **headers)
+
+        self.assertEqual(async_response.status_code, sync_response.status_code, async_response.content)
+        # Os links de paginação trazem o prefixo da rota
+        self.assertJSONEqual(async_response.content, sync_response.content.decode().replace("/sync/", "/api/"))
+        for header in ("ETag", "Last-Modified"):
+            self.assertEqual(async_response.get(header), sync_response.get(header), header)
+
+    def test_noticia_reads_match_sync_viewset(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        noticia = create_noticia(editor, is_pro=True, verticais=[VerticalEnum.SAUDE])
+        [create_noticia(editor) for _ in range(3)]
+
+        self.assertSameResponse("noticia/", **self.auth(editor))
+        self.assertSameResponse("noticia/?page_size=2", **self.auth(editor))
+        self.assertSameResponse(f"noticia/{noticia.id}/", **self.auth(editor))
+
+        self.assertSameResponse(
+            f"noticia/{noticia.id}/", **self.auth(create_user(UserRoleEnum.READER, True, [VerticalEnum.SAUDE]))
+        )
+        self.assertSameResponse(
+            f"noticia/{noticia.id}/", **self.auth(create_user(UserRoleEnum.READER, True, [VerticalEnum.PODER]))
+        )
+        self.assertSameResponse("noticia/00000000-0000-0000-0000-000000000000/", **self.auth(editor))
+
+        # Ações do viewset não são confundidas com um id
+        response = self.client.get("/api/noticia/busca/", {"q": "teste"}, **self.auth(editor))
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+    def test_user_plan_read_matches_sync_viewset(self) -> None:
+        reader = create_user(UserRoleEnum.READER, True, [VerticalEnum.ENERGIA])
+
+        self.assertSameResponse(f"user-plan/{reader.user_plan.id}/", **self.auth(reader))
+        self.assertSameResponse(f"user-plan/{reader.user_plan.id}/", **self.auth(create_user(UserRoleEnum.ADMIN)))
+        self.assertSameResponse(f"user-plan/{reader.user_plan.id}/", **self.auth(create_user(UserRoleEnum.READER)))
+        self.assertSameResponse(f"user-plan/{reader.user_plan.id}/", **self.auth(create_user(UserRoleEnum.EDITOR)))
+
+    def test_anonymous_list_uses_cache_and_conditional_requests(self) -> None:
+        create_noticia(create_user(UserRoleEnum.EDITOR))
+
+        response = self.client.get("/api/noticia/")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/noticia/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_retrieve_requires_valid_token(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR))
+        url = f"/api/noticia/{noticia.id}/"
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response)
+
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer invalido")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        editor = create_user(UserRoleEnum.EDITOR)
+        headers = self.auth(editor)
+        editor.is_active = False
+        editor.save(update_fields=["is_active"])
+
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_claims_issued_before_a_downgrade_stay_stale_after_version_eviction(self) -> None:
+        reader = create_user(UserRoleEnum.READER, True, [VerticalEnum.SAUDE])
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_pro=True, verticais=[VerticalEnum.SAUDE])
+        version_key = f"entitlement:version:{reader.id}"
+
+        cache.delete(version_key)
+        headers = self.auth(reader)
+
+        reader.user_plan.plan = PlanEnum.JOTA_INFO
+        reader.user_plan.save()
+        cache.delete(version_key)
+
+        response = self.client.get(f"/api/noticia/{noticia.id}/", **headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, response.content)
+
+    def test_writes_on_async_routes_go_to_viewsets(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+
+        response = self.client.post("/api/noticia/", generate_noticia_data(), **self.auth(editor))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+
+        response = self.client.delete(f"/api/noticia/{response.json()['id']}/", **self.auth(editor))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT, response.content)
@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.test import SimpleTestCase
+
+from portal_jota.celery import app
+
+from ..enums.email_type_enum import EmailTypeEnum
+
+
+class TestCeleryRoutes(SimpleTestCase):
+    def route(self, task: str, *args: Any) -> tuple[str, int]:
+        options = app.amqp.router.route({}, f"api_portal_jota.tasks.{task}", args, {})
+        return options["queue"].name, options["priority"]
+
+    def test_each_kind_of_work_has_its_own_queue(self) -> None:
+        self.assertEqual(self.route("process_image.process_image", "id")[0], "imagens")
+        self.assertEqual(self.route("publicar_noticia.publicar_noticia")[0], "publicacao")
+        self.assertEqual(self.route("publicar_noticia.publicar_noticia_agendada", "id", 1)[0], "publicacao")
+        self.assertEqual(self.route("send_email.send_email", {"email_type": EmailTypeEnum.BEM_VINDO})[0], "email")
+
+    def test_noticia_publicada_fan_out_goes_to_bulk_queue(self) -> None:
+        coordenador = self.route("send_email.send_email", {"email_type": EmailTypeEnum.NOTICIA_PUBLICADA})
+        lote = self.route("send_email.send_email", {"email_type": EmailTypeEnum.NOTICIA_PUBLICADA, "to": ["id"]})
+
+        self.assertEqual(coordenador[0], "email_massa")
+        self.assertEqual(lote[0], "email_massa")
+        self.assertGreater(coordenador[1], lote[1])
+
+    def test_welcome_email_outranks_other_transactional_email(self) -> None:
+        bem_vindo = self.route("send_email.send_email", {"email_type": EmailTypeEnum.BEM_VINDO})
+        imagem = self.route("send_email.send_email", {"email_type": EmailTypeEnum.IMAGEM_PROCESSADA})
+
+        self.assertGreater(bem_vindo[1], imagem[1])
+
+    def test_queues_are_declared_with_max_priority(self) -> None:
+        for fila in ("imagens", "email", "email_massa", "publicacao"):
+            self.assertEqual(app.amqp.queues[fila].queue_arguments, {"x-max-priority": 10})
@@ -0,0 +1,131 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.urls import include, path
+from rest_framework import status
+from rest_framework.test import APITestCase, URLPatternsTestCase
+
+from ..contagem import chave_plano, contar_chaves
+from ..enums.plan_enum import PlanEnum
+from ..enums.user_role_enum import UserRoleEnum
+from ..enums.vertical_enum import VerticalEnum
+from ..models import ContadorSchema, UserPlanSchema
+from ..tasks.publicar_noticia import publicar_noticia
+from .aux_funcs import create_noticia, create_user
+
+
+class TestContagem(APITestCase, URLPatternsTestCase):
+    urlpatterns = [
+        path("api/", include("api_portal_jota.urls")),
+    ]
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def assertCounters(self) -> None:
+        for plan in PlanEnum:
+            self.assertEqual(contar_chaves([chave_plano(plan)]).total, UserPlanSchema.objects.filter(plan=plan).count())
+
+    def test_counters_follow_every_write_path(self) -> None:
+        leitores = [create_user(UserRoleEnum.READER) for _ in range(3)]
+        create_user(UserRoleEnum.READER, True, [VerticalEnum.SAUDE])
+        self.assertCounters()
+
+        # update() em lote, sem passar pelo save()
+        UserPlanSchema.objects.filter(cd_user__in=leitores[:2]).update(plan=PlanEnum.JOTA_PRO)
+        self.assertCounters()
+        self.assertEqual(contar_chaves([chave_plano(PlanEnum.JOTA_PRO)]).total, 3)
+
+        # DELETE em cascata pelo usuário e bulk_create
+        leitores[0].delete()
+        UserPlanSchema.objects.filter(cd_user=leitores[2]).delete()
+        UserPlanSchema.objects.bulk_create([UserPlanSchema(cd_user=leitores[2], plan=PlanEnum.JOTA_PRO)])
+        self.assertCounters()
+
+        # Nenhuma chave fica com total negativo
+        self.assertFalse(ContadorSchema.objects.filter(total__lt=0).exists())
+
+    def test_noticias_are_not_counted(self) -> None:
+        # A listagem de notícias é paginada por keyset e não conta; escrever notícias não passa pelos contadores
+        editor = create_user(UserRoleEnum.EDITOR)
+        contadores = list(ContadorSchema.objects.order_by("chave").values_list("chave", "total"))
+
+        create_noticia(editor, is_published=False, verticais=[VerticalEnum.PODER])
+        publicar_noticia()
+
+        self.assertEqual(list(ContadorSchema.objects.order_by("chave").values_list("chave", "total")), contadores)
+
+    def test_user_plan_list_counts_from_counters_when_filtered_by_plan(self) -> None:
+        admin = create_user(UserRoleEnum.ADMIN)
+        [create_user(UserRoleEnum.READER, True, [VerticalEnum.PODER]) for _ in range(3)]
+        [create_user(UserRoleEnum.READER) for _ in range(2)]
+        self.client.force_authenticate(user=admin)
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/user-plan/", {"plan": PlanEnum.JOTA_PRO.label, "page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["count"], 3)
+        self.assertTrue(response.data["count_exato"])
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertTrue(all(plan["plan"] == PlanEnum.JOTA_PRO.label for plan in response.data["results"]))
+
+        response = self.client.get("/api/user-plan/", {"plan": "Premium", "page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.data)
+
+        # Sem page_size a listagem continua sem paginação
+        response = self.client.get("/api/user-plan/", {"plan": PlanEnum.JOTA_INFO.label})
+        self.assertEqual(len(response.data), 2, response.data)
+
+    def test_unfiltered_admin_list_uses_table_estimate(self) -> None:
+        admin = create_user(UserRoleEnum.ADMIN)
+        [create_user(UserRoleEnum.READER) for _ in range(5)]
+        self.client.force_authenticate(user=admin)
+
+        # Tabela pequena: o COUNT(*) exato é mais barato que qualquer estimativa
+        response = self.client.get("/api/user-plan/", {"page_size": 2})
+        self.assertEqual(response.data["count"], 5)
+        self.assertTrue(response.data["count_exato"])
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE api_portal_jota_userplanschema")
+
+        with override_settings(CONTAGEM_EXATA_LIMITE=1):
+            ids = []
+            url, params = "/api/user-plan/", {"page_size": 2}
+            while url:
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+                self.assertFalse(response.data["count_exato"])
+                self.assertEqual(response.data["count"], 5)
+
+                ids += [plan["id"] for plan in response.data["results"]]
+                url, params = response.data["next"], {}
+
+            # Com total estimado a navegação não depende dele e termina na última página real
+            self.assertEqual(len(set(ids)), 5)
+
+            response = self.client.get("/api/user-plan/", {"page_size": 2, "page": 4})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_busca_estimates_large_result_counts(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        for _ in range(3):
+            noticia = create_noticia(editor)
+            noticia.titulo = "Reforma tributária"
+            noticia.save()
+
+        self.client.force_authenticate(user=editor)
+
+        response = self.client.get("/api/noticia/busca/", {"q": "tributaria", "page_size": 2})
+        self.assertEqual(response.data["count"], 3)
+        self.assertTrue(response.data["count_exato"])
+
+        with override_settings(CONTAGEM_EXATA_LIMITE=0):
+            response = self.client.get("/api/noticia/busca/", {"q": "tributaria", "page_size": 2})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            self.assertFalse(response.data["count_exato"])
+            self.assertIsNotNone(response.data["next"])
+
+            response = self.client.get(response.data["next"])
+            self.assertEqual(len(response.data["results"]), 1)
+            self.assertIsNone(response.data["next"])
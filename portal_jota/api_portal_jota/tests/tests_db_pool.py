@@ -0,0 +1,70 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.test import TestCase
+from portal_jota.settings.base import configurar_pool
+
+from ..db_pool import alias_temporario, enviar_pool_stats, get_pool_stats
+
+
+class TestDbPool(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def pid(self, conexao: DatabaseWrapper) -> int:
+        # Uma requisição: checkout, consulta e devolução ao pool
+        conexao.close_if_unusable_or_obsolete()
+        with conexao.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            pid = cursor.fetchone()[0]
+        conexao.close_if_unusable_or_obsolete()
+
+        return pid
+
+    def test_configuracao_do_pool(self) -> None:
+        databases = {"default": {"CONN_MAX_AGE": 60, "OPTIONS": {"sslmode": "disable"}}}
+        configurar_pool(databases, 1, 4)
+
+        self.assertEqual(databases["default"]["CONN_MAX_AGE"], 0)
+        self.assertTrue(databases["default"]["CONN_HEALTH_CHECKS"])
+        self.assertEqual(databases["default"]["OPTIONS"]["sslmode"], "disable")
+        self.assertEqual(databases["default"]["OPTIONS"]["pool"]["min_size"], 1)
+        self.assertEqual(databases["default"]["OPTIONS"]["pool"]["max_size"], 4)
+
+    def test_checkout_descarta_conexao_morta_e_metricas_vao_para_o_redis(self) -> None:
+        pool = {"min_size": 1, "max_size": 1}
+        config = {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True, "OPTIONS": {"pool": pool}}
+
+        # O alias só existe durante o teste; fora de `databases` o TestCase recusa a conexão
+        with (
+            patch.object(TestDbPool, "databases", {*self.databases, "pool_teste"}),
+            alias_temporario("pool_teste", **config) as conexao,
+        ):
+            pid = self.pid(conexao)
+            self.assertEqual(self.pid(conexao), pid)
+
+            # Conexão encerrada pelo servidor enquanto estava parada no pool
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_terminate_backend(%s, 5000)", [pid])
+
+            self.assertNotEqual(self.pid(conexao), pid)
+
+            enviar_pool_stats(forcar=True)
+            self.pid(conexao)
+            # Dentro do intervalo nada é enviado; o próximo envio soma ao anterior
+            enviar_pool_stats()
+            self.assertEqual(get_pool_stats()["pool_teste"]["requests_num"], 3)
+            enviar_pool_stats(forcar=True)
+
+            stats = get_pool_stats()["pool_teste"]
+            self.assertEqual(stats["requests_num"], 4)
+            self.assertEqual(stats["connections_lost"], 1)
+            self.assertEqual(stats["connections_num"], 2)
+
+            out = StringIO()
+            call_command("pool_stats", stdout=out)
+            self.assertIn("Descartadas no health check: 1", out.getvalue())
@@ -0,0 +1,69 @@
+import smtplib
+
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase
+
+from ..email_backend import PooledSMTPEmailBackend
+from .aux_smtp import LocalSMTPServer
+
+
+def generate_messages(quantidade: int) -> list[EmailMessage]:
+    return [EmailMessage("Assunto", "Corpo", to=[f"leitor{i}@example.com"]) for i in range(quantidade)]
+
+
+class TestPooledSMTPEmailBackend(SimpleTestCase):
+    def send(self, server: LocalSMTPServer, messages: list[EmailMessage], **kwargs: int) -> int:
+        backend = PooledSMTPEmailBackend(host="127.0.0.1", port=server.port, retry_delay=0, **kwargs)
+        return backend.send_messages(messages)
+
+    def test_pool_reuses_a_bounded_number_of_connections(self) -> None:
+        with LocalSMTPServer() as server:
+            enviados = self.send(server, generate_messages(30), pool_size=4)
+
+        self.assertEqual(enviados, 30)
+        self.assertEqual(len(server.mensagens), 30)
+        self.assertEqual(server.conexoes, 4)
+
+    def test_transient_failures_are_retried_per_message(self) -> None:
+        with LocalSMTPServer(falhas=2) as server:
+            enviados = self.send(server, generate_messages(5), pool_size=1, max_retries=2)
+
+        self.assertEqual(enviados, 5)
+        self.assertEqual(len(server.mensagens), 5)
+
+    def test_message_that_exhausts_retries_does_not_stop_the_batch(self) -> None:
+        with LocalSMTPServer(falhas=1) as server:
+            backend = PooledSMTPEmailBackend(
+                host="127.0.0.1", port=server.port, pool_size=1, max_retries=0, retry_delay=0, fail_silently=True
+            )
+            enviados = backend.send_messages(generate_messages(3))
+
+        self.assertEqual(enviados, 2)
+
+    def test_permanent_failures_are_not_retried(self) -> None:
+        with LocalSMTPServer(falhas=1, codigo_falha=550) as server:
+            backend = PooledSMTPEmailBackend(
+                host="127.0.0.1", port=server.port, pool_size=1, max_retries=3, retry_delay=0, fail_silently=True
+            )
+            enviados = backend.send_messages(generate_messages(3))
+
+        # Um 550 falha igual em qualquer tentativa: a mensagem é descartada e o lote segue
+        self.assertEqual(enviados, 2)
+        self.assertEqual(len(server.mensagens), 2)
+
+    def test_permanent_failure_is_raised_without_fail_silently(self) -> None:
+        with LocalSMTPServer(falhas=1, codigo_falha=550) as server:
+            with self.assertRaises(smtplib.SMTPDataError) as contexto:
+                self.send(server, generate_messages(1), pool_size=1, max_retries=3)
+
+        self.assertEqual(contexto.exception.smtp_code, 550)
+
+    def test_pool_sends_over_concurrent_connections(self) -> None:
+        for pool_size in (1, 8):
+            with LocalSMTPServer(latencia=0.02) as server:
+                enviados = self.send(server, generate_messages(40), pool_size=pool_size)
+
+            # A vazão vem das conexões abertas ao mesmo tempo, não do tempo medido nesta máquina
+            self.assertEqual(enviados, 40)
+            self.assertEqual(server.conexoes, pool_size)
+            self.assertEqual(server.conexoes_simultaneas, pool_size)
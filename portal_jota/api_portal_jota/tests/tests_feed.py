@@ -0,0 +1,143 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from rest_framework import status
+from rest_framework.test import APITestCase, URLPatternsTestCase
+
+from ..enums.status_noticia_enum import StatusNoticiaEnum
+from ..enums.user_role_enum import UserRoleEnum
+from ..enums.vertical_enum import VerticalEnum
+from ..models import NoticiaSchema, UserSchema, VerticalSchema
+from ..timelines import _redis, _timeline_key, ler_timelines
+from .aux_funcs import create_noticia, create_user
+
+
+class TestFeed(APITestCase, URLPatternsTestCase):
+    urlpatterns = [
+        path("api/", include("api_portal_jota.urls")),
+    ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        editor = create_user(UserRoleEnum.EDITOR)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for verticais in [
+                [VerticalEnum.PODER],
+                [VerticalEnum.SAUDE],
+                [VerticalEnum.PODER, VerticalEnum.SAUDE],
+                [VerticalEnum.ENERGIA],
+                [VerticalEnum.PODER, VerticalEnum.SAUDE, VerticalEnum.ENERGIA],
+            ]:
+                for is_pro in (False, True):
+                    create_noticia(editor, is_pro=is_pro, verticais=verticais)
+
+        self.leitor_pro = create_user(UserRoleEnum.READER, True, [VerticalEnum.PODER, VerticalEnum.SAUDE])
+
+    def esperado(self, verticais: list[VerticalEnum], is_pro: bool) -> list[str]:
+        noticias = (
+            NoticiaSchema.objects.filter(status=StatusNoticiaEnum.PUBLICADO)
+            .alias(no_plano=F("verticais_mask").bitand(VerticalEnum.to_mask(verticais)))
+            .filter(no_plano__gt=0)
+        )
+        if not is_pro:
+            noticias = noticias.filter(is_pro=False)
+
+        return list(noticias.order_by("-data_publicacao", "-id").values_list("conteudo", flat=True))
+
+    def assertHydrated(self, queries: CaptureQueriesContext) -> None:
+        # Ids do Redis carregados por chave primária; a página lida do Postgres teria LIMIT
+        self.assertNotIn("LIMIT", queries.captured_queries[0]["sql"])
+
+    def percorrer(self, user: UserSchema, page_size: int) -> list[str]:
+        self.client.force_authenticate(user=user)
+
+        # A listagem reduzida não traz o id
+        conteudos = []
+        url, params = "/api/noticia/feed/", {"page_size": page_size}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            conteudos += [noticia["conteudo"] for noticia in response.data["results"]]
+            url, params = response.data["next"], {}
+
+        return conteudos
+
+    def test_feed_junta_as_verticais_do_plano_sem_repetir(self) -> None:
+        call_command("reconstruir_timelines", stdout=StringIO())
+
+        esperado = self.esperado([VerticalEnum.PODER, VerticalEnum.SAUDE], True)
+        self.assertEqual(len(esperado), 8)
+        self.assertEqual(self.percorrer(self.leitor_pro, 3), esperado)
+
+        # Snapshot do plano já em cache: uma consulta por página, qualquer que seja o número de verticais
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get("/api/noticia/feed/", {"page_size": 3})
+        self.assertHydrated(queries)
+        with self.assertNumQueries(1) as queries:
+            segunda = self.client.get(response.data["next"])
+        self.assertHydrated(queries)
+
+        primeira = self.client.get(segunda.data["previous"])
+        self.assertEqual(primeira.data["results"], response.data["results"])
+
+    def test_leitor_sem_jota_pro_so_recebe_noticias_abertas(self) -> None:
+        call_command("reconstruir_timelines", stdout=StringIO())
+
+        leitor = create_user(UserRoleEnum.READER)
+        leitor.user_plan.verticais.set(VerticalSchema.objects.filter(cod_categoria=VerticalEnum.ENERGIA))
+
+        esperado = self.esperado([VerticalEnum.ENERGIA], False)
+        self.assertEqual(len(esperado), 2)
+        self.assertEqual(self.percorrer(leitor, 1), esperado)
+
+        # A notícia que vira PRO sai das timelines abertas
+        noticia = NoticiaSchema.objects.get(conteudo=esperado[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            noticia.is_pro = True
+            noticia.save()
+
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get("/api/noticia/feed/", {"page_size": 5})
+        self.assertHydrated(queries)
+        self.assertEqual([n["conteudo"] for n in response.data["results"]], esperado[1:])
+
+    def test_feed_sem_timelines_prontas_vem_do_postgres(self) -> None:
+        esperado = self.esperado([VerticalEnum.PODER, VerticalEnum.SAUDE], True)
+        self.assertEqual(self.percorrer(self.leitor_pro, 3), esperado)
+
+    def test_feed_com_timeline_descartada_vem_do_postgres(self) -> None:
+        verticais = [VerticalEnum.PODER, VerticalEnum.SAUDE]
+        leitor = create_user(UserRoleEnum.READER)
+        leitor.user_plan.verticais.set(VerticalSchema.objects.filter(cod_categoria__in=verticais))
+
+        # Cada set da vertical perde a marca de pronta junto com ele: o feed não segue sem a vertical
+        for user, abertas in ((self.leitor_pro, False), (leitor, True)):
+            call_command("reconstruir_timelines", stdout=StringIO())
+            _redis().delete(_timeline_key(VerticalEnum.SAUDE, abertas))
+            self.assertIsNone(ler_timelines(verticais, None, False, 5, abertas))
+
+            self.client.force_authenticate(user=user)
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get("/api/noticia/feed/", {"page_size": 3})
+            self.assertIn("LIMIT", queries.captured_queries[-1]["sql"])
+
+            self.assertEqual(self.percorrer(user, 3), self.esperado(verticais, not abertas))
+
+    def test_feed_so_para_leitores(self) -> None:
+        self.client.force_authenticate(user=create_user(UserRoleEnum.EDITOR))
+        response = self.client.get("/api/noticia/feed/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get("/api/noticia/feed/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Sem verticais no plano o feed é vazio
+        call_command("reconstruir_timelines", stdout=StringIO())
+        self.assertEqual(self.percorrer(create_user(UserRoleEnum.READER), 5), [])
@@ -0,0 +1,14 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class TestMigrations(TestCase):
+    def test_models_have_committed_migrations(self) -> None:
+        # As migrações são versionadas; uma alteração de model sem a migração correspondente falha aqui
+        output = StringIO()
+        try:
+            call_command("makemigrations", "api_portal_jota", check=True, dry_run=True, stdout=output)
+        except SystemExit:
+            self.fail(f"Alterações de model sem migração:\n{output.getvalue()}")
@@ -1,19 +1,40 @@
 import os
+import shutil
+import tracemalloc
 from datetime import timedelta
-
+from hashlib import sha256
+from io import BytesIO
+from tempfile import TemporaryFile, mkdtemp
+from typing import Any
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import QuerySet
+from django.test import override_settings
 from django.urls import include, path
 from django.utils import timezone
 from faker import Faker
+from PIL import Image
 from rest_framework import status
 from rest_framework.test import APITestCase, URLPatternsTestCase
 
+from ..enums.email_type_enum import EmailTypeEnum
+from ..enums.plan_enum import PlanEnum
 from ..enums.status_noticia_enum import StatusNoticiaEnum
 from ..enums.status_noticia_imagem_enum import StatusNoticiaImagemEnum
 from ..enums.user_role_enum import UserRoleEnum
 from ..enums.vertical_enum import VerticalEnum
-from ..models import NoticiaSchema
-from ..tasks.publicar_noticia import publicar_noticia
+from ..models import ImagemProcessadaSchema, NoticiaSchema, UserSchema, VerticalSchema
+from ..noticia_cache import get_noticia_list_cache_stats
+from ..tasks.process_image import process_image
+from ..tasks.publicar_noticia import publicar_noticia, publicar_noticia_agendada
+from ..tasks.send_email import send_email
 from .aux_funcs import create_noticia, create_user, generate_noticia_data
 
 
@@ -25,6 +46,11 @@ class TestNoticia(APITestCase, URLPatternsTestCase):
     def setUp(self) -> None:
         self.faker = Faker("pt_BR")
         self.base_url = "/api/noticia/"
+        cache.clear()
+
+        upload_temp_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, upload_temp_dir)
+        self.enterContext(override_settings(UPLOAD_TEMP_DIR=upload_temp_dir))
 
     def test_user_reader_cant_create_noticia(self) -> None:
         reader_jota_info = create_user(UserRoleEnum.READER)
@@ -76,6 +102,98 @@ class TestNoticia(APITestCase, URLPatternsTestCase):
         os.remove(updated_noticia.imagem.path)
         os.rmdir(updated_noticia.imagem.path.replace("test_image.webp", ""))
 
+    @override_settings(IMAGE_MAX_WIDTH=1600)
+    def test_image_renditions_are_exposed_as_srcset(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        img_bytes = self.faker.image(size=(2000, 1000), image_format="jpeg")
+        image_file = SimpleUploadedFile(name="foto.jpg", content=img_bytes, content_type="image/jpeg")
+
+        self.client.force_authenticate(user=editor)
+        response = self.client.post(self.base_url, generate_noticia_data(image=image_file), format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        noticia = NoticiaSchema.objects.get(id=response.data["id"])
+        self.addCleanup(shutil.rmtree, os.path.dirname(noticia.imagem.path))
+        self.addCleanup(shutil.rmtree, os.path.join(settings.MEDIA_ROOT, "noticias", str(noticia.id)))
+
+        with Image.open(noticia.imagem.path) as imagem:
+            self.assertEqual(imagem.size, (1600, 800))
+
+        for largura, nome in noticia.imagem_renditions["webp"].items():
+            with Image.open(noticia.imagem.storage.path(nome)) as rendition:
+                self.assertEqual(rendition.width, int(largura))
+
+        response = self.client.get(f"{self.base_url}{noticia.id}/")
+        self.assertEqual(list(response.data["imagem_srcset"]["webp"]), ["320w", "640w", "1280w"], response.data)
+
+        response = self.client.get(self.base_url)
+        self.assertEqual(list(response.data[0]["imagem_srcset"]["webp"]), ["320w"], response.data)
+
+    def test_same_image_is_processed_once_and_shared_until_last_reference(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        img_bytes = self.faker.image(size=(800, 600), image_format="jpeg")
+        self.client.force_authenticate(user=editor)
+
+        noticias = []
+        for _ in range(2):
+            upload = SimpleUploadedFile(name="agencia.jpg", content=img_bytes, content_type="image/jpeg")
+            response = self.client.post(self.base_url, generate_noticia_data(image=upload), format="multipart")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+            noticias.append(NoticiaSchema.objects.get(id=response.data["id"]))
+            diretorio_upload = os.path.join(settings.MEDIA_ROOT, "noticias", response.data["id"])
+            self.addCleanup(shutil.rmtree, diretorio_upload, ignore_errors=True)
+
+        primeira, segunda = noticias
+        self.addCleanup(shutil.rmtree, os.path.dirname(primeira.imagem.path), ignore_errors=True)
+
+        # A segunda notícia usa as saídas da primeira, sem passar pelo worker
+        self.assertEqual(segunda.status_imagem, StatusNoticiaImagemEnum.OK)
+        self.assertEqual(segunda.imagem.name, primeira.imagem.name)
+        self.assertEqual(segunda.imagem_renditions, primeira.imagem_renditions)
+        self.assertEqual(len([email for email in mail.outbox if email.subject.startswith("Imagem processada")]), 1)
+        self.assertEqual(primeira.imagem_processada.referencias, 2)
+
+        arquivos = primeira.imagem_processada.arquivos()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"{self.base_url}{primeira.id}/")
+        self.assertTrue(all(default_storage.exists(nome) for nome in arquivos))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"{self.base_url}{segunda.id}/")
+        self.assertFalse(any(default_storage.exists(nome) for nome in arquivos))
+
+    def test_process_image_reprocesses_when_shared_image_is_released_before_the_lock(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR))
+        self.addCleanup(shutil.rmtree, os.path.join(settings.MEDIA_ROOT, "noticias", str(noticia.id)))
+
+        img_bytes = self.faker.image(size=(800, 600), image_format="jpeg")
+        nome = default_storage.save(f"noticias/{noticia.id}/original.jpg", ContentFile(img_bytes))
+        NoticiaSchema.objects.filter(id=noticia.id).update(imagem=nome)
+
+        # Saída de outra notícia com o mesmo conteúdo, com a última referência liberada logo depois da consulta
+        digest = sha256(img_bytes).hexdigest()
+        ImagemProcessadaSchema.objects.create(sha256=digest, imagem="imagens/outra.webp", referencias=1)
+        exists, liberadas = QuerySet.exists, []
+
+        def liberar_depois_da_consulta(queryset: QuerySet) -> bool:
+            existe = exists(queryset)
+            if queryset.model is ImagemProcessadaSchema and existe and not liberadas:
+                ImagemProcessadaSchema.release(digest)
+                liberadas.append(digest)
+            return existe
+
+        with patch.object(QuerySet, "exists", autospec=True, side_effect=liberar_depois_da_consulta):
+            process_image(str(noticia.id))
+
+        noticia.refresh_from_db()
+        self.addCleanup(shutil.rmtree, os.path.dirname(noticia.imagem.path))
+        self.assertEqual(liberadas, [digest])
+        self.assertEqual(noticia.status_imagem, StatusNoticiaImagemEnum.OK)
+        self.assertEqual(noticia.imagem_processada.referencias, 1)
+        self.assertNotEqual(noticia.imagem.name, "imagens/outra.webp")
+        self.assertTrue(default_storage.exists(noticia.imagem.name))
+
     def test_user_editor_can_list_all_noticias(self) -> None:
         user_editor = create_user(UserRoleEnum.EDITOR)
         noticias_por_editor = 5
@@ -209,6 +327,61 @@ class TestNoticia(APITestCase, URLPatternsTestCase):
 
         self.assertEqual(noticia.status, StatusNoticiaEnum.PUBLICADO.value, noticia.status)
 
+    def test_publicar_noticia_reports_accurate_count_and_never_publishes_twice(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        rascunhos = [create_noticia(editor, is_published=False) for _ in range(3)]
+        agendada = create_noticia(editor, is_published=False)
+        NoticiaSchema.objects.filter(id=agendada.id).update(data_publicacao=timezone.now() + timedelta(days=1))
+
+        self.assertEqual(publicar_noticia(), "3 notícias publicadas")
+        self.assertEqual(publicar_noticia(), "0 notícias publicadas")
+
+        publicadas = NoticiaSchema.objects.filter(status=StatusNoticiaEnum.PUBLICADO)
+        self.assertCountEqual(publicadas.values_list("id", flat=True), [noticia.id for noticia in rascunhos])
+
+        agendada.refresh_from_db()
+        self.assertEqual(agendada.status, StatusNoticiaEnum.RASCUNHO.value, agendada.status)
+
+    def test_publicar_noticia_agendada_ignores_stale_versions_and_is_idempotent(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_published=False)
+        versao_antiga = noticia.publicacao_versao
+
+        noticia.data_publicacao = timezone.now() - timedelta(seconds=1)
+        noticia.save(update_fields=["data_publicacao"])
+        noticia.refresh_from_db()
+        self.assertEqual(noticia.publicacao_versao, versao_antiga + 1)
+
+        self.assertEqual(publicar_noticia_agendada(str(noticia.id), versao_antiga), "0 notícias publicadas")
+        self.assertEqual(publicar_noticia_agendada(str(noticia.id), noticia.publicacao_versao), "1 notícias publicadas")
+        self.assertEqual(publicar_noticia_agendada(str(noticia.id), noticia.publicacao_versao), "0 notícias publicadas")
+
+        noticia.refresh_from_db()
+        self.assertEqual(noticia.status, StatusNoticiaEnum.PUBLICADO.value, noticia.status)
+
+    def test_publicar_noticia_agendada_waits_for_data_publicacao(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_published=False)
+        NoticiaSchema.objects.filter(id=noticia.id).update(data_publicacao=timezone.now() + timedelta(minutes=5))
+
+        self.assertEqual(publicar_noticia_agendada(str(noticia.id), noticia.publicacao_versao), "0 notícias publicadas")
+
+        noticia.refresh_from_db()
+        self.assertEqual(noticia.status, StatusNoticiaEnum.RASCUNHO.value, noticia.status)
+
+    @override_settings(EMAIL_BATCH_SIZE=2)
+    def test_noticia_publicada_email_is_fanned_out_in_batches_of_distinct_readers(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        [create_user(UserRoleEnum.READER, True, [VerticalEnum.ENERGIA, VerticalEnum.SAUDE]) for _ in range(3)]
+        create_user(UserRoleEnum.READER, True, [VerticalEnum.TRABALHISTA])
+        create_user(UserRoleEnum.READER)
+        noticia = create_noticia(editor, is_pro=True, verticais=[VerticalEnum.ENERGIA, VerticalEnum.SAUDE])
+
+        mail.outbox.clear()
+        resultado = send_email({"email_type": EmailTypeEnum.NOTICIA_PUBLICADA, "news_id": str(noticia.id)})
+
+        # Autor + 3 leitores PRO das verticais, cada um uma única vez
+        self.assertEqual(resultado, "Email NOTICIA_PUBLICADA distribuído para 4 destinatários em 2 lotes")
+        self.assertEqual(len(mail.outbox), 4)
+
     def test_noticia_status_is_changed_to_rascunho_after_publicado(self) -> None:
         editor = create_user(UserRoleEnum.EDITOR)
         noticia = create_noticia(editor, is_published=True)
@@ -247,3 +420,508 @@ class TestNoticia(APITestCase, URLPatternsTestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.data)
         self.assertIn("detail", response.data)
+
+    @override_settings(IMAGE_MAX_PIXELS=100 * 100)
+    def test_image_header_is_checked_before_noticia_is_created(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        self.client.force_authenticate(user=editor)
+
+        uploads = [
+            # Extensão válida com conteúdo que não é imagem
+            SimpleUploadedFile("falsa.png", b"dummy", content_type="image/png"),
+            # Extensão png com conteúdo gif
+            SimpleUploadedFile("gif.png", self.faker.image(size=(10, 10), image_format="gif")),
+            # Acima do teto de pixels, sem decodificar a imagem
+            SimpleUploadedFile("grande.png", self.faker.image(size=(101, 100), image_format="png")),
+        ]
+
+        for upload in uploads:
+            response = self.client.post(self.base_url, generate_noticia_data(image=upload), format="multipart")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.data)
+
+        self.assertFalse(NoticiaSchema.objects.exists())
+
+    @override_settings(IMAGE_MAX_WIDTH=1280, IMAGE_SPOOL_MAX_SIZE=64 * 1024)
+    def test_process_image_peak_memory_does_not_grow_with_upload_size(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+
+        def processar(largura: int, altura: int) -> tuple[int, int]:
+            noticia = create_noticia(editor)
+            self.addCleanup(shutil.rmtree, os.path.join(settings.MEDIA_ROOT, "noticias", str(noticia.id)))
+
+            with TemporaryFile() as jpeg:
+                # Ruído não comprime, então o arquivo cresce com os pixels
+                Image.effect_noise((largura, altura), 64).convert("RGB").save(jpeg, format="jpeg", quality=95)
+                tamanho = jpeg.tell()
+                jpeg.seek(0)
+                nome = default_storage.save(f"noticias/{noticia.id}/original.jpg", File(jpeg))
+
+            NoticiaSchema.objects.filter(id=noticia.id).update(imagem=nome)
+
+            tracemalloc.start()
+            process_image(str(noticia.id))
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            noticia.refresh_from_db()
+            self.assertEqual(noticia.status_imagem, StatusNoticiaImagemEnum.OK)
+            self.addCleanup(shutil.rmtree, os.path.dirname(noticia.imagem.path))
+            return pico, tamanho
+
+        pico_pequena, _ = processar(3000, 2000)
+        pico_grande, tamanho_grande = processar(6000, 4000)
+
+        # O pico acompanha a saída (limitada por IMAGE_MAX_WIDTH), não o arquivo enviado
+        mensagem = f"picos de {pico_pequena} e {pico_grande} bytes; arquivo grande com {tamanho_grande} bytes"
+        self.assertLess(pico_grande, pico_pequena * 1.5, mensagem)
+        self.assertLess(pico_grande, tamanho_grande // 8, mensagem)
+
+    def test_list_cursor_pagination_walks_all_noticias_without_duplicates(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        noticias = [create_noticia(editor) for _ in range(7)]
+        # Empates em data_publicacao são desempatados pelo id
+        NoticiaSchema.objects.filter(id__in=[n.id for n in noticias[:4]]).update(data_publicacao=timezone.now())
+
+        response = self.client.get(self.base_url, {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertIsNone(response.data["previous"], response.data)
+
+        vistos = []
+        while True:
+            self.assertLessEqual(len(response.data["results"]), 3, response.data)
+            vistos += [noticia["conteudo"] for noticia in response.data["results"]]
+            if response.data["next"] is None:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertCountEqual(vistos, [n.conteudo for n in noticias], vistos)
+
+    def test_list_cursor_pagination_is_stable_when_noticia_is_published_mid_scroll(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        [create_noticia(editor) for _ in range(4)]
+        ordem = list(NoticiaSchema.objects.order_by("-data_publicacao", "-id").values_list("conteudo", flat=True))
+
+        response = self.client.get(self.base_url, {"page_size": 2})
+        self.assertEqual([n["conteudo"] for n in response.data["results"]], ordem[:2], response.data)
+
+        nova = create_noticia(editor)
+        NoticiaSchema.objects.filter(id=nova.id).update(data_publicacao=timezone.now() + timedelta(hours=1))
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual([n["conteudo"] for n in response.data["results"]], ordem[2:], response.data)
+        self.assertIsNone(response.data["next"], response.data)
+
+        response = self.client.get(response.data["previous"])
+        self.assertEqual([n["conteudo"] for n in response.data["results"]], ordem[:2], response.data)
+
+    def test_list_cursor_pagination_rejects_invalid_cursor(self) -> None:
+        response = self.client.get(self.base_url, {"cursor": "invalido"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, response.data)
+
+    def test_list_query_count_does_not_grow_with_page_size(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        [create_noticia(editor, verticais=[VerticalEnum.PODER, VerticalEnum.SAUDE]) for _ in range(6)]
+
+        for params in [{"page_size": 1}, {"page_size": 6}, {}]:
+            with self.assertNumQueries(1):
+                response = self.client.get(self.base_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def test_retrieve_query_count_does_not_grow_with_verticais(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        user_reader = create_user(UserRoleEnum.READER, True, VerticalEnum.values)
+        poucas = create_noticia(editor, is_pro=True, verticais=[VerticalEnum.PODER])
+        muitas = create_noticia(editor, is_pro=True, verticais=VerticalEnum.values)
+
+        # Primeira leitura monta o snapshot de acesso no cache
+        self.client.force_authenticate(user=user_reader)
+        self.client.get(f"{self.base_url}{poucas.id}/")
+
+        for noticia in [poucas, muitas]:
+            # Usuário recarregado a cada requisição, como faz a autenticação
+            self.client.force_authenticate(user=UserSchema.objects.get(id=user_reader.id))
+            with self.assertNumQueries(1):
+                response = self.client.get(f"{self.base_url}{noticia.id}/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def test_update_query_count_does_not_grow_with_verticais(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        poucas = create_noticia(editor, verticais=[VerticalEnum.PODER])
+        muitas = create_noticia(editor, verticais=VerticalEnum.values)
+
+        self.client.force_authenticate(user=editor)
+        for noticia in [poucas, muitas]:
+            with self.assertNumQueries(4):
+                response = self.client.patch(
+                    f"{self.base_url}{noticia.id}/", {"titulo": self.faker.sentence(nb_words=3)}, format="multipart"
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def test_reader_access_follows_plan_changes(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_pro=True, verticais=[VerticalEnum.SAUDE])
+        user_reader = create_user(UserRoleEnum.READER, True, [VerticalEnum.PODER])
+        url = f"{self.base_url}{noticia.id}/"
+
+        self.client.force_authenticate(user=user_reader)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, response.data)
+        self.assertEqual(response.data["Verticais_do_usuario"], [VerticalEnum.PODER.label], response.data)
+
+        user_reader.user_plan.verticais.add(VerticalSchema.objects.get(cod_categoria=VerticalEnum.SAUDE))
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        self.client.force_authenticate(user=create_user(UserRoleEnum.ADMIN))
+        response = self.client.patch(
+            f"/api/user-plan/{user_reader.user_plan.id}/", {"plan": PlanEnum.JOTA_INFO.label}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        self.client.force_authenticate(user=user_reader)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, response.data)
+
+    def test_reader_access_survives_plan_version_eviction(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_pro=True, verticais=[VerticalEnum.SAUDE])
+        user_reader = create_user(UserRoleEnum.READER, True, [VerticalEnum.SAUDE])
+        url = f"{self.base_url}{noticia.id}/"
+        version_key = f"entitlement:version:{user_reader.id}"
+
+        # A versão some do Redis antes e depois do downgrade: a recriada não pode reencontrar o snapshot JOTA PRO
+        cache.delete(version_key)
+        self.client.force_authenticate(user=user_reader)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        user_reader.user_plan.plan = PlanEnum.JOTA_INFO
+        user_reader.user_plan.save()
+
+        cache.delete(version_key)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, response.data)
+
+    def test_user_editor_can_read_noticias_jota_pro(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_pro=True)
+
+        self.client.force_authenticate(user=editor)
+        response = self.client.get(f"{self.base_url}{noticia.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def test_verticais_mask_follows_verticais(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        noticia_data = generate_noticia_data(verticais=[VerticalEnum.PODER.label, VerticalEnum.SAUDE.label])
+
+        self.client.force_authenticate(user=editor)
+        response = self.client.post(self.base_url, noticia_data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+        noticia = NoticiaSchema.objects.get(id=response.data["id"])
+        self.assertEqual(noticia.verticais_mask, VerticalEnum.PODER.bit | VerticalEnum.SAUDE.bit)
+
+        response = self.client.patch(
+            f"{self.base_url}{noticia.id}/", {"verticais": [VerticalEnum.ENERGIA.label]}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data["verticais"], [VerticalEnum.ENERGIA.label], response.data)
+
+        noticia.refresh_from_db()
+        self.assertEqual(noticia.verticais_mask, VerticalEnum.ENERGIA.bit)
+
+        tributos = VerticalSchema.objects.get(cod_categoria=VerticalEnum.TRIBUTOS)
+        tributos.noticiaschema_set.add(noticia)
+        noticia.refresh_from_db()
+        self.assertEqual(noticia.verticais_mask, VerticalEnum.ENERGIA.bit | VerticalEnum.TRIBUTOS.bit)
+
+        noticia.verticais.remove(tributos)
+        self.assertEqual(noticia.verticais_mask, VerticalEnum.ENERGIA.bit)
+
+        noticia.verticais.clear()
+        noticia.refresh_from_db()
+        self.assertEqual(noticia.verticais_mask, 0)
+
+    def test_verticais_mask_keeps_concurrent_changes(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR))
+        noticia.verticais.clear()
+        poder, saude = VerticalSchema.objects.filter(cod_categoria__in=[VerticalEnum.PODER, VerticalEnum.SAUDE])
+
+        # Duas requisições com a mesma notícia carregada antes de qualquer uma gravar
+        primeira = NoticiaSchema.objects.get(id=noticia.id)
+        segunda = NoticiaSchema.objects.get(id=noticia.id)
+        primeira.verticais.add(poder)
+        segunda.verticais.add(saude)
+
+        noticia.refresh_from_db()
+        self.assertEqual(noticia.verticais_mask, VerticalEnum.PODER.bit | VerticalEnum.SAUDE.bit)
+        self.assertEqual(segunda.verticais_mask, noticia.verticais_mask)
+
+    def test_anonymous_list_is_served_from_cache_until_noticias_change(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        noticia = create_noticia(editor)
+
+        response = self.client.get(self.base_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.base_url)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(len(response.data), 1, response.data)
+
+        response = self.client.get(self.base_url, {"page_size": 1})
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        self.assertEqual(get_noticia_list_cache_stats()["hits"], 1)
+        self.assertEqual(get_noticia_list_cache_stats()["misses"], 2)
+
+        create_noticia(editor)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data), 2, response.data)
+
+        noticia.delete()
+        response = self.client.get(self.base_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data), 1, response.data)
+
+    def test_list_cache_is_invalidated_when_noticia_is_published(self) -> None:
+        create_noticia(create_user(UserRoleEnum.EDITOR), is_published=False)
+        self.client.get(self.base_url)
+
+        publicar_noticia()
+
+        response = self.client.get(self.base_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data[0]["status"], StatusNoticiaEnum.PUBLICADO.label, response.data)
+
+    def test_list_cache_is_invalidated_when_verticais_change_through_the_m2m(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), verticais=[VerticalEnum.PODER])
+        saude = VerticalSchema.objects.get(cod_categoria=VerticalEnum.SAUDE)
+
+        etag = self.client.get(self.base_url)["ETag"]
+
+        # O ETag da listagem vem do updated_at, que o m2m atualiza por update()
+        noticia.verticais.add(saude)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertNotEqual(response["ETag"], etag)
+
+        # Pelo lado da vertical
+        etag = response["ETag"]
+        saude.noticiaschema_set.remove(noticia)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_authenticated_list_is_not_cached(self) -> None:
+        self.client.force_authenticate(user=create_user(UserRoleEnum.READER))
+        response = self.client.get(self.base_url)
+
+        self.assertNotIn("X-Cache", response)
+
+    def test_retrieve_returns_304_when_noticia_is_unchanged(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        noticia = create_noticia(editor)
+        url = f"{self.base_url}{noticia.id}/"
+
+        self.client.force_authenticate(user=editor)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        etag = response["ETag"]
+        last_modified = response["Last-Modified"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        noticia.status_imagem = StatusNoticiaImagemEnum.ERRO_IMAGEM
+        noticia.save(update_fields=["status_imagem"])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_retrieve_conditional_request_still_checks_reader_access(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR), is_pro=True, verticais=[VerticalEnum.SAUDE])
+        editor = create_user(UserRoleEnum.EDITOR)
+        url = f"{self.base_url}{noticia.id}/"
+
+        self.client.force_authenticate(user=editor)
+        etag = self.client.get(url)["ETag"]
+
+        self.client.force_authenticate(user=create_user(UserRoleEnum.READER, True, [VerticalEnum.PODER]))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_page_returns_304_until_page_changes(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        [create_noticia(editor) for _ in range(3)]
+        self.client.force_authenticate(user=editor)
+
+        response = self.client.get(self.base_url, {"page_size": 2})
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.base_url, {"page_size": 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # data_publicacao é aleatória; remove a primeira da página, não a primeira criada
+        NoticiaSchema.objects.order_by("-data_publicacao", "-id").first().delete()
+
+        response = self.client.get(self.base_url, {"page_size": 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cached_anonymous_list_returns_304_without_queries(self) -> None:
+        create_noticia(create_user(UserRoleEnum.EDITOR))
+        etag = self.client.get(self.base_url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.base_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def start_image_upload(self, noticia: NoticiaSchema, conteudo: bytes, filename: str = "foto.jpg") -> str:
+        dados = {"filename": filename, "tamanho": len(conteudo), "sha256": sha256(conteudo).hexdigest()}
+        response = self.client.post(f"{self.base_url}{noticia.id}/imagem-upload/", dados, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        return f"{self.base_url}{noticia.id}/imagem-upload/{response.data['upload_id']}/"
+
+    def send_image_chunk(self, url: str, parte: bytes, offset: int) -> Any:
+        return self.client.patch(
+            url, parte, content_type="application/offset+octet-stream", headers={"Upload-Offset": str(offset)}
+        )
+
+    def noise_jpeg(self, largura: int, altura: int) -> bytes:
+        jpeg = BytesIO()
+        Image.effect_noise((largura, altura), 64).convert("RGB").save(jpeg, format="jpeg")
+        return jpeg.getvalue()
+
+    def test_chunked_image_upload_resumes_and_attaches_image(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        noticia = create_noticia(editor)
+        self.addCleanup(shutil.rmtree, os.path.join(settings.MEDIA_ROOT, "noticias", str(noticia.id)), True)
+        conteudo = self.noise_jpeg(400, 300)
+        self.client.force_authenticate(user=editor)
+
+        url = self.start_image_upload(noticia, conteudo)
+        tamanho_parte = len(conteudo) // 3 + 1
+
+        response = self.send_image_chunk(url, conteudo[:tamanho_parte], 0)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response["Upload-Offset"], str(tamanho_parte))
+
+        # Parte repetida ou fora de ordem: 409 com o offset de onde retomar
+        response = self.send_image_chunk(url, conteudo[:tamanho_parte], 0)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT, response.data)
+        self.assertEqual(response.data["offset"], tamanho_parte)
+
+        # Cliente que perdeu a conexão consulta o offset e continua
+        offset = self.client.get(url).data["offset"]
+        while offset < len(conteudo):
+            response = self.send_image_chunk(url, conteudo[offset : offset + tamanho_parte], offset)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            offset = response.data["offset"]
+
+        response = self.client.post(f"{url}finalizar/")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED, response.data)
+
+        noticia.refresh_from_db()
+        self.addCleanup(shutil.rmtree, os.path.dirname(noticia.imagem.path))
+        self.assertEqual(noticia.status_imagem, StatusNoticiaImagemEnum.OK)
+        self.assertEqual(noticia.imagem_processada_id, sha256(conteudo).hexdigest())
+        self.assertEqual(os.listdir(settings.UPLOAD_TEMP_DIR), [])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_chunked_image_upload_rejects_checksum_mismatch(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        noticia = create_noticia(editor)
+        conteudo = self.noise_jpeg(200, 200)
+        self.client.force_authenticate(user=editor)
+
+        url = self.start_image_upload(noticia, conteudo)
+        corrompido = bytes([conteudo[0] ^ 0xFF]) + conteudo[1:]
+        self.assertEqual(self.send_image_chunk(url, corrompido, 0).status_code, status.HTTP_200_OK)
+
+        response = self.client.post(f"{url}finalizar/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.data)
+
+        noticia.refresh_from_db()
+        self.assertFalse(noticia.imagem)
+        self.assertEqual(os.listdir(settings.UPLOAD_TEMP_DIR), [])
+
+    def test_chunked_image_upload_limits_chunk_size_and_owner(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        noticia = create_noticia(editor)
+        conteudo = self.noise_jpeg(400, 300)
+        self.client.force_authenticate(user=editor)
+        url = self.start_image_upload(noticia, conteudo)
+
+        with override_settings(UPLOAD_CHUNK_SIZE=1024):
+            response = self.send_image_chunk(url, conteudo[:2048], 0)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, response.data)
+        self.assertEqual(self.client.get(url).data["offset"], 0)
+
+        self.client.force_authenticate(user=create_user(UserRoleEnum.EDITOR))
+        response = self.send_image_chunk(url, conteudo[:1024], 0)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.post(f"{self.base_url}{noticia.id}/imagem-upload/", {"filename": "a.gif"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def create_noticia_with_text(
+        self, editor: UserSchema, titulo: str, conteudo: str = "", **kwargs: Any
+    ) -> NoticiaSchema:
+        noticia = create_noticia(editor, **kwargs)
+        noticia.titulo = titulo
+        noticia.conteudo = conteudo or noticia.conteudo
+        noticia.save(update_fields=["titulo", "conteudo"])
+        return noticia
+
+    def search_ids(self, q: str, **params: Any) -> list[str]:
+        response = self.client.get(f"{self.base_url}busca/", {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [noticia["id"] for noticia in response.data["results"]]
+
+    def test_busca_ranks_by_relevance_and_ignores_accents(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        no_conteudo = self.create_noticia_with_text(editor, "Safra recorde", "A exportacao de jabuticaba cresceu")
+        no_titulo = self.create_noticia_with_text(editor, "Exportação de jabuticabas")
+        self.create_noticia_with_text(editor, "Outra notícia")
+
+        self.client.force_authenticate(user=editor)
+        self.assertEqual(self.search_ids("exportação jabuticaba"), [str(no_titulo.id), str(no_conteudo.id)])
+        self.assertEqual(self.search_ids("exportacao -safra"), [str(no_titulo.id)])
+
+        response = self.client.get(f"{self.base_url}busca/", {"q": "jabuticaba", "page_size": 1})
+        self.assertEqual(response.data["count"], 2, response.data)
+        self.assertEqual([n["id"] for n in response.data["results"]], [str(no_titulo.id)])
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.client.get(f"{self.base_url}busca/", {"q": " "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_busca_applies_retrieve_visibility_rules(self) -> None:
+        editor = create_user(UserRoleEnum.EDITOR)
+        info = self.create_noticia_with_text(editor, "Ornitorrinco aberto")
+        pro = self.create_noticia_with_text(editor, "Ornitorrinco PRO", is_pro=True, verticais=[VerticalEnum.SAUDE])
+        rascunho = self.create_noticia_with_text(editor, "Ornitorrinco rascunho", is_published=False)
+
+        response = self.client.get(f"{self.base_url}busca/", {"q": "ornitorrinco"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        casos = [
+            (create_user(UserRoleEnum.READER), {info.id}),
+            (create_user(UserRoleEnum.READER, True, [VerticalEnum.PODER]), {info.id}),
+            (create_user(UserRoleEnum.READER, True, [VerticalEnum.SAUDE, VerticalEnum.PODER]), {info.id, pro.id}),
+            (editor, {info.id, pro.id, rascunho.id}),
+        ]
+        for user, esperadas in casos:
+            self.client.force_authenticate(user=user)
+            self.assertEqual(set(self.search_ids("ornitorrinco")), {str(n) for n in esperadas}, user.role)
@@ -0,0 +1,138 @@
+import re
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, URLPatternsTestCase
+
+from ..enums.email_type_enum import EmailTypeEnum
+from ..enums.status_noticia_enum import StatusNoticiaEnum
+from ..enums.user_role_enum import UserRoleEnum
+from ..enums.vertical_enum import VerticalEnum
+from ..models import NoticiaSchema, UserPlanSchema, UserSchema
+from ..serializers.token_serializer import TokenSerializer
+from ..tasks.publicar_noticia import publicar_noticia
+from ..tasks.send_email import send_email
+from .aux_funcs import create_noticia, create_user
+
+NOTICIAS_SEMEADAS = 400
+LEITORES_SEMEADOS = 200
+SERVER_CURSOR = re.compile(r"^DECLARE .+? CURSOR .*?FOR ")
+
+
+class TestQueryPlans(APITestCase, URLPatternsTestCase):
+    """
+    Roda EXPLAIN nas consultas emitidas pelos caminhos quentes e falha se alguma depender de Seq Scan.
+
+    No banco de teste uma varredura sequencial é sempre mais barata, então os planos são gerados com
+    enable_seqscan desligado: o Postgres só recorre a ela quando nenhum índice atende a consulta.
+    """
+
+    urlpatterns = [
+        path("api/", include("api_portal_jota.urls")),
+    ]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.editor = create_user(UserRoleEnum.EDITOR)
+        cls.reader = create_user(UserRoleEnum.READER, True, [VerticalEnum.PODER, VerticalEnum.SAUDE])
+
+        agora = timezone.now()
+        NoticiaSchema.objects.bulk_create(
+            NoticiaSchema(
+                titulo=f"Notícia {i}",
+                subtitulo="Subtítulo da notícia semeada",
+                conteudo=f"Conteúdo sobre tributação e reforma {i}",
+                data_publicacao=agora + timedelta(hours=i - NOTICIAS_SEMEADAS // 2),
+                autor=cls.editor,
+                # A maior parte publicada, como em produção; o restante são rascunhos agendados
+                status=StatusNoticiaEnum.PUBLICADO if i % 10 else StatusNoticiaEnum.RASCUNHO,
+                is_pro=i % 3 == 0,
+                verticais_mask=VerticalEnum.PODER.bit if i % 2 else VerticalEnum.ENERGIA.bit,
+            )
+            for i in range(NOTICIAS_SEMEADAS)
+        )
+
+        leitores = UserSchema.objects.bulk_create(
+            UserSchema(username=f"leitor{i}", email=f"leitor{i}@jota.info", role=UserRoleEnum.READER)
+            for i in range(LEITORES_SEMEADOS)
+        )
+        UserPlanSchema.objects.bulk_create(
+            UserPlanSchema(cd_user=leitor, verticais_mask=VerticalEnum.PODER.bit) for leitor in leitores
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def auth(self, user: UserSchema) -> dict[str, str]:
+        return {"HTTP_AUTHORIZATION": f"Bearer {TokenSerializer.get_token(user).access_token}"}
+
+    def assertPlans(self, queries: CaptureQueriesContext, *indices: str) -> None:
+        """
+        Nenhuma consulta capturada pode depender de Seq Scan, e cada índice esperado tem de aparecer em algum plano:
+        sem o índice certo o Postgres ainda evita o Seq Scan percorrendo outro índice inteiro.
+        """
+        # iterator() usa cursor no servidor: a consulta vem dentro de um DECLARE
+        selects = [
+            SERVER_CURSOR.sub("", q["sql"])
+            for q in queries.captured_queries
+            if SERVER_CURSOR.sub("", q["sql"]).lstrip().upper().startswith("SELECT")
+        ]
+        self.assertTrue(selects, "Nenhuma consulta capturada")
+
+        planos = []
+        with connection.cursor() as cursor:
+            # LOCAL: vale até o fim da transação do teste
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for sql in selects:
+                cursor.execute(f"EXPLAIN {sql}")
+                plano = "\n".join(linha for (linha,) in cursor.fetchall())
+                self.assertNotIn("Seq Scan", plano, f"{sql}\n\n{plano}")
+                planos.append(plano)
+
+        for indice in indices:
+            self.assertTrue(any(indice in plano for plano in planos), f"{indice} não usado:\n\n" + "\n\n".join(planos))
+
+    def test_noticia_list_plans(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/noticia/", {"page_size": 20})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            response = self.client.get(response.json()["next"])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertPlans(queries, "noticia_publicacao_id_idx")
+
+    def test_noticia_reader_reads_plans(self) -> None:
+        noticia = create_noticia(self.editor, is_pro=True, verticais=[VerticalEnum.SAUDE])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/noticia/{noticia.id}/", **self.auth(self.reader))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            response = self.client.get("/api/noticia/busca/", {"q": "tributação"}, **self.auth(self.reader))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertPlans(queries, "noticia_busca_vector_idx")
+
+    def test_publicar_noticia_plans(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            publicar_noticia()
+
+        self.assertPlans(queries, "noticia_rascunho_agendado_idx")
+
+    def test_distribuir_publicacao_plans(self) -> None:
+        noticia = create_noticia(self.editor, is_pro=True, verticais=[VerticalEnum.PODER])
+
+        with CaptureQueriesContext(connection) as queries:
+            send_email({"email_type": EmailTypeEnum.NOTICIA_PUBLICADA, "news_id": str(noticia.id)})
+
+        self.assertPlans(queries, "user_role_id_idx")
@@ -0,0 +1,133 @@
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db.models import Model
+from django.test import override_settings
+from django.urls import include, path
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase, URLPatternsTestCase
+
+from ..db_router import ReplicaRouter
+from ..enums.email_type_enum import EmailTypeEnum
+from ..enums.user_role_enum import UserRoleEnum
+from ..enums.vertical_enum import VerticalEnum
+from ..models import NoticiaSchema, UserPlanSchema
+from ..serializers.token_serializer import TokenSerializer
+from ..tasks.send_email import send_email
+from ..urls import async_read_urlpatterns
+from .aux_funcs import create_noticia, create_user
+
+Leitura = tuple[type[Model], Optional[str]]
+
+
+# Sem uma réplica de verdade no ambiente de teste o alias da réplica aponta para o banco de teste; o roteador devolve
+# "default" explicitamente para a réplica e None para o primário. TransactionTestCase: dentro da transação do TestCase
+# toda leitura fica no primário
+@override_settings(REPLICA_DATABASE="default")
+class TestReplica(APITransactionTestCase, URLPatternsTestCase):
+    serialized_rollback = True
+
+    urlpatterns = [
+        path("async/", include(async_read_urlpatterns)),
+        path("api/", include("api_portal_jota.urls")),
+    ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.editor = create_user(UserRoleEnum.EDITOR)
+        self.reader = create_user(UserRoleEnum.READER, True, [VerticalEnum.PODER])
+        self.noticia = create_noticia(self.editor, verticais=[VerticalEnum.PODER])
+
+    @contextmanager
+    def leituras(self) -> Iterator[list[Leitura]]:
+        leituras: list[Leitura] = []
+        db_for_read = ReplicaRouter.db_for_read
+
+        def registrar(router: ReplicaRouter, model: type[Model], **hints: Any) -> Optional[str]:
+            escolha = db_for_read(router, model, **hints)
+            leituras.append((model, escolha))
+            return escolha
+
+        with patch.object(ReplicaRouter, "db_for_read", registrar):
+            yield leituras
+
+    def assertReplica(self, leituras: list[Leitura], model: type[Model] = NoticiaSchema) -> None:
+        escolhas = {escolha for lido, escolha in leituras if lido is model}
+        self.assertEqual(escolhas, {"default"}, leituras)
+
+    def assertPrimario(self, leituras: list[Leitura], model: type[Model] = NoticiaSchema) -> None:
+        escolhas = {escolha for lido, escolha in leituras if lido is model}
+        self.assertEqual(escolhas, {None}, leituras)
+
+    def test_gets_dos_viewsets_leem_da_replica(self) -> None:
+        self.client.force_authenticate(user=self.reader)
+
+        with self.leituras() as leituras:
+            response = self.client.get(f"/api/noticia/{self.noticia.id}/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertReplica(leituras)
+
+        plan_id = self.reader.user_plan.id
+        with self.leituras() as leituras:
+            response = self.client.get(f"/api/user-plan/{plan_id}/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertReplica(leituras, UserPlanSchema)
+
+        # A listagem anônima que vai para o cache compartilhado lê do primário
+        self.client.force_authenticate(user=None)
+        with self.leituras() as leituras:
+            response = self.client.get("/api/noticia/")
+            self.assertEqual(response["X-Cache"], "MISS")
+        self.assertPrimario(leituras)
+
+    def test_quem_escreveu_le_do_primario_por_um_tempo(self) -> None:
+        self.client.force_authenticate(user=self.editor)
+
+        with self.leituras() as leituras:
+            response = self.client.patch(f"/api/noticia/{self.noticia.id}/", {"titulo": "Novo título"})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        # As leituras da escrita também ficam no primário
+        self.assertPrimario(leituras)
+
+        with self.leituras() as leituras:
+            response = self.client.get(f"/api/noticia/{self.noticia.id}/")
+            self.assertEqual(response.data["titulo"], "Novo título")
+        self.assertPrimario(leituras)
+
+        # Outros usuários seguem na réplica
+        self.client.force_authenticate(user=self.reader)
+        with self.leituras() as leituras:
+            self.client.get(f"/api/noticia/{self.noticia.id}/")
+        self.assertReplica(leituras)
+
+        # Passada a janela, o editor volta para a réplica
+        cache.clear()
+        self.client.force_authenticate(user=self.editor)
+        with self.leituras() as leituras:
+            self.client.get(f"/api/noticia/{self.noticia.id}/")
+        self.assertReplica(leituras)
+
+    def test_views_assincronas_leem_da_replica(self) -> None:
+        reader = {"HTTP_AUTHORIZATION": f"Bearer {TokenSerializer.get_token(self.reader).access_token}"}
+        editor = {"HTTP_AUTHORIZATION": f"Bearer {TokenSerializer.get_token(self.editor).access_token}"}
+
+        with self.leituras() as leituras:
+            response = self.client.get(f"/async/noticia/{self.noticia.id}/", **reader)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertReplica(leituras)
+
+        # Escrita pelo viewset na mesma rota: a próxima leitura do editor vai ao primário
+        response = self.client.patch(f"/async/noticia/{self.noticia.id}/", {"titulo": "Novo título"}, **editor)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+        with self.leituras() as leituras:
+            response = self.client.get(f"/async/noticia/{self.noticia.id}/", **editor)
+            self.assertEqual(response.json()["titulo"], "Novo título")
+        self.assertPrimario(leituras)
+
+    def test_tarefas_leem_da_replica(self) -> None:
+        with self.leituras() as leituras:
+            send_email({"email_type": EmailTypeEnum.NOTICIA_DESATIVADA, "news_id": str(self.noticia.id)})
+        self.assertReplica(leituras)
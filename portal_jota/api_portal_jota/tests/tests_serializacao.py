@@ -0,0 +1,60 @@
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from ..enums.status_noticia_imagem_enum import StatusNoticiaImagemEnum
+from ..enums.user_role_enum import UserRoleEnum
+from ..models import NoticiaSchema
+from ..renderers import ORJSONRenderer
+from ..serializers.noticia_serializer import CAMPOS_DA_LISTAGEM, NoticiaListSerializer, NoticiaSerializer
+from .aux_funcs import create_noticia, create_user
+
+
+class TestSerializacao(APITestCase):
+    def test_projecao_da_listagem_igual_ao_model_serializer(self) -> None:
+        noticia = create_noticia(create_user(UserRoleEnum.EDITOR))
+        NoticiaSchema.objects.filter(id=noticia.id).update(
+            imagem=f"noticias/{noticia.id}/foto.webp",
+            status_imagem=StatusNoticiaImagemEnum.OK,
+            imagem_renditions={"webp": {"640": "foto-640.webp", "320": "foto-320.webp"}},
+        )
+        noticia.refresh_from_db()
+
+        context = {"request": Request(APIRequestFactory().get("/api/noticia/"))}
+        row = NoticiaSchema.objects.values(*CAMPOS_DA_LISTAGEM).get(id=noticia.id)
+
+        for fuso in ("America/Sao_Paulo", "UTC"):
+            with timezone.override(fuso):
+                projecao = NoticiaListSerializer(row, context=context).data
+                completo = NoticiaSerializer(noticia, context=context).data
+
+            self.assertEqual(list(projecao), list(NoticiaListSerializer().fields))
+            # Na listagem o srcset traz só a menor versão de cada formato
+            esperado = {campo: completo[campo] for campo in projecao}
+            esperado["imagem_srcset"] = {"webp": {"320w": completo["imagem_srcset"]["webp"]["320w"]}}
+            self.assertEqual(projecao, esperado)
+
+    def test_orjson_renderer_gera_o_mesmo_json_do_drf(self) -> None:
+        data = {
+            "id": uuid4(),
+            "utc": datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=dt_timezone.utc),
+            "local": timezone.localtime(),
+            "dia": date(2025, 1, 2),
+            "valor": Decimal("1.50"),
+            "texto": "Publicação com separador \u2028",
+            "lazy": gettext_lazy("Publicado"),
+            1: [None, True, 1.5, (1, 2)],
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            ORJSONRenderer().render(data, "application/json; indent=4"),
+            JSONRenderer().render(data, "application/json; indent=4"),
+        )
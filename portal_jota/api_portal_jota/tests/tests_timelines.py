@@ -0,0 +1,169 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.urls import include, path
+from rest_framework import status
+from rest_framework.test import APITestCase, URLPatternsTestCase
+
+from ..enums.status_noticia_enum import StatusNoticiaEnum
+from ..enums.user_role_enum import UserRoleEnum
+from ..enums.vertical_enum import VerticalEnum
+from ..models import NoticiaSchema, VerticalSchema
+from ..tasks.publicar_noticia import publicar_noticia
+from ..timelines import _redis, _timeline_key, ler_timeline
+from .aux_funcs import create_noticia, create_user
+
+
+class TestTimelines(APITestCase, URLPatternsTestCase):
+    urlpatterns = [
+        path("api/", include("api_portal_jota.urls")),
+    ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.editor = create_user(UserRoleEnum.EDITOR)
+
+    def criar(self, verticais: list[VerticalEnum], is_published: bool = True) -> NoticiaSchema:
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_noticia(self.editor, is_published=is_published, verticais=verticais)
+
+    def reconstruir(self) -> None:
+        call_command("reconstruir_timelines", stdout=StringIO())
+
+    def publicadas(self, vertical: VerticalEnum, campo: str = "conteudo") -> list[str]:
+        noticias = NoticiaSchema.objects.filter(status=StatusNoticiaEnum.PUBLICADO, verticais__cod_categoria=vertical)
+        return [str(valor) for valor in noticias.order_by("-data_publicacao", "-id").values_list(campo, flat=True)]
+
+    def percorrer(self, vertical: str, page_size: int) -> list[str]:
+        # A listagem reduzida não traz o id
+        conteudos = []
+        url, params = f"/api/noticia/por-vertical/{vertical}/", {"page_size": page_size}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            conteudos += [noticia["conteudo"] for noticia in response.data["results"]]
+            url, params = response.data["next"], {}
+
+        return conteudos
+
+    def test_publicacao_entra_nas_timelines_das_verticais(self) -> None:
+        self.reconstruir()
+        noticia = self.criar([VerticalEnum.PODER, VerticalEnum.SAUDE])
+
+        self.assertEqual(ler_timeline(VerticalEnum.PODER, None, False, 10), [str(noticia.id)])
+        self.assertEqual(ler_timeline(VerticalEnum.SAUDE, None, False, 10), [str(noticia.id)])
+        self.assertEqual(ler_timeline(VerticalEnum.ENERGIA, None, False, 10), [])
+
+        # Sem executar os callbacks de commit o agendamento por ETA não publica: fica para o beat
+        rascunho = create_noticia(self.editor, is_published=False, verticais=[VerticalEnum.PODER])
+        self.assertEqual(len(ler_timeline(VerticalEnum.PODER, None, False, 10)), 1)
+
+        # Publicação em lote pelo beat, por update()
+        with self.captureOnCommitCallbacks(execute=True):
+            publicar_noticia()
+
+        self.assertIn(str(rascunho.id), ler_timeline(VerticalEnum.PODER, None, False, 10))
+        self.assertEqual(ler_timeline(VerticalEnum.PODER, None, False, 10), self.publicadas(VerticalEnum.PODER, "id"))
+
+        # Publicação agendada por ETA, executada na hora pelo Celery em modo eager
+        agendada = self.criar([VerticalEnum.PODER], is_published=False)
+        self.assertIn(str(agendada.id), ler_timeline(VerticalEnum.PODER, None, False, 10))
+        self.assertEqual(ler_timeline(VerticalEnum.PODER, None, False, 10), self.publicadas(VerticalEnum.PODER, "id"))
+
+    def test_por_vertical_pagina_a_partir_do_redis(self) -> None:
+        for _ in range(7):
+            self.criar([VerticalEnum.TRIBUTOS])
+        self.criar([VerticalEnum.PODER])
+        self.reconstruir()
+
+        # Uma consulta por página: os ids vêm do Redis e as notícias de um in_bulk
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get("/api/noticia/por-vertical/tributos/", {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertNotIn("LIMIT", queries.captured_queries[0]["sql"])
+        self.assertNotIn("autor", response.data["results"][0])
+
+        self.assertEqual(self.percorrer("tributos", 3), self.publicadas(VerticalEnum.TRIBUTOS))
+
+        # previous volta para a mesma página
+        response = self.client.get("/api/noticia/por-vertical/tributos/", {"page_size": 3})
+        segunda = self.client.get(response.data["next"])
+        primeira = self.client.get(segunda.data["previous"])
+        self.assertEqual(primeira.data["results"], response.data["results"])
+
+    def test_mudancas_de_status_verticais_e_remocao_atualizam_as_timelines(self) -> None:
+        self.reconstruir()
+        noticia = self.criar([VerticalEnum.PODER])
+        outra = self.criar([VerticalEnum.PODER])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            noticia.verticais.set(VerticalSchema.objects.filter(cod_categoria=VerticalEnum.ENERGIA))
+        self.assertEqual(ler_timeline(VerticalEnum.PODER, None, False, 10), [str(outra.id)])
+        self.assertEqual(ler_timeline(VerticalEnum.ENERGIA, None, False, 10), [str(noticia.id)])
+
+        # Pelo lado da vertical
+        energia = VerticalSchema.objects.get(cod_categoria=VerticalEnum.ENERGIA)
+        with self.captureOnCommitCallbacks(execute=True):
+            energia.noticiaschema_set.clear()
+        self.assertEqual(ler_timeline(VerticalEnum.ENERGIA, None, False, 10), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            outra.status = StatusNoticiaEnum.RASCUNHO
+            outra.save(update_fields=["status"])
+        self.assertEqual(ler_timeline(VerticalEnum.PODER, None, False, 10), [])
+
+        nova = self.criar([VerticalEnum.PODER])
+        with self.captureOnCommitCallbacks(execute=True):
+            nova.delete()
+        self.assertEqual(ler_timeline(VerticalEnum.PODER, None, False, 10), [])
+
+    def test_timeline_nao_pronta_volta_para_o_postgres(self) -> None:
+        noticias = [self.criar([VerticalEnum.SAUDE]) for _ in range(4)]
+        self.assertIsNone(ler_timeline(VerticalEnum.SAUDE, None, False, 10))
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/noticia/por-vertical/saude/", {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(self.percorrer("saude", 2), self.publicadas(VerticalEnum.SAUDE))
+
+        out = StringIO()
+        call_command("reconstruir_timelines", "saude", stdout=out)
+        self.assertIn("Saude: 4 notícias", out.getvalue())
+        self.assertEqual(len(ler_timeline(VerticalEnum.SAUDE, None, False, 10)), len(noticias))
+
+    def test_timeline_descartada_volta_para_o_postgres(self) -> None:
+        for _ in range(3):
+            self.criar([VerticalEnum.ENERGIA])
+        self.reconstruir()
+
+        # O Redis descarta o set: a marca de pronta vai junto, e a publicação seguinte não torna o set pronto
+        _redis().delete(_timeline_key(VerticalEnum.ENERGIA))
+        self.assertIsNone(ler_timeline(VerticalEnum.ENERGIA, None, False, 10))
+        self.criar([VerticalEnum.ENERGIA])
+        self.assertIsNone(ler_timeline(VerticalEnum.ENERGIA, None, False, 10))
+
+        self.assertEqual(self.percorrer("energia", 2), self.publicadas(VerticalEnum.ENERGIA))
+        self.assertEqual(len(self.publicadas(VerticalEnum.ENERGIA)), 4)
+
+    def test_timeline_cortada_volta_para_o_postgres_nas_paginas_antigas(self) -> None:
+        for _ in range(6):
+            self.criar([VerticalEnum.TRABALHISTA])
+
+        with patch("api_portal_jota.timelines.TIMELINE_TAMANHO", 4):
+            self.reconstruir()
+            self.assertEqual(self.percorrer("trabalhista", 3), self.publicadas(VerticalEnum.TRABALHISTA))
+
+            # Com a timeline cheia, a página além do fim dela não é tratada como a última
+            response = self.client.get("/api/noticia/por-vertical/trabalhista/", {"page_size": 3})
+            segunda = self.client.get(response.data["next"])
+            self.assertEqual(len(segunda.data["results"]), 3)
+
+    def test_vertical_invalida(self) -> None:
+        response = self.client.get("/api/noticia/por-vertical/esportes/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["Verticais"], VerticalEnum.labels)
+
+        with self.assertRaises(CommandError):
+            call_command("reconstruir_timelines", "esportes", stdout=StringIO())
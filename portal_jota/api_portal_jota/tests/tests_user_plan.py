@@ -83,6 +83,7 @@ class TestUserPlan(APITestCase, URLPatternsTestCase):
 
         user_reader.refresh_from_db()
         self.assertEqual(user_reader.user_plan.plan, PlanEnum.JOTA_PRO)
+        self.assertEqual(user_reader.user_plan.verticais_mask, VerticalEnum.PODER.bit | VerticalEnum.SAUDE.bit)
         self.assertEqual([v.name for v in user_reader.user_plan.verticais.all()], plan_updates["verticais"])
 
     def test_user_reader_can_list_only_his_user_plan(self) -> None:
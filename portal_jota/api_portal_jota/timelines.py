@@ -0,0 +1,204 @@
+"""
+Timelines de publicação por vertical no Redis, para a listagem por_vertical não consultar o Postgres por vertical.
+
+Cada vertical tem um sorted set com os ids das notícias publicadas, com data_publicacao (em microssegundos) como
+score; notícias com o mesmo score ficam na ordem dos ids, a mesma de (data_publicacao DESC, id DESC) da listagem.
+As escritas acontecem no commit de quem muda status, data_publicacao ou verticais (fan-out na escrita); cada set
+guarda só as TIMELINE_TAMANHO mais recentes.
+
+Notícias abertas (is_pro=False) também entram em um segundo set por vertical, para o feed de quem não é JOTA PRO
+ler só o que pode abrir sem filtrar depois da leitura. O feed junta as timelines das verticais do leitor com um
+merge de k vias: cada página lê no máximo `limite` ids de cada vertical, qualquer que seja o tamanho delas.
+
+Uma timeline só é lida depois que o comando reconstruir_timelines a preenche a partir do Postgres e marca como
+pronta; sem a marca (Redis novo ou limpo) ou além do fim de uma timeline cheia, a leitura volta para o Postgres.
+A marca é um membro do próprio set, com score -inf: se o Redis descarta o set, descarta a marca junto, e um zadd
+posterior recria o set sem ela. As chaves não expiram; o Redis usa volatile-lru, que só descarta chaves com TTL.
+"""
+
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from redis import Redis
+
+from .enums.status_noticia_enum import StatusNoticiaEnum
+from .enums.vertical_enum import VerticalEnum
+from .types import NoticiaId
+
+TIMELINE_TAMANHO = 1000
+
+# Membro que marca o set como pronto; fica sempre no rank 0, abaixo de qualquer notícia
+PRONTA = "pronta"
+PRONTA_SCORE = float("-inf")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# (id, status, data_publicacao, verticais_mask, is_pro)
+NoticiaTimeline = tuple[NoticiaId, Optional[str], Optional[datetime], int, bool]
+Position = tuple[datetime, str]
+# (score, id): a ordem da listagem é a ordem decrescente dessas tuplas
+Membro = tuple[int, NoticiaId]
+
+
+def _redis() -> Redis:
+    # Mesmo Redis e mesmo database do cache da aplicação; sorted sets não passam pela API de cache do Django
+    return cache._cache.get_client(write=True)
+
+
+def _timeline_key(vertical: VerticalEnum, abertas: bool = False) -> str:
+    if abertas:
+        return cache.make_and_validate_key(f"timeline:{vertical}:abertas")
+
+    return cache.make_and_validate_key(f"timeline:{vertical}")
+
+
+def score(data_publicacao: datetime) -> int:
+    # Inteiro em microssegundos: cabe sem perda no double do Redis, o que um timestamp em segundos não garante
+    return (data_publicacao - EPOCH) // timedelta(microseconds=1)
+
+
+def atualizar_timelines(noticias: Iterable[NoticiaTimeline]) -> None:
+    """
+    Coloca cada notícia publicada nas timelines das suas verticais e a retira das demais.
+    """
+    with _redis().pipeline(transaction=False) as pipe:
+        for noticia_id, status, data_publicacao, verticais_mask, is_pro in noticias:
+            for vertical in VerticalEnum:
+                publicada = status == StatusNoticiaEnum.PUBLICADO and bool(verticais_mask & vertical.bit)
+
+                for abertas, entra in ((False, publicada), (True, publicada and not is_pro)):
+                    if entra:
+                        pipe.zadd(_timeline_key(vertical, abertas), {noticia_id: score(data_publicacao)})
+                    else:
+                        pipe.zrem(_timeline_key(vertical, abertas), noticia_id)
+
+        # O corte começa no rank 1 para não retirar a marca de pronta
+        for vertical in VerticalEnum:
+            for abertas in (False, True):
+                pipe.zremrangebyrank(_timeline_key(vertical, abertas), 1, -TIMELINE_TAMANHO - 1)
+
+        pipe.execute()
+
+
+def sincronizar_timelines(noticia_ids: list[NoticiaId]) -> None:
+    """
+    Atualiza as timelines com o estado das notícias no banco; as que não existem mais saem de todas.
+    """
+    from .models import NoticiaSchema
+
+    linhas = NoticiaSchema.objects.filter(id__in=noticia_ids).values_list(
+        "id", "status", "data_publicacao", "verticais_mask", "is_pro"
+    )
+    encontradas = {str(noticia_id): resto for noticia_id, *resto in linhas}
+
+    atualizar_timelines(
+        (noticia_id, *encontradas[noticia_id]) if noticia_id in encontradas else (noticia_id, None, None, 0, False)
+        for noticia_id in map(str, noticia_ids)
+    )
+
+
+def sincronizar_timelines_no_commit(noticia_ids: list[NoticiaId]) -> None:
+    noticia_ids = [str(noticia_id) for noticia_id in noticia_ids]
+    transaction.on_commit(lambda: sincronizar_timelines(noticia_ids))
+
+
+def reconstruir_timeline(vertical: VerticalEnum) -> int:
+    from .models import NoticiaSchema
+
+    publicadas = (
+        NoticiaSchema.objects.filter(status=StatusNoticiaEnum.PUBLICADO)
+        .alias(em_comum=F("verticais_mask").bitand(vertical.bit))
+        .filter(em_comum__gt=0)
+        .order_by("-data_publicacao", "-id")
+        .values_list("id", "data_publicacao")
+    )
+
+    # As abertas têm consulta própria: o corte das TIMELINE_TAMANHO mais recentes vale para cada set
+    membros, abertas = (
+        {str(noticia_id): score(data_publicacao) for noticia_id, data_publicacao in queryset[:TIMELINE_TAMANHO]}
+        for queryset in (publicadas, publicadas.filter(is_pro=False))
+    )
+
+    # MULTI: quem lê vê a timeline antiga ou a nova, nunca uma parcial
+    with _redis().pipeline(transaction=True) as pipe:
+        for key, conteudo in ((_timeline_key(vertical), membros), (_timeline_key(vertical, True), abertas)):
+            pipe.delete(key)
+            pipe.zadd(key, {**conteudo, PRONTA: PRONTA_SCORE})
+        pipe.execute()
+
+    return len(membros)
+
+
+def _membros(resposta: list[tuple[bytes, float]]) -> list[Membro]:
+    return [(int(m_score), membro.decode()) for membro, m_score in resposta if m_score != PRONTA_SCORE]
+
+
+def ler_timelines(
+    verticais: list[VerticalEnum], position: Optional[Position], reverse: bool, limite: int, abertas: bool = False
+) -> Optional[list[NoticiaId]]:
+    """
+    Até `limite` ids depois de `position` na ordem da listagem (antes dela, em ordem inversa, com `reverse`),
+    juntando as timelines das verticais sem repetir notícias que estão em mais de uma.
+    None quando as timelines não respondem sozinhas: alguma não está pronta ou acabou antes do limite estando cheia.
+    """
+    redis = _redis()
+    keys = [_timeline_key(vertical, abertas) for vertical in verticais]
+    s = score(position[0]) if position is not None else None
+
+    with redis.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.zscore(key, PRONTA)
+            pipe.zcard(key)
+            if position is not None:
+                pipe.zcount(key, s, s)
+        respostas = pipe.execute()
+
+    passo = 2 if position is None else 3
+    estados = [respostas[i : i + passo] for i in range(0, len(respostas), passo)]
+    if any(pronta is None for pronta, *_ in estados):
+        return None
+
+    # Uma leitura limitada por vertical, todas na mesma ida ao Redis
+    with redis.pipeline(transaction=False) as pipe:
+        for key, (_, _, *empates) in zip(keys, estados):
+            if position is None:
+                pipe.zrevrange(key, 0, limite - 1, withscores=True)
+            elif reverse:
+                # Notícias com o mesmo score da posição vêm junto e são filtradas pelo id
+                pipe.zrangebyscore(key, s, "+inf", start=0, num=limite + empates[0], withscores=True)
+            else:
+                pipe.zrevrangebyscore(key, s, "-inf", start=0, num=limite + empates[0], withscores=True)
+        leituras = [_membros(resposta) for resposta in pipe.execute()]
+
+    if position is not None:
+        posicao = (s, position[1])
+        leituras = [
+            [membro for membro in leitura if (membro > posicao if reverse else membro < posicao)][:limite]
+            for leitura in leituras
+        ]
+
+    # Uma timeline cheia perdeu as mais antigas para o corte: o que falta está só no Postgres
+    for leitura, (_, tamanho, *_) in zip(leituras, estados):
+        if not reverse and len(leitura) < limite and tamanho - 1 >= TIMELINE_TAMANHO:
+            return None
+
+    # Merge de k vias: cada leitura já vem na ordem pedida; a mesma notícia tem o mesmo score em todas
+    ids: list[NoticiaId] = []
+    for _, noticia_id in heapq.merge(*leituras, reverse=not reverse):
+        if ids and ids[-1] == noticia_id:
+            continue
+        ids.append(noticia_id)
+        if len(ids) == limite:
+            break
+
+    return ids
+
+
+def ler_timeline(
+    vertical: VerticalEnum, position: Optional[Position], reverse: bool, limite: int
+) -> Optional[list[NoticiaId]]:
+    return ler_timelines([vertical], position, reverse, limite)
@@ -1,9 +1,11 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import path, re_path
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import token_refresh, token_verify
+from rest_framework_simplejwt.views import token_verify
 
+from .views.async_read import noticia_list, noticia_retrieve, read_view, user_plan_retrieve
 from .views.noticia_view import NoticiaViewSet
-from .views.token_view import TokenView
+from .views.token_view import TokenRefreshClaimsView, TokenView
 from .views.user_plan_view import UserPlanViewSet
 from .views.user_view import UserViewSet
 
@@ -17,8 +19,30 @@ router.register(r"noticia", viewset=NoticiaViewSet, basename="noticia")
 
 urlpatterns = [
     path("token/", TokenView.as_view(), name="token_obtain_pair"),
-    path("token/refresh/", token_refresh, name="token_refresh"),
+    path("token/refresh/", TokenRefreshClaimsView.as_view(), name="token_refresh"),
     path("token/verify/", token_verify, name="token_verify"),
 ]
 
+# Views do DRF geradas pelo router, para onde as rotas assíncronas mandam os métodos que não são leitura
+sync_views = {url.name: url.callback for url in router.urls}
+
+# Só ids no formato UUID: ações como noticia/busca/ continuam no router
+async_read_urlpatterns = [
+    re_path(r"^noticia/$", read_view(noticia_list, sync_views["noticia-list"]), name="noticia-list"),
+    re_path(
+        r"^noticia/(?P<pk>[0-9a-f-]{36})/$",
+        read_view(noticia_retrieve, sync_views["noticia-detail"]),
+        name="noticia-detail",
+    ),
+    re_path(
+        r"^user-plan/(?P<pk>[0-9a-f-]{36})/$",
+        read_view(user_plan_retrieve, sync_views["user-plan-detail"]),
+        name="user-plan-detail",
+    ),
+]
+
+if settings.WEB_SERVER == "asgi":
+    # Antes do router, que tem as mesmas rotas
+    urlpatterns += async_read_urlpatterns
+
 urlpatterns += router.urls
@@ -0,0 +1,280 @@
+"""
+Leituras quentes em views assíncronas, servidas no perfil ASGI (WEB_SERVER=asgi).
+
+Com workers síncronos cada cliente lento prende um worker até o fim da resposta; no ASGI a requisição espera no
+event loop. Listagem e detalhe de notícia e detalhe de plano fazem toda a E/S pelo ORM e pelo cache assíncronos
+do Django, e os serializers do DRF só recebem instâncias ou linhas já carregadas, sem consultas. Os demais métodos
+das mesmas rotas seguem para os viewsets do DRF.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.db.models import Model, QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, PermissionDenied
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from ..authentication import ClaimsJWTAuthentication, ClaimsUser, claims_are_current
+from ..db_router import aescreveu_recentemente, ler_da_replica, usar_primario
+from ..entitlements import aget_plan_version, aget_reader_entitlement
+from ..enums.status_noticia_enum import StatusNoticiaEnum
+from ..enums.user_role_enum import UserRoleEnum
+from ..models import NoticiaSchema, UserPlanSchema, UserSchema
+from ..noticia_cache import acache_list, aget_cached_list
+from ..pagination import NoticiaCursorPagination
+from ..renderers import ORJSONRenderer
+from ..serializers.noticia_serializer import CAMPOS_DA_LISTAGEM, NoticiaListSerializer, NoticiaSerializer
+from ..serializers.user_plan_serializer import UserPlanSerializer
+from .conditional import (
+    VALIDATOR_FIELDS,
+    Validators,
+    has_conditional_headers,
+    instance_validators,
+    noticia_validators,
+    not_modified_response,
+    row_validators,
+    set_validators,
+)
+from .noticia_view import reader_access_denied_detail
+
+AsyncView = Callable[..., Awaitable[HttpResponse]]
+
+
+class AsyncJWTAuthentication(ClaimsJWTAuthentication):
+    """
+    ClaimsJWTAuthentication com cache e ORM assíncronos; a validação do token é só CPU.
+    """
+
+    async def aauthenticate(self, request: HttpRequest) -> ClaimsUser | UserSchema | AnonymousUser:
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return AnonymousUser()
+
+        return await self.aget_user(self.get_validated_token(raw_token))
+
+    async def aget_user(self, validated_token: Any) -> ClaimsUser | UserSchema:
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken("Token contained no recognizable user identification") from e
+
+        if claims_are_current(validated_token, await aget_plan_version(str(user_id))):
+            return ClaimsUser(validated_token)
+
+        try:
+            user = await UserSchema.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+        except UserSchema.DoesNotExist as e:
+            raise AuthenticationFailed("User not found", code="user_not_found") from e
+
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+
+        return user
+
+
+authentication = AsyncJWTAuthentication()
+
+
+def json_response(data: Any, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+    # Mesmo renderer dos viewsets, para o corpo ser idêntico nos dois perfis
+    return HttpResponse(ORJSONRenderer().render(data), status=status_code, content_type="application/json")
+
+
+def error_response(request: HttpRequest, exc: Exception) -> HttpResponse:
+    response = exception_handler(exc, {})
+    if response is None:
+        raise exc
+
+    json = json_response(response.data, response.status_code)
+    if response.status_code == status.HTTP_401_UNAUTHORIZED:
+        json["WWW-Authenticate"] = authentication.authenticate_header(request)
+
+    return json
+
+
+async def authenticated_request(request: HttpRequest) -> Request:
+    # O Request do DRF dá query_params à paginação e ao cache; sem autenticadores, o usuário vem do JWT assíncrono
+    drf_request = Request(request)
+    drf_request.user = await authentication.aauthenticate(request)
+
+    if await aescreveu_recentemente(drf_request.user):
+        # Escreveu há pouco: o resto da requisição lê do primário
+        usar_primario()
+
+    return drf_request
+
+
+def read_view(read: AsyncView, sync_view: Callable[..., HttpResponse]) -> AsyncView:
+    """
+    GET e HEAD vão para a view assíncrona, lendo da réplica; os demais métodos da rota vão para o viewset do DRF.
+    """
+
+    async def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if request.method not in ("GET", "HEAD"):
+            return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+        try:
+            with ler_da_replica():
+                return await read(request, *args, **kwargs)
+        except (APIException, Http404) as exc:
+            return error_response(request, exc)
+
+    return csrf_exempt(view)
+
+
+async def aget_or_404(queryset: QuerySet, pk: str) -> Model:
+    try:
+        return await queryset.aget(pk=pk)
+    except (queryset.model.DoesNotExist, ValueError, ValidationError):
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.") from None
+
+
+def serializer_context(request: Request, action: str) -> dict[str, Any]:
+    # O mesmo contexto que os viewsets passam aos serializers
+    return {"request": request, "view": SimpleNamespace(action=action)}
+
+
+async def reader_access_denied(request: Request, noticia_pro: bool, verticais_mask: int) -> HttpResponse | None:
+    if not (noticia_pro and request.user.role == UserRoleEnum.READER):
+        return None
+
+    entitlement = getattr(request.user, "entitlement", None) or await aget_reader_entitlement(str(request.user.id))
+
+    detail = reader_access_denied_detail(entitlement, verticais_mask)
+    if detail is None:
+        return None
+
+    return json_response(detail, status.HTTP_403_FORBIDDEN)
+
+
+async def list_validators(
+    paginator: NoticiaCursorPagination, queryset: QuerySet[NoticiaSchema], request: Request
+) -> Validators:
+    if paginator.is_requested(request):
+        page_queryset = paginator.get_page_queryset(queryset, request).values_list(*VALIDATOR_FIELDS)
+        return noticia_validators(paginator.fetch_page([row async for row in page_queryset]))
+
+    return noticia_validators([row async for row in queryset.values_list(*VALIDATOR_FIELDS)])
+
+
+async def noticia_list(request: HttpRequest) -> HttpResponse:
+    drf_request = await authenticated_request(request)
+    anonimo = not drf_request.user.is_authenticated
+
+    if anonimo:
+        key, cached = await aget_cached_list(drf_request)
+        if cached is not None:
+            validators = (cached["etag"], cached["last_modified"])
+            response = not_modified_response(request, validators)
+            if response is None:
+                response = json_response(cached["data"])
+                set_validators(response, validators)
+
+            response["X-Cache"] = "HIT"
+            return response
+
+        # Como no viewset, o que vai para o cache compartilhado vem do primário
+        usar_primario()
+
+    queryset = NoticiaSchema.objects.order_by("-data_publicacao", "-id").values(*CAMPOS_DA_LISTAGEM)
+
+    if has_conditional_headers(request):
+        not_modified = not_modified_response(
+            request, await list_validators(NoticiaCursorPagination(), queryset, drf_request)
+        )
+        if not_modified is not None:
+            return not_modified
+
+    paginator = NoticiaCursorPagination()
+    paginado = paginator.is_requested(drf_request)
+
+    if paginado:
+        paginator.page = paginator.fetch_page([n async for n in paginator.get_page_queryset(queryset, drf_request)])
+        noticias = paginator.page
+    else:
+        noticias = [n async for n in queryset]
+
+    validators = row_validators(noticias)
+
+    data = NoticiaListSerializer(noticias, many=True, context=serializer_context(drf_request, "list")).data
+    if paginado:
+        data = paginator.get_paginated_response(data).data
+
+    response = json_response(data)
+    set_validators(response, validators)
+
+    if anonimo:
+        etag, last_modified = validators
+        await acache_list(key, {"data": data, "etag": etag, "last_modified": last_modified})
+        response["X-Cache"] = "MISS"
+
+    return response
+
+
+async def noticia_retrieve(request: HttpRequest, pk: str) -> HttpResponse:
+    drf_request = await authenticated_request(request)
+    user = drf_request.user
+
+    if not user.is_authenticated:
+        raise NotAuthenticated()
+
+    queryset = NoticiaSchema.objects.select_related("autor")
+    if user.role == UserRoleEnum.READER:
+        queryset = queryset.filter(status=StatusNoticiaEnum.PUBLICADO)
+
+    if has_conditional_headers(request):
+        try:
+            noticia = await queryset.filter(pk=pk).values(*VALIDATOR_FIELDS, "is_pro", "verticais_mask").afirst()
+        except (ValueError, ValidationError):
+            noticia = None
+
+        if noticia is not None and not await reader_access_denied(
+            drf_request, noticia["is_pro"], noticia["verticais_mask"]
+        ):
+            validators = noticia_validators([tuple(noticia[f] for f in VALIDATOR_FIELDS)])
+            not_modified = not_modified_response(request, validators)
+            if not_modified is not None:
+                return not_modified
+
+    instance = await aget_or_404(queryset, pk)
+
+    acesso_negado = await reader_access_denied(drf_request, instance.is_pro, instance.verticais_mask)
+    if acesso_negado is not None:
+        return acesso_negado
+
+    response = json_response(NoticiaSerializer(instance, context=serializer_context(drf_request, "retrieve")).data)
+    set_validators(response, instance_validators([instance]))
+    return response
+
+
+async def user_plan_retrieve(request: HttpRequest, pk: str) -> HttpResponse:
+    drf_request = await authenticated_request(request)
+    user = drf_request.user
+
+    if not user.is_authenticated:
+        raise NotAuthenticated()
+
+    if user.role not in {UserRoleEnum.READER, UserRoleEnum.ADMIN}:
+        raise PermissionDenied()
+
+    queryset = UserPlanSchema.objects.select_related("cd_user")
+    if user.role != UserRoleEnum.ADMIN:
+        queryset = queryset.filter(cd_user=user.id)
+
+    instance = await aget_or_404(queryset, pk)
+    return json_response(UserPlanSerializer(instance, context=serializer_context(drf_request, "retrieve")).data)
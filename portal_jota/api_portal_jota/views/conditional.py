@@ -0,0 +1,59 @@
+from datetime import datetime
+from hashlib import sha256
+from typing import Any, Iterable, Optional
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+# Colunas que mudam a representação de uma notícia; updated_at sozinho não cobre status_imagem
+VALIDATOR_FIELDS = ("id", "updated_at", "status_imagem")
+
+Validators = tuple[str, Optional[datetime]]
+
+
+def has_conditional_headers(request: Any) -> bool:
+    return "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+
+
+def noticia_validators(rows: Iterable[tuple]) -> Validators:
+    """
+    ETag forte e Last-Modified a partir de tuplas (id, updated_at, status_imagem), na ordem da resposta.
+    """
+    digest = sha256()
+    last_modified = None
+
+    for noticia_id, updated_at, status_imagem in rows:
+        digest.update(f"{noticia_id}:{updated_at.isoformat()}:{status_imagem};".encode())
+        if last_modified is None or updated_at > last_modified:
+            last_modified = updated_at
+
+    return f'"{digest.hexdigest()}"', last_modified
+
+
+def instance_validators(instances: Iterable[Any]) -> Validators:
+    return noticia_validators(tuple(getattr(instance, field) for field in VALIDATOR_FIELDS) for instance in instances)
+
+
+def row_validators(rows: Iterable[dict]) -> Validators:
+    # Linhas de .values() com as colunas de VALIDATOR_FIELDS
+    return noticia_validators(tuple(row[field] for field in VALIDATOR_FIELDS) for row in rows)
+
+
+def not_modified_response(request: Any, validators: Validators) -> Optional[HttpResponse]:
+    etag, last_modified = validators
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, validators)
+
+    return response
+
+
+def set_validators(response: Any, validators: Validators) -> None:
+    etag, last_modified = validators
+    response["ETag"] = etag
+
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
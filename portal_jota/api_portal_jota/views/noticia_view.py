@@ -1,41 +1,97 @@
 from typing import Any
 
-from drf_spectacular.utils import extend_schema_view
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F, Q, QuerySet
+from django.http import HttpResponse
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
 
-from ..enums.plan_enum import PlanEnum
+from ..db_router import usar_primario
+from ..entitlements import ReaderEntitlement, get_reader_entitlement
 from ..enums.status_noticia_enum import StatusNoticiaEnum
 from ..enums.user_role_enum import UserRoleEnum
 from ..enums.vertical_enum import VerticalEnum
-from ..errors import ImageError
+from ..errors import ImageError, UploadConflictError, UploadError
+from ..image_upload import (
+    UploadSession,
+    append_chunk,
+    discard_upload,
+    get_upload_session,
+    open_finished_upload,
+    start_upload,
+    upload_offset,
+)
 from ..models import NoticiaSchema, UserSchema
+from ..noticia_cache import cache_list, get_cached_list
+from ..pagination import NoticiaBuscaPagination, NoticiaCursorPagination, TimelinePagination
 from ..permissions import IsEditorOrAdmin
-from ..serializers.noticia_serializer import NoticiaSerializer
+from ..search import busca_query
+from ..serializers.imagem_upload_serializer import ImagemUploadSerializer
+from ..serializers.noticia_serializer import CAMPOS_DA_LISTAGEM, NoticiaListSerializer, NoticiaSerializer
+from .conditional import (
+    VALIDATOR_FIELDS,
+    Validators,
+    has_conditional_headers,
+    instance_validators,
+    noticia_validators,
+    not_modified_response,
+    row_validators,
+    set_validators,
+)
 from .id_extend import extend_uuid_schema
+from .replica import ReplicaReadMixin
+
+
+# Ações com a representação reduzida, lida por .values() (ver NoticiaListSerializer)
+ACOES_LISTAGEM = ["list", "por_vertical", "feed"]
+
+
+def reader_access_denied_detail(entitlement: ReaderEntitlement, verticais_mask: int) -> dict[str, Any] | None:
+    if not entitlement.is_pro:
+        return {"detail": "Acesso negado. Apenas usuário com plano JOTA PRO tem acesso a essa notícia."}
+
+    if not entitlement.can_read(verticais_mask):
+        return {
+            "detail": "Acesso negado. Usuário não tem permissão para acessar essa notícia. Verifique as verticais do plano.",
+            "Verticais_do_usuario": entitlement.verticais,
+            "Verticais_da_noticia": VerticalEnum.labels_from_mask(verticais_mask),
+        }
+
+    return None
 
 
 @extend_schema_view(**extend_uuid_schema(description="ID da noticia"))
-class NoticiaViewSet(viewsets.ModelViewSet):
+class NoticiaViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = NoticiaSerializer
     parser_classes = (MultiPartParser, FormParser)
-    pagination_class = PageNumberPagination
+    pagination_class = NoticiaCursorPagination
 
     def get_permissions(self) -> list[Any]:
         return {
             "list": [AllowAny()],
             "por_vertical": [AllowAny()],
+            "feed": [IsAuthenticated()],
             "retrieve": [IsAuthenticated()],
+            "busca": [IsAuthenticated()],
         }.get(self.action, [IsEditorOrAdmin(), IsAuthenticated()])
 
+    def get_serializer_class(self) -> type[BaseSerializer]:
+        if self.action in ACOES_LISTAGEM:
+            return NoticiaListSerializer
+
+        return super().get_serializer_class()
+
     def get_queryset(self) -> list[NoticiaSchema]:
         user: UserSchema = self.request.user
-        queryset = NoticiaSchema.objects.all()
+        queryset = self.get_base_queryset()
 
         # List e por_vertical retornam todas as noticias
         # Se for admin retorna todas
@@ -49,70 +105,366 @@ class NoticiaViewSet(viewsets.ModelViewSet):
 
             return queryset
 
-        editando_noticia = self.action in ["update", "partial_update", "destroy"]
+        if self.action == "busca":
+            # Mesmas regras do retrieve, aplicadas no filtro: o leitor só recebe o que poderia abrir
+            if user.role == UserRoleEnum.READER:
+                return self._filter_reader_access(queryset.filter(status=StatusNoticiaEnum.PUBLICADO))
+
+            return queryset
+
+        if self.action == "feed":
+            # Publicadas nas verticais do plano; quem não é JOTA PRO só recebe as abertas
+            if user.role == UserRoleEnum.READER:
+                entitlement = self._reader_entitlement()
+                queryset = (
+                    queryset.filter(status=StatusNoticiaEnum.PUBLICADO)
+                    .alias(no_plano=F("verticais_mask").bitand(entitlement.verticais_mask))
+                    .filter(no_plano__gt=0)
+                )
+                return queryset if entitlement.is_pro else queryset.filter(is_pro=False)
+
+            return queryset.none()
+
+        editando_noticia = self.action in [
+            "update",
+            "partial_update",
+            "destroy",
+            "upload_imagem",
+            "upload_imagem_parte",
+            "upload_imagem_finalizar",
+        ]
         if user.role == UserRoleEnum.EDITOR and editando_noticia:
-            return queryset.filter(autor=user)
+            return queryset.filter(autor_id=user.id)
 
         return queryset.none()
 
+    def get_base_queryset(self) -> QuerySet[NoticiaSchema]:
+        queryset = NoticiaSchema.objects.all()
+
+        # A listagem reduzida lê só as colunas que devolve, sem montar instâncias nem carregar autor
+        if self.action in ACOES_LISTAGEM:
+            return queryset.order_by("-data_publicacao", "-id").values(*CAMPOS_DA_LISTAGEM)
+
+        return queryset.select_related("autor")
+
+    def list(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        anonimo = not request.user.is_authenticated
+
+        if anonimo:
+            # A listagem anônima é igual para todos: servida do Redis enquanto nada mudar
+            key, cached = get_cached_list(request)
+            if cached is not None:
+                validators = (cached["etag"], cached["last_modified"])
+                response = not_modified_response(request, validators)
+                if response is None:
+                    response = Response(cached["data"], status=status.HTTP_200_OK)
+                    set_validators(response, validators)
+
+                response["X-Cache"] = "HIT"
+                return response
+
+            # O que vai para o cache compartilhado vem do primário: uma leitura atrasada da réplica ficaria no cache
+            # até a próxima escrita
+            usar_primario()
+
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if has_conditional_headers(request):
+            not_modified = not_modified_response(request, self._list_validators(queryset))
+            if not_modified is not None:
+                return not_modified
+
+        page = self.paginate_queryset(queryset)
+        noticias = page if page is not None else list(queryset)
+        validators = row_validators(noticias)
+
+        serializer = self.get_serializer(noticias, many=True)
+        if page is not None:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response(serializer.data, status=status.HTTP_200_OK)
+
+        set_validators(response, validators)
+
+        if anonimo:
+            etag, last_modified = validators
+            cache_list(key, {"data": response.data, "etag": etag, "last_modified": last_modified})
+            response["X-Cache"] = "MISS"
+
+        return response
+
     def create(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
         try:
             return super().create(request, *args, **kwargs)
         except ImageError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    def update(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        try:
+            return super().update(request, *args, **kwargs)
+        except ImageError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Termos da busca em titulo, subtitulo e conteudo"),
+            OpenApiParameter("page", int),
+            OpenApiParameter("page_size", int),
+        ]
+    )
+    @action(detail=False, methods=["get"], url_path="busca", pagination_class=NoticiaBuscaPagination)
+    def busca(self, request: Request) -> Response:
+        """
+        Busca textual nas notícias, ordenada por relevância. Aceita "frase exata", or e -termo.
+        Leitores só recebem notícias publicadas que poderiam abrir pelo retrieve.
+        """
+        texto = request.query_params.get("q", "").strip()
+        if not texto:
+            detail = {"detail": "Informe os termos da busca no parâmetro q."}
+            return Response(detail, status=status.HTTP_400_BAD_REQUEST)
+
+        query = busca_query(texto)
+        queryset = (
+            self.get_queryset()
+            .filter(busca_vector=query)
+            .annotate(rank=SearchRank(F("busca_vector"), query))
+            .order_by("-rank", "-data_publicacao", "-id")
+        )
+
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("cursor", str),
+            OpenApiParameter("page_size", int),
+        ]
+    )
+    @action(detail=False, methods=["get"], url_path="feed", pagination_class=TimelinePagination)
+    def feed(self, request: Request) -> Response:
+        """
+        Feed do leitor: notícias publicadas nas verticais do plano, das mais recentes para as mais antigas,
+        sem repetir as que estão em mais de uma vertical. Quem não é JOTA PRO só recebe as notícias abertas.
+        """
+        if request.user.role != UserRoleEnum.READER:
+            detail = {"detail": "Feed disponível apenas para leitores."}
+            return Response(detail, status=status.HTTP_403_FORBIDDEN)
+
+        entitlement = self._reader_entitlement()
+        verticais = VerticalEnum.from_mask(entitlement.verticais_mask)
+
+        page = self.paginator.paginate_timeline(self.get_queryset(), request, verticais, abertas=not entitlement.is_pro)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["post"], url_path="imagem-upload", parser_classes=(JSONParser, FormParser))
+    def upload_imagem(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Abre um upload de imagem em partes para a notícia. As partes vão por PATCH em imagem-upload/{upload_id}/
+        com o header Upload-Offset, e o upload termina em imagem-upload/{upload_id}/finalizar/.
+        """
+        noticia: NoticiaSchema = self.get_object()
+
+        serializer = ImagemUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            session = start_upload(noticia.id, request.user.id, **serializer.validated_data)
+        except (ImageError, UploadError) as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return self._upload_response(session, 0, status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["get", "patch"], url_path=r"imagem-upload/(?P<upload_id>[0-9a-f-]{36})")
+    def upload_imagem_parte(self, request: Request, pk: str | None = None, upload_id: str = "") -> Response:
+        """
+        GET informa o offset para retomar o upload; PATCH grava o corpo da requisição a partir de Upload-Offset.
+        """
+        session = self._get_upload_session(self.get_object(), upload_id)
+        if session is None:
+            return Response({"detail": "Upload não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+
+        if request.method == "GET":
+            return self._upload_response(session, upload_offset(session))
+
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            tamanho_parte = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (KeyError, ValueError):
+            return Response(
+                {"detail": "Header Upload-Offset e Content-Length são obrigatórios."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            # request.stream é o corpo cru da requisição: nenhum parser roda e nada fica inteiro na memória
+            offset = append_chunk(session, offset, request.stream, tamanho_parte)
+        except UploadConflictError as e:
+            return self._upload_response(session, upload_offset(session), status.HTTP_409_CONFLICT, str(e))
+        except UploadError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return self._upload_response(session, offset)
+
+    @action(detail=True, methods=["post"], url_path=r"imagem-upload/(?P<upload_id>[0-9a-f-]{36})/finalizar")
+    def upload_imagem_finalizar(self, request: Request, pk: str | None = None, upload_id: str = "") -> Response:
+        """
+        Confere o sha256 do arquivo completo, anexa a imagem à notícia e enfileira o processamento.
+        """
+        noticia: NoticiaSchema = self.get_object()
+
+        session = self._get_upload_session(noticia, upload_id)
+        if session is None:
+            return Response({"detail": "Upload não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            imagem = open_finished_upload(session)
+        except UploadConflictError as e:
+            return self._upload_response(session, upload_offset(session), status.HTTP_409_CONFLICT, str(e))
+        except (ImageError, UploadError) as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        with imagem:
+            # O FileField copia o arquivo parcial para o storage em blocos
+            noticia.imagem = imagem
+            noticia.save(update_fields=["imagem"])
+
+        discard_upload(session)
+
+        serializer = self.get_serializer(noticia)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    def _get_upload_session(self, noticia: NoticiaSchema, upload_id: str) -> UploadSession | None:
+        # As permissões vêm da notícia (get_object); a sessão só vale para a notícia em que foi aberta
+        session = get_upload_session(upload_id)
+
+        if session is None or session.noticia_id != str(noticia.id):
+            return None
+
+        return session
+
+    def _upload_response(
+        self, session: UploadSession, offset: int, status_code: int = status.HTTP_200_OK, detail: str | None = None
+    ) -> Response:
+        data = {
+            "upload_id": session.id,
+            "offset": offset,
+            "tamanho": session.tamanho,
+            "chunk_size": settings.UPLOAD_CHUNK_SIZE,
+        }
+        if detail is not None:
+            data["detail"] = detail
+
+        return Response(data, status=status_code, headers={"Upload-Offset": str(offset)})
+
     def retrieve(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        if has_conditional_headers(request):
+            not_modified = self._retrieve_not_modified(request)
+            if not_modified is not None:
+                return not_modified
+
         instance: NoticiaSchema = self.get_object()
 
-        noticia_pro = instance.is_pro
+        acesso_negado = self._reader_access_denied(request, instance.is_pro, instance.verticais_mask)
+        if acesso_negado is not None:
+            return acesso_negado
+
+        serializer = self.get_serializer(instance)
+
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        set_validators(response, instance_validators([instance]))
+        return response
+
+    def _reader_entitlement(self) -> ReaderEntitlement:
+        user = self.request.user
+
+        # Plano das claims do token ou, para usuários carregados do banco, o snapshot em cache
+        return getattr(user, "entitlement", None) or get_reader_entitlement(str(user.id))
+
+    def _filter_reader_access(self, queryset: QuerySet[NoticiaSchema]) -> QuerySet[NoticiaSchema]:
+        entitlement = self._reader_entitlement()
+        if not entitlement.is_pro:
+            return queryset.filter(is_pro=False)
+
+        return queryset.alias(verticais_em_comum=F("verticais_mask").bitand(entitlement.verticais_mask)).filter(
+            Q(is_pro=False) | Q(verticais_em_comum__gt=0)
+        )
+
+    def _reader_access_denied(self, request: Request, noticia_pro: bool, verticais_mask: int) -> Response | None:
         usuario_leitor = request.user.role == UserRoleEnum.READER
-        plano_info = request.user.user_plan.plan == PlanEnum.JOTA_INFO
 
-        if noticia_pro and usuario_leitor and plano_info:
-            return Response(
-                {"detail": "Acesso negado. Apenas usuário com plano JOTA PRO tem acesso a essa notícia."},
-                status=status.HTTP_403_FORBIDDEN,
+        if not (noticia_pro and usuario_leitor):
+            return None
+
+        detail = reader_access_denied_detail(self._reader_entitlement(), verticais_mask)
+        if detail is None:
+            return None
+
+        return Response(detail, status=status.HTTP_403_FORBIDDEN)
+
+    def _list_validators(self, queryset: QuerySet[NoticiaSchema]) -> Validators:
+        # Só as colunas de validação da página pedida, sem serializar nada
+        paginator = self.paginator
+        if paginator is not None and paginator.is_requested(self.request):
+            page_queryset = paginator.get_page_queryset(queryset, self.request)
+            return noticia_validators(paginator.fetch_page(page_queryset.values_list(*VALIDATOR_FIELDS)))
+
+        return noticia_validators(queryset.values_list(*VALIDATOR_FIELDS))
+
+    def _retrieve_not_modified(self, request: Request) -> HttpResponse | None:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # Uma consulta com as colunas de validação e de acesso decide o 304 antes de serializar
+        try:
+            noticia = (
+                queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values(*VALIDATOR_FIELDS, "is_pro", "verticais_mask")
+                .first()
             )
+        except (ValueError, ValidationError):
+            return None
+
+        if noticia is None or self._reader_access_denied(request, noticia["is_pro"], noticia["verticais_mask"]):
+            return None
 
-        dentro_das_verticais_do_usuario = instance.verticais.filter(id__in=request.user.user_plan.verticais.all())
-        if noticia_pro and not dentro_das_verticais_do_usuario:
+        return not_modified_response(request, noticia_validators([tuple(noticia[f] for f in VALIDATOR_FIELDS)]))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("cursor", str),
+            OpenApiParameter("page_size", int),
+        ]
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"por-vertical/(?P<vertical>[^/.]+)",
+        pagination_class=TimelinePagination,
+    )
+    def por_vertical(self, request: Request, vertical: str) -> Response:
+        """
+        Notícias publicadas de uma vertical, das mais recentes para as mais antigas
+        Exemplo: /api/noticia/por-vertical/tributos/
+        """
+        vertical_validada = VerticalEnum.from_label(vertical.capitalize())
+        if not vertical_validada:
             return Response(
                 {
-                    "detail": "Acesso negado. Usuário não tem permissão para acessar essa notícia. Verifique as verticais do plano.",
-                    "Verticais_do_usuario": [vertical.name for vertical in request.user.user_plan.verticais.all()],
-                    "Verticais_da_noticia": [vertical.name for vertical in instance.verticais.all()],
+                    "detail": "Vertical não encontrada.",
+                    "Verticais": VerticalEnum.labels,
                 },
-                status=status.HTTP_403_FORBIDDEN,
+                status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = self.get_serializer(instance)
+        # Carrega as notícias pelos ids da timeline no Redis, ou a página inteira quando a timeline não responde
+        queryset = (
+            self.get_queryset()
+            .filter(status=StatusNoticiaEnum.PUBLICADO)
+            .alias(em_comum=F("verticais_mask").bitand(vertical_validada.bit))
+            .filter(em_comum__gt=0)
+        )
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
-
-    # @action(detail=False, methods=["get"], url_path="(por-vertical/?P<vertical>[^/.]+)")  # type: ignore
-    # def por_vertical(self, request: Request, vertical: str) -> None:
-    #     """
-    #     Retorna notícias por vertical
-    #     Exemplo: /api/noticia/tributos/
-    #     """
-    #     vertical_validada = VerticalEnum.from_label(vertical.capitalize())
-    #     if not vertical_validada:
-    #         return Response(
-    #             {
-    #                 "detail": "Vertical não encontrada.",
-    #                 "Verticais": VerticalEnum.labels,
-    #             },
-    #             status=404,
-    #         )
-
-    #     # Aplica o filtro de vertical
-    #     queryset = self.filter_queryset(self.get_queryset())
-    #     queryset = queryset.filter(verticais__name=vertical_validada.label)
-
-    #     page = self.paginate_queryset(queryset)
-    #     if page is not None:
-    #         serializer = self.get_serializer(page, many=True)
-    #         return self.get_paginated_response(serializer.data)
-
-    #     serializer = self.get_serializer(queryset, many=True)
-    #     return Response(serializer.data, status.HTTP_200_OK)
+        page = self.paginator.paginate_timeline(queryset, request, [vertical_validada])
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
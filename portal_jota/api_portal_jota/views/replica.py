@@ -0,0 +1,32 @@
+from typing import Any
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from ..db_router import escreveu_recentemente, marcar_escrita, restaurar_leitura, usar_replica
+
+
+class ReplicaReadMixin:
+    """
+    GET e HEAD do viewset leem da réplica, exceto para quem escreveu há menos de REPLICA_STICKY_SECONDS.
+    Escritas bem-sucedidas começam essa janela para o usuário.
+    """
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        # request.user autentica aqui, no primário; as permissões e o handler já leem da réplica
+        if request.method in SAFE_METHODS and not escreveu_recentemente(request.user):
+            self._leitura_replica = usar_replica()
+
+        super().initial(request, *args, **kwargs)  # type: ignore
+
+    def finalize_response(self, request: Request, response: Response, *args: Any, **kwargs: Any) -> Response:
+        token = getattr(self, "_leitura_replica", None)
+        if token is not None:
+            restaurar_leitura(token)
+            self._leitura_replica = None
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            marcar_escrita(request.user)
+
+        return super().finalize_response(request, response, *args, **kwargs)  # type: ignore
@@ -1,7 +1,11 @@
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from ..serializers.token_serializer import TokenSerializer
+from ..serializers.token_serializer import TokenClaimsRefreshSerializer, TokenSerializer
 
 
 class TokenView(TokenObtainPairView):
     serializer_class = TokenSerializer
+
+
+class TokenRefreshClaimsView(TokenRefreshView):
+    serializer_class = TokenClaimsRefreshSerializer
@@ -1,24 +1,34 @@
-from typing import Any
+from typing import Any, Optional
 
 from django.db.models.manager import BaseManager
-from drf_spectacular.utils import extend_schema_view
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import mixins, viewsets
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 
+from ..contagem import chave_plano
+from ..enums.plan_enum import PlanEnum
 from ..enums.user_role_enum import UserRoleEnum
 from ..models import UserPlanSchema
 from ..models.user_schema import UserSchema
+from ..pagination import ContagemPagination
 from ..permissions import IsAdmin, IsReaderOrdAdmin
 from ..serializers.user_plan_serializer import UserPlanSerializer
 from .id_extend import extend_uuid_schema
+from .replica import ReplicaReadMixin
 
 parameter_map = extend_uuid_schema(description="ID do plano")
 parameter_map.pop("destroy")
+parameter_map["list"] = extend_schema(
+    parameters=[
+        OpenApiParameter("plan", str, enum=PlanEnum.labels, description="Filtra pelo plano (somente admin)"),
+    ]
+)
 
 
 @extend_schema_view(**parameter_map)
 class UserPlanViewSet(
+    ReplicaReadMixin,
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -26,7 +36,8 @@ class UserPlanViewSet(
 ):
     serializer_class = UserPlanSerializer
     permission_classes = [IsAuthenticated]  # noqa: RUF012
-    pagination_class = PageNumberPagination
+    # Pagina quando o cliente envia page_size
+    pagination_class = ContagemPagination
 
     def get_action_permissions(self) -> list[Any]:
         return {
@@ -41,8 +52,28 @@ class UserPlanViewSet(
 
     def get_queryset(self) -> BaseManager[UserPlanSchema]:
         user: UserSchema = self.request.user  # type: ignore
-        base_queryset = UserPlanSchema.objects.all()
+        # Ordem estável para a paginação; cd_user entra no serializer
+        base_queryset = UserPlanSchema.objects.select_related("cd_user").order_by("created_at", "id")
         if user.role == UserRoleEnum.ADMIN:
-            return base_queryset
+            plan = self.get_plan_filter()
+            return base_queryset if plan is None else base_queryset.filter(plan=plan)
 
         return base_queryset.filter(cd_user=user.id)
+
+    def get_plan_filter(self) -> Optional[PlanEnum]:
+        if self.action != "list" or "plan" not in self.request.query_params:
+            return None
+
+        plan = PlanEnum.from_label(self.request.query_params["plan"])
+        if plan is None:
+            raise ValidationError({"plan": f"Plano inválido. Valores possíveis: {PlanEnum.labels}"})
+
+        return plan
+
+    def get_contagem_chaves(self) -> Optional[list[str]]:
+        # Listagem do admin filtrada por plano: total dos contadores, sem COUNT(*)
+        if self.request.user.role != UserRoleEnum.ADMIN:
+            return None
+
+        plan = self.get_plan_filter()
+        return None if plan is None else [chave_plano(plan)]
@@ -1,9 +1,44 @@
 import os
+from typing import Any
 
 from celery import Celery
+from celery.signals import celeryd_after_setup, task_postrun, worker_process_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portal_jota.settings")
 
 app = Celery("portal_jota")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks(["api_portal_jota"])
+
+
+@celeryd_after_setup.connect
+def select_worker_queues(sender: str, instance: Any, **kwargs: Any) -> None:
+    from django.conf import settings
+
+    filas = instance.app.amqp.queues
+    # Sem -Q na linha de comando, o worker consome só as filas do seu perfil de ENV_TYPE
+    if filas.consume_from is filas:
+        filas.select(getattr(settings, "WORKER_FILAS", settings.FILAS_CELERY))
+
+
+# Pools abertos no processo pai, guardados para o coletor de lixo não encerrar no filho conexões que são do pai
+_pools_herdados: list = []
+
+
+@worker_process_init.connect
+def discard_inherited_pools(**kwargs: Any) -> None:
+    from django.db.backends.postgresql.base import DatabaseWrapper
+
+    # As threads de um pool não sobrevivem ao fork e os sockets dele são do pai: cada filho abre o próprio pool
+    _pools_herdados.extend(DatabaseWrapper._connection_pools.values())
+    DatabaseWrapper._connection_pools.clear()
+
+
+@task_postrun.connect
+def send_pool_stats(**kwargs: Any) -> None:
+    from django.conf import settings
+
+    if settings.POSTGRES_POOL:
+        from api_portal_jota.db_pool import enviar_pool_stats
+
+        enviar_pool_stats()
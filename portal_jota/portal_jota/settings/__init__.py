@@ -9,7 +9,7 @@ match ENV_TYPE:
         from .web import *  # noqa: F403
     case "beat":
         from .beat import *  # noqa: F403
-    case "worker":
-        from .celery import *  # noqa: F403
+    case "worker" | "worker_imagens" | "worker_email" | "worker_email_massa" | "worker_publicacao":
+        from .worker import *  # noqa: F403
     case "full":
         from .full import *  # noqa: F403
@@ -37,6 +37,46 @@ DATABASES = {
     },
 }
 
+# Réplica de leitura (streaming replication do primário); sem POSTGRES_REPLICA_HOST tudo fica no primário.
+# O roteamento está em api_portal_jota/db_router.py
+REPLICA_DATABASE = None
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    REPLICA_DATABASE = "replica"
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", os.getenv("POSTGRES_PORT")),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["api_portal_jota.db_router.ReplicaRouter"]
+
+# Segundos em que um usuário lê do primário depois de escrever, enquanto a réplica alcança a escrita
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+# Pool de conexões do psycopg 3 no lugar das conexões persistentes por thread; cada perfil de ENV_TYPE chama
+# configurar_pool com o tamanho que os seus processos usam (ver README)
+POSTGRES_POOL = os.getenv("POSTGRES_POOL", "0") == "1"
+
+
+def configurar_pool(databases: dict, min_size: int, max_size: int) -> None:
+    for alias, database in databases.items():
+        # Quem guarda as conexões é o pool; o Django recusa pool com conexões persistentes
+        database["CONN_MAX_AGE"] = 0
+        # Com pool o health check acontece em todo checkout (ConnectionPool.check_connection)
+        database["CONN_HEALTH_CHECKS"] = True
+        database["OPTIONS"] = {
+            **database.get("OPTIONS", {}),
+            "pool": {
+                "name": alias,
+                "min_size": int(os.getenv("POSTGRES_POOL_MIN", min_size)),
+                "max_size": int(os.getenv("POSTGRES_POOL_MAX", max_size)),
+                # Segundos esperando uma conexão livre antes de PoolTimeout
+                "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", "10")),
+            },
+        }
+
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 LANGUAGE_CODE = "pt-br"
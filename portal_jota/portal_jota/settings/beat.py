@@ -3,12 +3,22 @@ from datetime import timedelta
 from celery.schedules import crontab
 from django.conf import settings
 
+from .base import DATABASES, POSTGRES_POOL, configurar_pool
 from .celery import *
 
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_BEAT_SCHEDULE = {
     "publicar_noticia": {
         "task": "api_portal_jota.tasks.publicar_noticia.publicar_noticia",
-        "schedule": timedelta(seconds=5) if settings.DEBUG else crontab(hour=1),
+        "schedule": (
+            timedelta(seconds=5)
+            if settings.DEBUG
+            # Com ETA o beat só recolhe atrasadas e agenda as que entram no horizonte, então roda abaixo dele
+            else crontab(minute="*/10") if PUBLICACAO_POR_ETA else crontab(hour=1)
+        ),
     },
 }
+
+if POSTGRES_POOL:
+    # O DatabaseScheduler lê e grava os agendamentos em uma única thread
+    configurar_pool(DATABASES, 1, 1)
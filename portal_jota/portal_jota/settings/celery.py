@@ -1,4 +1,7 @@
 import os
+from datetime import timedelta
+
+from kombu import Exchange, Queue
 
 from .base import TIME_ZONE  # Para evitar erro de linter
 
@@ -22,3 +25,65 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 CELERY_TASK_TIME_LIMIT = 120
 CELERY_TASK_MAX_RETRIES = 3
+
+# Uma fila por tipo de trabalho: o re-encode de imagens (CPU) não atrasa emails transacionais (I/O),
+# e a distribuição em massa de NOTICIA_PUBLICADA não disputa com nenhum dos dois
+FILAS_CELERY = ("imagens", "email", "email_massa", "publicacao")
+CELERY_TASK_QUEUES = tuple(Queue(fila, Exchange(fila), routing_key=fila) for fila in FILAS_CELERY)
+# Prioridade de 0 a 10 (maior sai antes) dentro de cada fila; o RabbitMQ só a respeita com x-max-priority declarado
+CELERY_TASK_QUEUE_MAX_PRIORITY = 10
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_TASK_DEFAULT_QUEUE = "publicacao"
+CELERY_TASK_ROUTES = (
+    # send_email muda de fila e prioridade conforme o tipo do email
+    "api_portal_jota.tasks.routes.route_send_email",
+    {
+        "api_portal_jota.tasks.process_image.process_image": {"queue": "imagens", "priority": 5},
+        "api_portal_jota.tasks.publicar_noticia.publicar_noticia_agendada": {"queue": "publicacao", "priority": 8},
+        "api_portal_jota.tasks.publicar_noticia.publicar_noticia": {"queue": "publicacao", "priority": 5},
+    },
+)
+
+# Publicação agendada por tarefa com ETA; o beat de publicar_noticia fica só como rede de segurança
+PUBLICACAO_POR_ETA = os.getenv("PUBLICACAO_POR_ETA", "1") == "1"
+# Tarefas com ETA ficam sem ack no worker até vencer; acima do consumer_timeout do RabbitMQ (30 min) o canal cai
+PUBLICACAO_ETA_HORIZONTE = timedelta(minutes=20)
+
+# Destinatários por tarefa na distribuição do email de notícia publicada
+EMAIL_BATCH_SIZE = 1000
+
+# Imagens das notícias: a principal é limitada a IMAGE_MAX_WIDTH e as versões menores alimentam o srcset
+IMAGE_MAX_WIDTH = 2560
+IMAGE_RENDITION_WIDTHS = (320, 640, 1280)
+IMAGE_RENDITION_AVIF = os.getenv("IMAGE_RENDITION_AVIF", "0") == "1"
+# Tetos conferidos no upload, pelo cabeçalho, antes de a imagem ir para a fila
+IMAGE_MAX_BYTES = 10 * 1024 * 1024
+IMAGE_MAX_PIXELS = 40_000_000
+# Saídas codificadas até esse tamanho ficam em memória; acima disso vão para um arquivo temporário
+IMAGE_SPOOL_MAX_SIZE = 1024 * 1024
+
+# Envio de emails; sem EMAIL_HOST os emails são só impressos no console, como em desenvolvimento
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "0") == "1"
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "noreply@portaljota.com.br")
+EMAIL_BACKEND = (
+    "api_portal_jota.email_backend.PooledSMTPEmailBackend"
+    if os.getenv("EMAIL_HOST")
+    else "django.core.mail.backends.console.EmailBackend"
+)
+# Conexões SMTP persistentes por tarefa e novas tentativas por mensagem (espera exponencial a partir do delay)
+EMAIL_POOL_SIZE = int(os.getenv("EMAIL_POOL_SIZE", "8"))
+EMAIL_MAX_RETRIES = 3
+EMAIL_RETRY_DELAY = 0.5
+
+# Cache da aplicação no mesmo Redis dos resultados do Celery, em outro database
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://{REDIS_USER}:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/1",
+        "KEY_PREFIX": "portal_jota",
+    },
+}
@@ -1,5 +1,6 @@
 from django.conf import settings
 
+from .base import DATABASES, POSTGRES_POOL, configurar_pool
 from .beat import *
 from .celery import *
 
@@ -7,3 +8,7 @@ CELERY_TASK_ALWAYS_EAGER = settings.DEBUG
 CELERY_TASK_EAGER_PROPAGATES = settings.DEBUG
 
 from .web import *
+
+if POSTGRES_POOL:
+    # O runserver atende cada requisição em uma thread, e as tarefas rodam nelas em modo eager
+    configurar_pool(DATABASES, 1, 4)
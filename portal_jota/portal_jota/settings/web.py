@@ -1,9 +1,22 @@
 import os
 from datetime import timedelta
 
-from .base import BASE_DIR, INSTALLED_APPS  # Para evitar erro de linter
+from .base import BASE_DIR, DATABASES, INSTALLED_APPS, POSTGRES_POOL, configurar_pool  # Para evitar erro de linter
 from .celery import *
 
+# wsgi: gunicorn com workers síncronos; asgi: uvicorn, com as leituras quentes em views assíncronas
+WEB_SERVER = os.getenv("WEB_SERVER", "wsgi").lower()
+
+if WEB_SERVER == "asgi":
+    # No ASGI cada requisição roda o ORM em uma thread própria; conexões persistentes ficariam presas a elas
+    for database in DATABASES.values():
+        database["CONN_MAX_AGE"] = 0
+
+if POSTGRES_POOL:
+    # Por processo: no ASGI as requisições concorrentes disputam o pool, e o máximo limita quantas vão ao banco ao
+    # mesmo tempo; os workers síncronos do gunicorn atendem uma requisição por vez
+    configurar_pool(DATABASES, *((2, 8) if WEB_SERVER == "asgi" else (1, 1)))
+
 INSTALLED_APPS.extend(
     [
         # Third-party apps
@@ -63,14 +76,29 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static_files")
 MEDIA_URL = "media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media_files")
 
+# Upload de imagens em partes: os arquivos parciais ficam fora do MEDIA_ROOT e precisam ser compartilhados
+# entre as instâncias web, já que cada parte pode cair em um processo diferente
+UPLOAD_TEMP_DIR = os.getenv("UPLOAD_TEMP_DIR", os.path.join(BASE_DIR, "upload_files"))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_SESSION_TIMEOUT = 60 * 60 * 24
+
 # Rest Framework
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Usuário montado a partir das claims do token, sem consulta ao banco (ver api_portal_jota/authentication.py)
+        "api_portal_jota.authentication.ClaimsJWTAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        # Mesmo JSON do renderer do DRF, codificado com orjson (ver api_portal_jota/renderers.py)
+        "api_portal_jota.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ],
 }
 
+# Abaixo desse número de linhas estimadas a paginação faz o COUNT(*) exato (ver api_portal_jota/contagem.py)
+CONTAGEM_EXATA_LIMITE = int(os.getenv("CONTAGEM_EXATA_LIMITE", "10000"))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Bussines Case Jota",
     "DESCRIPTION": "Bussines case para vaga de Desenvolvedor Backend na Jota",
@@ -0,0 +1,34 @@
+from . import ENV_TYPE
+from .base import DATABASES, POSTGRES_POOL, configurar_pool
+from .celery import *
+
+# Perfis de worker, escolhidos pelo ENV_TYPE: cada um consome só as suas filas, com o pool do seu tipo de trabalho.
+# "worker" consome todas as filas, como antes da separação.
+# Prefetch 1 onde as tarefas são longas ou têm prioridade: mensagens já reservadas não são reordenadas.
+# O pool threads não aplica os time limits do Celery; ali as tarefas são de I/O, limitadas pelos timeouts de rede.
+WORKER_PERFIS = {
+    "worker": {"filas": FILAS_CELERY, "pool": "prefork", "concurrency": None, "prefetch": 1},
+    # Pillow segura o GIL em boa parte do re-encode: processos, um por CPU
+    "worker_imagens": {"filas": ("imagens",), "pool": "prefork", "concurrency": None, "prefetch": 1},
+    # Emails transacionais são curtos e esperam rede: muitas threads, alguns reservados por thread
+    "worker_email": {"filas": ("email",), "pool": "threads", "concurrency": 16, "prefetch": 4},
+    # Cada lote já abre EMAIL_POOL_SIZE conexões SMTP; poucas threads para não estourar o limite do servidor
+    "worker_email_massa": {"filas": ("email_massa",), "pool": "threads", "concurrency": 4, "prefetch": 1},
+    # Publicação é só UPDATE no banco e tarefas com ETA, que ficam fora do limite de prefetch
+    "worker_publicacao": {"filas": ("publicacao",), "pool": "threads", "concurrency": 4, "prefetch": 1},
+}
+
+WORKER_PERFIL = WORKER_PERFIS[ENV_TYPE]
+
+# Todas as filas seguem declaradas para publicar nelas; o consumo é fixado em portal_jota/celery.py
+WORKER_FILAS = WORKER_PERFIL["filas"]
+CELERY_WORKER_POOL = WORKER_PERFIL["pool"]
+CELERY_WORKER_CONCURRENCY = WORKER_PERFIL["concurrency"]
+CELERY_WORKER_PREFETCH_MULTIPLIER = WORKER_PERFIL["prefetch"]
+
+if POSTGRES_POOL:
+    # Cada processo do prefork roda uma tarefa por vez; no pool threads cada thread pode segurar uma conexão
+    if CELERY_WORKER_POOL == "threads":
+        configurar_pool(DATABASES, 2, CELERY_WORKER_CONCURRENCY)
+    else:
+        configurar_pool(DATABASES, 1, 1)